@@ -1,5 +1,5 @@
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 from data_storage import DataStorage
 
@@ -8,8 +8,8 @@ logger = logging.getLogger(__name__)
 class Analytics:
     """Handle analytics and data analysis for salary calculations."""
     
-    def __init__(self):
-        self.storage = DataStorage()
+    def __init__(self, storage: Optional[DataStorage] = None):
+        self.storage = storage or DataStorage()
     
     def generate_summary_stats(self, user_id: str, days: int = 30) -> Dict:
         """Generate summary statistics for the user."""
@@ -208,31 +208,23 @@ from data_storage import DataStorage
 class Analytics:
     """Handle analytics and data visualization for salary tracking."""
     
-    def __init__(self):
-        self.storage = DataStorage()
+    def __init__(self, storage: Optional[DataStorage] = None):
+        self.storage = storage or DataStorage()
     
     def generate_summary_stats(self, user_id: str, days: int = 30) -> Dict:
         """Generate summary statistics for the last N days."""
         try:
-            data = self.storage.get_date_range_data(user_id, days)
-            calculations = data.get('calculations', {})
+            today = date.today()
+            totals = self.storage.get_rollups(user_id).range(today - timedelta(days=days - 1), today)
             
-            if not calculations:
+            if not totals.entries:
                 return {'error': 'ဒေတာ မတွေ့ပါ။ ပထမဆုံး အလုပ်ချိန်မှတ်သားပါ။'}
             
-            total_days = len(calculations)
-            total_salary = 0
-            total_work_hours = 0
-            total_regular_hours = 0
-            total_ot_hours = 0
-            
-            for date_calculations in calculations.values():
-                if isinstance(date_calculations, list):
-                    for calc in date_calculations:
-                        total_salary += calc['total_salary']
-                        total_work_hours += calc['total_minutes'] / 60
-                        total_regular_hours += calc['regular_minutes'] / 60
-                        total_ot_hours += (calc['ot_minutes'] + calc['night_ot_minutes']) / 60
+            total_days = totals.days
+            total_salary = totals.total_salary
+            total_work_hours = totals.total_minutes / 60
+            total_regular_hours = totals.regular_minutes / 60
+            total_ot_hours = (totals.ot_minutes + totals.night_ot_minutes) / 60
             
             avg_daily_hours = round(total_work_hours / total_days, 1) if total_days > 0 else 0
             avg_daily_salary = round(total_salary / total_days, 0) if total_days > 0 else 0
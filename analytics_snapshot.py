@@ -0,0 +1,71 @@
+"""Per-user dashboard analytics, computed once and reused until the user's data or goals change."""
+
+from datetime import date
+from typing import Dict, Optional
+from data_storage import DataStorage
+from analytics import Analytics
+from goal_tracker import GoalTracker
+from notifications import NotificationManager
+
+SNAPSHOT_NAME = 'dashboard'
+
+
+class AnalyticsSnapshot:
+    """Everything the dashboards show for one user on one day. Treat as read-only.
+
+    ``rendered`` holds dashboard texts already rendered from this snapshot.
+    """
+
+    __slots__ = ('day', 'stats', 'history', 'chart_data', 'hours_chart', 'goal_progress', 'streak_info', 'rendered')
+
+    def __init__(self, day: str, stats: Dict, history: Dict, chart_data: Dict, hours_chart: Optional[str],
+                 goal_progress: Dict, streak_info: Dict):
+        self.day = day
+        self.stats = stats
+        self.history = history
+        self.chart_data = chart_data
+        self.hours_chart = hours_chart
+        self.goal_progress = goal_progress
+        self.streak_info = streak_info
+        self.rendered: Dict[str, str] = {}
+
+
+class SnapshotManager:
+    """Build and serve dashboard snapshots.
+
+    Snapshots live in the storage cache next to the user's data, so saving
+    or deleting salary data clears them automatically; goal changes clear
+    them through ``DataStorage.invalidate_snapshots``. A snapshot is also
+    rebuilt on a new day, since streaks and date ranges depend on today.
+    """
+
+    def __init__(self, storage: Optional[DataStorage] = None):
+        self.storage = storage or DataStorage()
+        self.analytics = Analytics(storage=self.storage)
+        self.goal_tracker = GoalTracker(storage=self.storage)
+        self.notification_manager = NotificationManager(storage=self.storage)
+
+    def build_dashboard(self, user_id: str) -> AnalyticsSnapshot:
+        """Compute a user's dashboard data from scratch."""
+        chart_data = self.analytics.generate_bar_chart_data(user_id, 14)
+        hours_chart = None
+        if not chart_data.get('error'):
+            hours_chart = self.analytics.create_text_bar_chart(chart_data['chart_data'], 'hours')
+        return AnalyticsSnapshot(
+            day=date.today().isoformat(),
+            stats=self.analytics.generate_summary_stats(user_id, 30),
+            history=self.analytics.get_recent_history(user_id, 7),
+            chart_data=chart_data,
+            hours_chart=hours_chart,
+            goal_progress=self.goal_tracker.check_goal_progress(user_id, 'monthly'),
+            streak_info=self.notification_manager.get_streak_info(user_id)
+        )
+
+    def get_dashboard(self, user_id: str) -> AnalyticsSnapshot:
+        """Get a user's dashboard data, computing it only when nothing current is stored."""
+        return self.storage.get_snapshot(user_id, SNAPSHOT_NAME, date.today().isoformat(),
+                                         lambda: self.build_dashboard(user_id))
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's stored dashboard data."""
+        self.storage.invalidate_snapshots(user_id)
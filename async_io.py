@@ -0,0 +1,117 @@
+"""Run blocking storage and manager calls off the asyncio event loop."""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from metrics import metrics
+
+_executor: Optional[ThreadPoolExecutor] = None
+_writer: Optional[ThreadPoolExecutor] = None
+
+# Methods with these prefixes modify stored data
+WRITE_PREFIXES = ('save_', 'delete_', 'set_', 'add_', 'remove_', 'update_', 'toggle_')
+
+
+def get_executor(writer: bool = False) -> ThreadPoolExecutor:
+    """Get the shared pool for blocking reads (IO_WORKERS threads, default 8) or the writer thread.
+
+    Writes are serialized by the storage lock anyway; giving them one thread
+    keeps queued writes from occupying every read worker.
+    """
+    global _executor, _writer
+    if writer:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="blocking-write")
+        return _writer
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=int(os.getenv("IO_WORKERS", "8")),
+                                       thread_name_prefix="blocking-io")
+    return _executor
+
+
+async def run_blocking(func: Callable, *args, writer: bool = False, **kwargs) -> Any:
+    """Run a blocking callable in the shared pool (or the writer thread) and await its result.
+
+    The caller's context variables (such as the enclosing metrics spans) are visible to func.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(writer), context.run, functools.partial(func, *args, **kwargs))
+
+
+class AsyncFacade:
+    """Awaitable view of a synchronous object.
+
+    ``await facade.method(...)`` runs ``target.method(...)`` in the shared pool,
+    so a slow disk read or write stalls only that call, not the event loop.
+    Methods named like writes (see WRITE_PREFIXES) run on the writer thread.
+    Non-callable attributes are returned as-is. Each call is timed as
+    ``<TargetClass>.<method>``, including time spent queued for a worker.
+    """
+
+    def __init__(self, target: Any):
+        self.target = target
+        self._prefix = type(target).__name__
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.target, name)
+        if not callable(attr):
+            return attr
+
+        writer = name.startswith(WRITE_PREFIXES)
+        operation = f"{self._prefix}.{name}"
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            with metrics.span(operation):
+                return await run_blocking(attr, *args, writer=writer, **kwargs)
+
+        return call
+
+
+class LazyFacade(AsyncFacade):
+    """AsyncFacade whose target is built by ``factory()`` on the first call, in a worker thread.
+
+    Constructing the facade does no work, so managers that create files or
+    import heavy modules cost nothing until a handler first uses them.
+    Every attribute is treated as a method, as handlers only call them.
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str):
+        self._factory = factory
+        self._target = None
+        self._lock = threading.Lock()
+        self._prefix = name
+
+    @property
+    def built(self) -> bool:
+        return self._target is not None
+
+    @property
+    def target(self) -> Any:
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = self._factory()
+        return self._target
+
+    def _call(self, name: str, *args, **kwargs) -> Any:
+        return getattr(self.target, name)(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        writer = name.startswith(WRITE_PREFIXES)
+        operation = f"{self._prefix}.{name}"
+
+        async def call(*args, **kwargs):
+            with metrics.span(operation):
+                return await run_blocking(self._call, name, *args, writer=writer, **kwargs)
+
+        call.__name__ = name
+        return call
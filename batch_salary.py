@@ -0,0 +1,219 @@
+"""Batch salary engine for re-pricing many shifts at once.
+
+Works on minute-of-day offsets instead of datetime objects and applies the
+same rules as ``SalaryCalculator.calculate_salary``, producing identical
+numbers. Uses NumPy when it is installed and a column-wise pure-Python loop
+otherwise.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+from salary_calculator import SalaryCalculator
+from time_utils import TimeUtils
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_time_utils = TimeUtils()
+
+DAY_MINUTES = 24 * 60
+
+# Shift detection mirrors ShiftDetector.detect_shift: times within 60 minutes
+# of the C341 / C342 start and end, else by start hour.
+DETECT_TOLERANCE = 60
+
+RESULT_FIELDS = ('shift_type', 'total_minutes', 'break_minutes', 'paid_minutes', 'regular_minutes',
+                 'ot_minutes', 'night_ot_minutes', 'regular_salary', 'ot_salary', 'night_ot_salary',
+                 'total_salary')
+
+
+def time_to_minutes(time_str: str) -> Optional[int]:
+    """Convert 'HH:MM' to minutes since midnight (None when invalid)."""
+    parsed = _time_utils.parse_time(time_str)
+    if not parsed:
+        return None
+    return parsed.hour * 60 + parsed.minute
+
+
+class BatchSalaryCalculator:
+    """Compute salaries for arrays of (start, end) minute offsets in one pass."""
+
+    def __init__(self, calculator: Optional[SalaryCalculator] = None, use_numpy: Optional[bool] = None):
+        self.calculator = calculator or SalaryCalculator()
+        self.use_numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+        self.schedule_version = None
+        self.break_windows: Dict[str, List[tuple]] = {}
+        self.shift_times: Dict[str, Tuple[int, int]] = {}
+
+    def _load_schedule(self) -> None:
+        """Take break windows and shift start/end minutes from the shift detector when its schedule changed."""
+        detector = self.calculator.shift_detector
+        version = detector.check_break_tables()
+        if version == self.schedule_version:
+            return
+
+        # Windows that wrap past midnight end on the next day, as in the compiled break tables
+        self.break_windows = {shift_type: [(start, end) for start, end, *_
+                                           in detector.get_break_table(shift_type).intervals]
+                              for shift_type in ('C341', 'C342')}
+        self.shift_times = {shift_type: (time_to_minutes(detector.shifts[shift_type]['start']),
+                                         time_to_minutes(detector.shifts[shift_type]['end']))
+                            for shift_type in ('C341', 'C342')}
+        self.schedule_version = version
+
+    def calculate(self, start_minutes: Sequence[int], end_minutes: Sequence[int],
+                  base_rate: Optional[float] = None, night_ot_rate: Optional[float] = None) -> Dict[str, list]:
+        """Price every (start, end) pair. Returns one list per field of RESULT_FIELDS.
+
+        Rates default to the calculator's current rates; pass new ones to re-price.
+        Shift times and breaks follow the calculator's shift detector.
+        """
+        if len(start_minutes) != len(end_minutes):
+            raise ValueError("start_minutes and end_minutes must have the same length")
+
+        self._load_schedule()
+
+        base_rate = self.calculator.BASE_RATE if base_rate is None else base_rate
+        night_ot_rate = self.calculator.NIGHT_OT_RATE if night_ot_rate is None else night_ot_rate
+
+        if self.use_numpy:
+            return self._calculate_numpy(start_minutes, end_minutes, base_rate, night_ot_rate)
+        return self._calculate_python(start_minutes, end_minutes, base_rate, night_ot_rate)
+
+    def _calculate_numpy(self, start_minutes, end_minutes, base_rate, night_ot_rate) -> Dict[str, list]:
+        start = np.asarray(start_minutes, dtype=np.int64)
+        end = np.asarray(end_minutes, dtype=np.int64)
+        hour = start // 60
+        (c341_start, c341_end), (c342_start, c342_end) = self.shift_times['C341'], self.shift_times['C342']
+
+        is_day = (np.abs(start - c341_start) <= DETECT_TOLERANCE) & (np.abs(end - c341_end) <= DETECT_TOLERANCE)
+        is_night_match = (np.abs(start - c342_start) <= DETECT_TOLERANCE) & (np.abs(end - c342_end) <= DETECT_TOLERANCE)
+        is_c342 = ~is_day & (is_night_match | ((hour >= 16) & (hour <= 23)))
+
+        work_end = np.where(end < start, end + DAY_MINUTES, end)
+        total = work_end - start
+
+        breaks = {}
+        for shift_type, windows in self.break_windows.items():
+            deducted = np.zeros_like(start)
+            for break_start, break_end in windows:
+                deducted += np.maximum(0, np.minimum(work_end, break_end) - np.maximum(start, break_start))
+            breaks[shift_type] = deducted
+        break_minutes = np.where(is_c342, breaks['C342'], breaks['C341'])
+
+        paid = total - break_minutes
+        limit = self.calculator.REGULAR_HOURS_LIMIT
+        regular = np.minimum(paid, limit)
+        overtime = np.maximum(0, paid - limit)
+
+        # Day starts: only OT worked after 22:00 (same calendar day) is night OT
+        night_start = self.calculator.NIGHT_START_HOUR * 60
+        day_night_ot = np.where(end <= night_start, 0, np.minimum(end - night_start, overtime))
+        starts_at_night = hour >= 16
+        night_ot = np.where(starts_at_night, overtime, day_night_ot)
+        ot = np.where(starts_at_night, 0, overtime - day_night_ot)
+
+        regular_salary = (regular / 60) * base_rate
+        ot_salary = (ot / 60) * np.where(is_c342, night_ot_rate, base_rate)
+        night_ot_salary = (night_ot / 60) * night_ot_rate
+        total_salary = regular_salary + ot_salary + night_ot_salary
+
+        columns = {
+            'shift_type': np.where(is_c342, 'C342', 'C341'),
+            'total_minutes': total,
+            'break_minutes': break_minutes,
+            'paid_minutes': paid,
+            'regular_minutes': regular,
+            'ot_minutes': ot,
+            'night_ot_minutes': night_ot,
+            'regular_salary': regular_salary,
+            'ot_salary': ot_salary,
+            'night_ot_salary': night_ot_salary,
+            'total_salary': total_salary
+        }
+        return {field: values.tolist() for field, values in columns.items()}
+
+    def _calculate_python(self, start_minutes, end_minutes, base_rate, night_ot_rate) -> Dict[str, list]:
+        columns = {field: [] for field in RESULT_FIELDS}
+        limit = self.calculator.REGULAR_HOURS_LIMIT
+        night_start = self.calculator.NIGHT_START_HOUR * 60
+        c341_windows, c342_windows = self.break_windows['C341'], self.break_windows['C342']
+        (c341_start, c341_end), (c342_start, c342_end) = self.shift_times['C341'], self.shift_times['C342']
+
+        for start, end in zip(start_minutes, end_minutes):
+            hour = start // 60
+            if abs(start - c341_start) <= DETECT_TOLERANCE and abs(end - c341_end) <= DETECT_TOLERANCE:
+                is_c342 = False
+            else:
+                is_c342 = ((abs(start - c342_start) <= DETECT_TOLERANCE and abs(end - c342_end) <= DETECT_TOLERANCE)
+                           or 16 <= hour <= 23)
+
+            work_end = end + DAY_MINUTES if end < start else end
+            total = work_end - start
+
+            break_minutes = 0
+            for break_start, break_end in (c342_windows if is_c342 else c341_windows):
+                overlap = min(work_end, break_end) - max(start, break_start)
+                if overlap > 0:
+                    break_minutes += overlap
+
+            paid = total - break_minutes
+            regular = min(paid, limit)
+            overtime = max(0, paid - limit)
+
+            if hour >= 16:
+                night_ot, ot = overtime, 0
+            else:
+                night_ot = 0 if end <= night_start else min(end - night_start, overtime)
+                ot = overtime - night_ot
+
+            regular_salary = (regular / 60) * base_rate
+            ot_salary = (ot / 60) * (night_ot_rate if is_c342 else base_rate)
+            night_ot_salary = (night_ot / 60) * night_ot_rate
+
+            columns['shift_type'].append('C342' if is_c342 else 'C341')
+            columns['total_minutes'].append(total)
+            columns['break_minutes'].append(break_minutes)
+            columns['paid_minutes'].append(paid)
+            columns['regular_minutes'].append(regular)
+            columns['ot_minutes'].append(ot)
+            columns['night_ot_minutes'].append(night_ot)
+            columns['regular_salary'].append(regular_salary)
+            columns['ot_salary'].append(ot_salary)
+            columns['night_ot_salary'].append(night_ot_salary)
+            columns['total_salary'].append(regular_salary + ot_salary + night_ot_salary)
+
+        return columns
+
+    def reprice_history(self, user_data: Dict, base_rate: Optional[float] = None,
+                        night_ot_rate: Optional[float] = None) -> Dict:
+        """Recalculate every stored entry of a user's history at the given rates.
+
+        Returns a copy of user_data with the pay and minute fields replaced;
+        entries whose times cannot be parsed are kept unchanged.
+        """
+        positions = []
+        starts, ends = [], []
+        for date_str, entries in user_data.items():
+            for index, entry in enumerate(entries):
+                start = time_to_minutes(entry.get('start_time', ''))
+                end = time_to_minutes(entry.get('end_time', ''))
+                if start is None or end is None:
+                    logger.warning(f"Skipping entry with unreadable times on {date_str}")
+                    continue
+                positions.append((date_str, index))
+                starts.append(start)
+                ends.append(end)
+
+        columns = self.calculate(starts, ends, base_rate, night_ot_rate)
+
+        repriced = {date_str: [dict(entry) for entry in entries] for date_str, entries in user_data.items()}
+        for row, (date_str, index) in enumerate(positions):
+            entry = repriced[date_str][index]
+            for field in RESULT_FIELDS:
+                entry[field] = columns[field][row]
+        return repriced
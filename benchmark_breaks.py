@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: break deduction by per-call parsing versus the compiled BreakTable."""
+
+import argparse
+import json
+import random
+import timeit
+from datetime import datetime
+from salary_calculator import SalaryCalculator
+
+
+def run(windows: int = 2000, repeat: int = 5) -> dict:
+    """Time each break-deduction path over random work windows. Returns microseconds per call."""
+    calculator = SalaryCalculator()
+    rng = random.Random(42)
+    samples = []
+    for _ in range(windows):
+        shift_type = rng.choice(['C341', 'C342'])
+        start, end = rng.randrange(24 * 60), rng.randrange(24 * 60)
+        samples.append((shift_type, start, end,
+                        datetime(1900, 1, 1, start // 60, start % 60),
+                        datetime(1900, 1, 1, end // 60, end % 60)))
+
+    detector = calculator.shift_detector
+    breaks = {shift_type: detector.get_shift_config(shift_type)['breaks'] for shift_type in ('C341', 'C342')}
+
+    def parse_each_call():
+        for shift_type, _, _, start_time, end_time in samples:
+            calculator.calculate_break_deductions(start_time, end_time, breaks[shift_type])
+
+    def table_with_details():
+        for shift_type, start, end, _, _ in samples:
+            detector.get_break_table(shift_type).deduct_with_details(start, end)
+
+    def table_minutes_only():
+        for shift_type, start, end, _, _ in samples:
+            detector.get_break_table(shift_type).deduct(start, end)
+
+    results = {'windows': windows}
+    for name, func in (('parse_each_call_us', parse_each_call),
+                       ('table_with_details_us', table_with_details),
+                       ('table_minutes_only_us', table_minutes_only)):
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        results[name] = round(best / windows * 1e6, 3)
+    results['speedup'] = round(results['parse_each_call_us'] / results['table_with_details_us'], 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Break deduction micro-benchmark")
+    parser.add_argument("--windows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.windows, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Concurrency stress benchmark: many users saving shifts at once must lose no updates.
+
+Each worker process runs an asyncio loop in which every simulated user saves
+its shifts concurrently. With python-telegram-bot installed the saves go
+through ``SalaryTelegramBot.handle_time_input``; otherwise DataStorage is
+called from worker threads, which is what the handlers do under load.
+Afterwards the data file is re-read and every user's entry count checked.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Dict
+from salary_calculator import SalaryCalculator
+from data_storage import DataStorage
+from storage_backends import JsonFileBackend
+
+
+class UnlockedJsonBackend(JsonFileBackend):
+    """The pre-locking behaviour: unguarded read-modify-write, file rewritten in place."""
+
+    def __init__(self, data_file: str):
+        super().__init__(data_file)
+        self._lock = _NoLock()
+
+    def _write_all(self, all_data: Dict) -> None:
+        with open(self.data_file, 'w', encoding='utf-8') as f:
+            json.dump(all_data, f, ensure_ascii=False, indent=2)
+
+    def _read_all(self) -> Dict:
+        # A reader can catch a half-written file; the original code then saw no data
+        try:
+            return super()._read_all()
+        except ValueError:
+            return {}
+
+
+class _NoLock:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def _make_storage(data_file: str, unlocked: bool) -> DataStorage:
+    if unlocked:
+        return DataStorage(data_file, backend=UnlockedJsonBackend(data_file))
+    return DataStorage(data_file, backend=JsonFileBackend(data_file))
+
+
+def _fake_update(user_id: str, text: str):
+    async def reply_text(*args, **kwargs):
+        return None
+
+    return SimpleNamespace(
+        message=SimpleNamespace(text=text, reply_text=reply_text),
+        effective_user=SimpleNamespace(id=user_id)
+    )
+
+
+async def _run_users(storage: DataStorage, user_ids, saves: int) -> str:
+    """Save `saves` shifts for every user concurrently. Returns the path used."""
+    try:
+        from main import SalaryTelegramBot
+    except ImportError:
+        SalaryTelegramBot = None
+
+    if SalaryTelegramBot:
+        bot = SalaryTelegramBot("0:benchmark")
+        bot.storage = storage
+
+        async def save(user_id):
+            await bot.handle_time_input(_fake_update(user_id, "08:30 ~ 17:30"), None)
+        path = "handlers"
+    else:
+        result = SalaryCalculator().calculate_salary("08:30", "17:30")
+
+        async def save(user_id):
+            await asyncio.to_thread(storage.save_calculation, user_id, result)
+        path = "threads"
+
+    async def user_session(user_id):
+        for _ in range(saves):
+            await save(user_id)
+
+    await asyncio.gather(*(user_session(user_id) for user_id in user_ids))
+    return path
+
+
+def _worker(data_file: str, user_ids, saves: int, unlocked: bool, results) -> None:
+    storage = _make_storage(data_file, unlocked)
+    results.put(asyncio.run(_run_users(storage, user_ids, saves)))
+
+
+def run(users: int = 200, saves: int = 3, processes: int = 4, unlocked: bool = False) -> Dict:
+    """Run the stress test in a temp directory and return the outcome."""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "salary_data.json")
+        _make_storage(data_file, unlocked)
+
+        user_ids = [f"bench_{index}" for index in range(users)]
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_worker,
+                                    args=(data_file, user_ids[index::processes], saves, unlocked, results))
+            for index in range(processes)
+        ]
+
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        paths = {results.get() for _ in workers}
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        stored = JsonFileBackend(data_file)._read_all()
+        saved = sum(len(entries) for user_data in stored.values() for entries in user_data.values())
+
+    expected = users * saves
+    return {
+        'backend': 'unlocked' if unlocked else 'locked',
+        'path': ",".join(sorted(paths)),
+        'users': users,
+        'processes': processes,
+        'expected_entries': expected,
+        'saved_entries': saved,
+        'lost_updates': expected - saved,
+        'seconds': round(elapsed, 3),
+        'saves_per_second': round(expected / elapsed, 1) if elapsed else 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent save stress benchmark")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--saves", type=int, default=3, help="shifts saved per user")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--compare", action="store_true", help="also run without locking or atomic writes")
+    args = parser.parse_args()
+
+    modes = [False, True] if args.compare else [False]
+    for unlocked in modes:
+        outcome = run(args.users, args.saves, args.processes, unlocked)
+        print(json.dumps(outcome, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: CallbackRouter lookups versus the if/elif chain it replaced.
+
+The routes are read from ``SalaryTelegramBot._build_callback_router`` in
+main.py, so every existing callback key (plus one sample value per prefix)
+is measured without importing the Telegram library.
+"""
+
+import argparse
+import ast
+import asyncio
+import json
+import time
+import timeit
+from typing import Dict, List, Tuple
+from callback_router import CallbackRouter
+from metrics import metrics
+
+PREFIX_SAMPLES = {"day_shift_": "day_shift_17:00", "night_shift_": "night_shift_05:00", "preset_": "preset_1"}
+
+
+def bot_routes(path: str = "main.py") -> Tuple[List[str], List[str]]:
+    """(exact keys, prefixes) registered by SalaryTelegramBot._build_callback_router, in order."""
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    builder = next(node for node in ast.walk(tree)
+                   if isinstance(node, ast.FunctionDef) and node.name == "_build_callback_router")
+    keys, prefixes = [], []
+    for node in ast.walk(builder):
+        if isinstance(node, ast.Dict):
+            keys.extend(key.value for key in node.keys)
+        elif isinstance(node, ast.Call) and getattr(node.func, 'attr', None) == "add_prefix":
+            prefixes.append(node.args[0].value)
+    return keys, prefixes
+
+
+def chain_resolver(keys: List[str], prefixes: List[str]):
+    """A function equivalent to the old if/elif chain: one comparison per branch until one matches."""
+    lines = ["def resolve(callback_data):"]
+    for index, key in enumerate(keys):
+        lines.append(f"    {'if' if index == 0 else 'elif'} callback_data == {key!r}:")
+        lines.append(f"        return {key!r}")
+    for prefix in prefixes:
+        lines.append(f"    elif callback_data.startswith({prefix!r}):")
+        lines.append(f"        return {prefix + '*'!r}")
+    lines.append("    return None")
+    namespace: Dict = {}
+    exec("\n".join(lines), namespace)
+    return namespace["resolve"]
+
+
+def run(number: int = 20000, repeat: int = 5) -> Dict:
+    """Nanoseconds per lookup for every key with both resolvers, and per async dispatch."""
+    keys, prefixes = bot_routes()
+
+    async def handler(*args):
+        return None
+
+    router = CallbackRouter()
+    for key in keys:
+        router.add(key, handler)
+    for prefix in prefixes:
+        router.add_prefix(prefix, handler)
+    chain = chain_resolver(keys, prefixes)
+
+    samples = keys + [PREFIX_SAMPLES.get(prefix, prefix + "x") for prefix in prefixes]
+    per_key = {}
+    for data in samples:
+        assert router.resolve(data) is not None and chain(data) is not None, data
+        router_ns = min(timeit.repeat(lambda: router.resolve(data), number=number, repeat=repeat)) / number * 1e9
+        chain_ns = min(timeit.repeat(lambda: chain(data), number=number, repeat=repeat)) / number * 1e9
+        per_key[data] = {'router_ns': round(router_ns, 1), 'chain_ns': round(chain_ns, 1)}
+
+    async def dispatch_all():
+        started = time.perf_counter()
+        for _ in range(number // 10):
+            for data in samples:
+                await router.dispatch(data)
+        dispatched = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(number // 10):
+            for data in samples:
+                await handler()
+        direct = time.perf_counter() - started
+        return (dispatched - direct) / (number // 10 * len(samples)) * 1e9
+
+    previous_rate = metrics.sample_rate
+    metrics.sample_rate = 0.1
+    try:
+        dispatch_ns = asyncio.run(dispatch_all())
+    finally:
+        metrics.sample_rate = previous_rate
+        metrics.reset()
+
+    router_values = [values['router_ns'] for values in per_key.values()]
+    chain_values = [values['chain_ns'] for values in per_key.values()]
+    return {
+        'routes': len(samples),
+        'router_mean_ns': round(sum(router_values) / len(router_values), 1),
+        'router_max_ns': max(router_values),
+        'chain_mean_ns': round(sum(chain_values) / len(chain_values), 1),
+        'chain_max_ns': max(chain_values),
+        'dispatch_overhead_ns': round(dispatch_ns, 1),
+        'per_key': per_key
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Callback dispatch micro-benchmark")
+    parser.add_argument("--number", type=int, default=20000, help="lookups per timing")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--summary", action="store_true", help="omit per-key timings")
+    args = parser.parse_args()
+    results = run(args.number, args.repeat)
+    if args.summary:
+        results.pop('per_key')
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
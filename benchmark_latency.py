@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Latency benchmark: p50/p95/p99 response time of concurrent users.
+
+Many simulated users hit the bot at once with a mix of dashboard reads and
+shift saves against a realistically large data file. ``inline`` calls the
+managers directly on the event loop (the old handler behaviour); ``pool``
+awaits them through AsyncFacade, as the handlers now do.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+from salary_calculator import SalaryCalculator
+from data_storage import DataStorage
+from analytics import Analytics
+from storage_backends import JsonFileBackend
+from user_cache import CachedBackend
+from async_io import AsyncFacade
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _seed(data_file: str, users: int, days: int) -> None:
+    """Write a data file with `days` shifts for each of `users` users."""
+    calculator = SalaryCalculator()
+    result = calculator.calculate_salary("08:30", "17:30")
+    storage = DataStorage(backend=JsonFileBackend(data_file))
+    entry_date = date.today()
+    # Build one user's history through DataStorage, then copy it to everyone
+    for offset in range(days):
+        storage.save_calculation_with_date("seed", result, (entry_date - timedelta(days=offset)).isoformat())
+    history = storage.load_user_data("seed")
+    JsonFileBackend(data_file)._write_all({f"user_{index}": history for index in range(users)})
+
+
+async def _client(user_id: str, requests: int, save_every: int, inline: bool,
+                  storage, analytics, result: Dict, latencies: Dict[str, List[float]]) -> None:
+    for index in range(requests):
+        kind = 'save' if index % save_every == save_every - 1 else 'dashboard'
+        started = time.perf_counter()
+        if inline:
+            if kind == 'save':
+                storage.target.save_calculation(user_id, result)
+            else:
+                analytics.target.generate_summary_stats(user_id, 30)
+            # Handlers yield to the loop when replying
+            await asyncio.sleep(0)
+        else:
+            if kind == 'save':
+                await storage.save_calculation(user_id, result)
+            else:
+                await analytics.generate_summary_stats(user_id, 30)
+        latencies[kind].append((time.perf_counter() - started) * 1000)
+
+
+async def _run(mode: str, data_file: str, clients: int, requests: int, save_every: int) -> Dict:
+    storage = DataStorage(backend=CachedBackend(JsonFileBackend(data_file)))
+    facade = AsyncFacade(storage)
+    analytics = AsyncFacade(Analytics(storage=storage))
+    result = SalaryCalculator().calculate_salary("08:30", "17:30")
+    latencies = {'dashboard': [], 'save': []}
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(f"user_{index}", requests, save_every, mode == 'inline', facade, analytics, result, latencies)
+        for index in range(clients)
+    ))
+    elapsed = time.perf_counter() - started
+
+    outcome = {'mode': mode, 'clients': clients, 'requests': clients * requests, 'seconds': round(elapsed, 3)}
+    for kind, values in latencies.items():
+        if values:
+            outcome[kind] = {f"p{p}_ms": round(_percentile(values, p), 2) for p in (50, 95, 99)}
+    return outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Handler latency under concurrent load")
+    parser.add_argument("--users", type=int, default=100, help="users in the seeded data file")
+    parser.add_argument("--days", type=int, default=30, help="shifts per seeded user")
+    parser.add_argument("--clients", type=int, default=50, help="concurrent simulated users")
+    parser.add_argument("--requests", type=int, default=10, help="requests per client")
+    parser.add_argument("--save-every", type=int, default=5, help="every Nth request saves a shift")
+    parser.add_argument("--mode", choices=["inline", "pool", "both"], default="both")
+    args = parser.parse_args()
+
+    modes = ["inline", "pool"] if args.mode == "both" else [args.mode]
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "salary_data.json")
+        _seed(data_file, args.users, args.days)
+        for mode in modes:
+            outcome = asyncio.run(_run(mode, data_file, args.clients, args.requests, args.save_every))
+            print(json.dumps(outcome))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Missing-entry scan benchmark over a large synthetic user base.
+
+Seeds ``--users`` users (default 100k) with ``--days`` days of history in a
+temporary store, then times:
+
+* ``scan``: ``MissingEntryScanner.build_send_list``, one pass over every user
+* ``per_user``: ``NotificationManager.check_missing_entries`` called user by
+  user, as a job would without the scanner; timed on ``--sample`` users
+  because it reloads data per user
+
+Results use the benchmark_suite document layout, so ``--baseline`` gates
+on regressions the same way.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict
+from benchmark_suite import compare
+from data_storage import DataStorage
+from missing_entries import MissingEntryScanner
+from notifications import NotificationManager
+from storage_backends import JsonFileBackend, SqliteBackend, JournaledJsonBackend, PackedRecordBackend
+
+BACKENDS = ('json', 'sqlite', 'journal', 'packed')
+
+ENTRY = {'start_time': '08:30', 'end_time': '17:30', 'total_minutes': 540, 'total_salary': 12000.0}
+
+
+def make_backend(name: str, tmp: str):
+    if name == 'sqlite':
+        return SqliteBackend(os.path.join(tmp, "salary_data.db"))
+    if name == 'journal':
+        return JournaledJsonBackend(os.path.join(tmp, "salary_data.snapshot.json"),
+                                    fsync_policy="never", compact_interval=3600, compact_threshold=10 ** 9)
+    if name == 'packed':
+        return PackedRecordBackend(os.path.join(tmp, "packed"))
+    return JsonFileBackend(os.path.join(tmp, "salary_data.json"))
+
+
+def seed(backend, users: int, days: int, today: date, seed_value: int) -> None:
+    """Give every user a history where each weekday is worked with 85% probability."""
+    rng = random.Random(seed_value)
+    history = [(today - timedelta(days=offset)) for offset in range(1, days + 1)]
+    all_data = {}
+    for index in range(users):
+        all_data[str(1000000 + index)] = {day.isoformat(): [ENTRY] for day in history
+                                          if day.weekday() < 5 and rng.random() < 0.85}
+
+    if isinstance(backend, JsonFileBackend):
+        # One write instead of one read-modify-write per user
+        with open(backend.data_file, 'w', encoding='utf-8') as f:
+            json.dump(all_data, f)
+    else:
+        for user_id, user_data in all_data.items():
+            backend.save_user(user_id, user_data)
+
+
+def run(backend_name: str, users: int, days: int, sample: int, seed_value: int) -> Dict:
+    """Seed a store and time both ways of finding missing entries. Returns the results document."""
+    today = date.today()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = make_backend(backend_name, tmp)
+        started = time.perf_counter()
+        seed(backend, users, days, today, seed_value)
+        seed_seconds = time.perf_counter() - started
+        storage = DataStorage(backend=backend)
+
+        started = time.perf_counter()
+        send_list = MissingEntryScanner(storage=storage).build_send_list(today)
+        elapsed = time.perf_counter() - started
+        results['scan'] = {'count': users, 'seconds': round(elapsed, 3), 'to_nudge': len(send_list),
+                           'mean_us': round(elapsed / users * 1e6, 2), 'ops_per_sec': round(users / elapsed, 1)}
+
+        manager = NotificationManager(storage=storage)
+        user_ids = random.Random(seed_value).sample(storage.list_users(), min(sample, users))
+        started = time.perf_counter()
+        for user_id in user_ids:
+            manager.check_missing_entries(user_id)
+        elapsed = time.perf_counter() - started
+        results['per_user'] = {'count': len(user_ids), 'seconds': round(elapsed, 3),
+                               'mean_us': round(elapsed / len(user_ids) * 1e6, 2),
+                               'ops_per_sec': round(len(user_ids) / elapsed, 1),
+                               'estimated_total_seconds': round(elapsed / len(user_ids) * users, 1)}
+
+        if isinstance(backend, JournaledJsonBackend):
+            backend.close()
+
+    return {
+        'meta': {
+            'backend': backend_name, 'users': users, 'days': days, 'sample': sample, 'seed': seed_value,
+            'seed_seconds': round(seed_seconds, 1),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'run_at': datetime.now().isoformat(timespec='seconds')
+        },
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Missing-entry scan benchmark")
+    parser.add_argument("--backend", choices=BACKENDS, default="json")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=30, help="days of history per user")
+    parser.add_argument("--sample", type=int, default=20, help="users timed with the per-user check")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the results document to this file")
+    parser.add_argument("--baseline", help="results document to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, e.g. 0.5 = 50%%")
+    args = parser.parse_args()
+
+    if args.users < 1 or args.days < 1 or args.sample < 1:
+        parser.error("--users, --days and --sample must be positive")
+
+    document = run(args.backend, args.users, args.days, args.sample, args.seed)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            document['regressions'] = compare(document, json.load(f), args.tolerance)
+
+    output = json.dumps(document, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+
+    return 1 if document.get('regressions') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-entry dicts versus slotted ShiftRecords (memory and iteration)."""
+
+import argparse
+import gc
+import json
+import timeit
+import tracemalloc
+from datetime import date, timedelta
+from salary_calculator import SalaryCalculator
+from shift_record import ShiftRecords
+
+
+def _entries(count: int) -> dict:
+    """A history of count entries in the layout save_calculation_with_date writes."""
+    calculator = SalaryCalculator()
+    templates = []
+    for start, end in (("08:30", "17:30"), ("16:45", "01:25"), ("09:00", "20:00")):
+        result = calculator.calculate_salary(start, end)
+        templates.append({
+            'timestamp': '2025-07-01T12:00:00.123456', 'start_time': start, 'end_time': end,
+            **{field: result[field] for field in ('shift_type', 'total_minutes', 'break_minutes', 'paid_minutes',
+                                                  'regular_minutes', 'ot_minutes', 'night_ot_minutes',
+                                                  'regular_salary', 'ot_salary', 'night_ot_salary',
+                                                  'total_salary')}
+        })
+    user_data = {}
+    for index in range(count):
+        date_str = (date(2000, 1, 1) + timedelta(days=index)).isoformat()
+        # Fresh dicts with their own values, like entries loaded from JSON
+        user_data[date_str] = [json.loads(json.dumps(dict(templates[index % 3], calculation_date=date_str)))]
+    return user_data
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+
+def run(entries: int = 100000, repeat: int = 5) -> dict:
+    """Compare memory and a paid-minutes/salary summing loop. Returns bytes and microseconds."""
+    source = json.dumps(_entries(entries))
+    dicts, dict_bytes = _measure(lambda: json.loads(source))
+    # Built straight from freshly parsed JSON, so only what the records keep is counted
+    records, record_bytes = _measure(lambda: ShiftRecords(json.loads(source)).ordered())
+
+    def sum_dicts():
+        paid = salary = 0
+        for day in dicts.values():
+            for entry in day:
+                paid += entry.get('paid_minutes', 0)
+                salary += entry.get('total_salary', 0)
+        return paid, salary
+
+    def sum_records():
+        paid = salary = 0
+        for record in records:
+            paid += record.paid_minutes
+            salary += record.total_salary
+        return paid, salary
+
+    assert sum_dicts() == sum_records()
+
+    results = {'entries': entries, 'dict_bytes': dict_bytes, 'record_bytes': record_bytes}
+    results['memory_ratio'] = round(dict_bytes / record_bytes, 2)
+    for name, func in (('dict_iteration_us', sum_dicts), ('record_iteration_us', sum_records)):
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        results[name] = round(best * 1e6, 1)
+    results['iteration_speedup'] = round(results['dict_iteration_us'] / results['record_iteration_us'], 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ShiftRecord versus dict entry micro-benchmark")
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.entries, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Reminder scheduler benchmark with a large number of scheduled reminders.
+
+Loads ``--reminders`` daily reminders at random minutes, then times:
+
+* ``load``: building the heap from notification settings (per reminder)
+* ``schedule``: adding or moving a single reminder
+* ``wake``: one wake-up of the scheduler, popping and rescheduling every
+  reminder due in that minute, for each minute of a simulated day
+* ``fire``: the same day expressed per reminder fired
+* ``poll_scan``: what one wake-up would cost by scanning every user's
+  settings for the current minute, as a polling loop would
+* ``deliver``: ``run()`` sending overdue reminders through a no-op sender
+  at ``--rate`` per second, to check the rate limit holds
+
+Results use the benchmark_suite document layout, so ``--baseline`` gates
+on regressions the same way.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+from benchmark_suite import _stats, compare
+from reminder_scheduler import ReminderScheduler
+
+
+class FakeClock:
+    """Clock the benchmark moves forward a minute at a time."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def synthetic_notifications(reminders: int, seed: int) -> Dict:
+    """Notification settings with one enabled work reminder per synthetic user."""
+    rng = random.Random(seed)
+    return {
+        str(1000000 + index): {'work_reminder': {
+            'time': f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+            'message': 'အလုပ်ချိန် မှတ်သားရန် မမေ့ပါနှင့်!',
+            'enabled': True
+        }}
+        for index in range(reminders)
+    }
+
+
+def bench_deliver(count: int, rate: float) -> Dict:
+    """Send count overdue reminders through run() and report the sustained rate.
+
+    The first batch goes out at once, so the rate is measured over the rest.
+    """
+    clock = FakeClock(time.time())
+    scheduler = ReminderScheduler(clock=clock)
+    due_at = datetime.fromtimestamp(clock.now) + timedelta(minutes=1)
+    for index in range(count):
+        scheduler.schedule(str(index), due_at.strftime('%H:%M'))
+    clock.now = due_at.timestamp()
+    sent = []
+
+    async def send(user_id, message):
+        sent.append(user_id)
+
+    async def scenario():
+        task = asyncio.create_task(scheduler.run(send, rate=rate))
+        started = time.perf_counter()
+        while len(sent) < count:
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - started
+        task.cancel()
+        return elapsed
+
+    elapsed = asyncio.run(scenario())
+    return {'count': count, 'rate': rate, 'seconds': round(elapsed, 3),
+            'sends_per_sec': round((count - int(rate)) / elapsed, 1)}
+
+
+def run(reminders: int, samples: int, rate: float, seed: int) -> Dict:
+    """Run every scenario. Returns the results document."""
+    rng = random.Random(seed)
+    notifications = synthetic_notifications(reminders, seed)
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    clock = FakeClock(start.timestamp() - 1)
+    scheduler = ReminderScheduler(clock=clock)
+    results = {}
+
+    started = time.perf_counter()
+    scheduler.load(notifications)
+    elapsed = time.perf_counter() - started
+    results['load'] = {'count': reminders, 'seconds': round(elapsed, 3),
+                       'mean_us': round(elapsed / reminders * 1e6, 2),
+                       'ops_per_sec': round(reminders / elapsed, 1)}
+
+    user_ids = list(notifications)
+    latencies = []
+    for _ in range(samples):
+        user_id = rng.choice(user_ids)
+        time_str = notifications[user_id]['work_reminder']['time']
+        began = time.perf_counter()
+        scheduler.schedule(user_id, time_str)
+        latencies.append(time.perf_counter() - began)
+    results['schedule'] = _stats(latencies)
+
+    wakes, fired = [], 0
+    for minute in range(24 * 60):
+        clock.now = (start + timedelta(minutes=minute)).timestamp()
+        began = time.perf_counter()
+        fired += len(scheduler.pop_due())
+        wakes.append(time.perf_counter() - began)
+    results['wake'] = _stats(wakes)
+    total = sum(wakes)
+    results['fire'] = {'count': fired, 'mean_us': round(total / fired * 1e6, 2),
+                       'ops_per_sec': round(fired / total, 1)}
+
+    scans = []
+    for minute in rng.sample(range(24 * 60), min(samples, 60)):
+        current = (start + timedelta(minutes=minute)).strftime('%H:%M')
+        began = time.perf_counter()
+        [user_id for user_id, settings in notifications.items()
+         if settings['work_reminder']['enabled'] and settings['work_reminder']['time'] == current]
+        scans.append(time.perf_counter() - began)
+    results['poll_scan'] = _stats(scans)
+
+    results['deliver'] = bench_deliver(int(rate * 3), rate)
+
+    return {
+        'meta': {
+            'reminders': reminders, 'samples': samples, 'rate': rate, 'seed': seed,
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'run_at': datetime.now().isoformat(timespec='seconds')
+        },
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reminder scheduler benchmark")
+    parser.add_argument("--reminders", type=int, default=100000, help="scheduled daily reminders")
+    parser.add_argument("--samples", type=int, default=1000, help="timed schedule() calls")
+    parser.add_argument("--rate", type=float, default=1000.0, help="sends per second for the delivery run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the results document to this file")
+    parser.add_argument("--baseline", help="results document to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, e.g. 0.5 = 50%%")
+    args = parser.parse_args()
+
+    if args.reminders < 1 or args.rate < 1:
+        parser.error("--reminders and --rate must be at least 1")
+
+    document = run(args.reminders, args.samples, args.rate, args.seed)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            document['regressions'] = compare(document, json.load(f), args.tolerance)
+
+    output = json.dumps(document, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+
+    return 1 if document.get('regressions') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
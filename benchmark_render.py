@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Message render benchmark for the salary reply and both dashboards.
+
+Times, per rendered message:
+
+* ``salary_render``: ``format_salary_response`` for distinct calculations,
+  each rendered from the compiled template
+* ``salary_cached``: the same calls for calculations already rendered, as
+  when the calculator serves a memoized result
+* ``premium_render`` / ``dashboard_render``: the "🎯 DASHBOARD" button and
+  dashboard callback texts rendered from a snapshot
+* ``premium_cached`` / ``dashboard_cached``: the same texts for a snapshot
+  they were already rendered from
+* ``snapshot_build`` / ``snapshot_cached``: building a user's dashboard
+  snapshot versus ``get_dashboard`` returning the one already built
+
+Snapshots are built from ``--users`` synthetic users with a month of
+history. Results use the benchmark_suite document layout, so
+``--baseline`` gates on regressions the same way.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List
+from analytics_snapshot import SnapshotManager
+from benchmark_suite import _stats, compare, synthetic_history
+from burmese_formatter import BurmeseFormatter
+from data_storage import DataStorage
+from salary_calculator import SalaryCalculator
+
+
+def _time_each(func: Callable, items: List) -> Dict:
+    latencies = []
+    for item in items:
+        started = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - started)
+    return _stats(latencies)
+
+
+def run(users: int, samples: int, seed: int) -> Dict:
+    """Render every message kind cold and cached. Returns the results document."""
+    rng = random.Random(seed)
+    calculator = SalaryCalculator()
+    formatter = BurmeseFormatter()
+    results = {}
+
+    windows = [(f"{start // 60:02d}:{start % 60:02d}", f"{end // 60:02d}:{end % 60:02d}")
+               for start in range(0, 24 * 60, 15) for end in range(0, 24 * 60, 15)]
+    rng.shuffle(windows)
+    calculations = [calculator.calculate_salary(start, end) for start, end in windows[:formatter.MEMO_SIZE]]
+    results['salary_render'] = _time_each(formatter.format_salary_response, calculations)
+    results['salary_cached'] = _time_each(formatter.format_salary_response,
+                                          [rng.choice(calculations) for _ in range(samples)])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(os.path.join(tmp, "salary_data.json"))
+        for index in range(users):
+            storage.save_user_data(str(index), synthetic_history(calculator, rng, 1 / 12, date.today()))
+        manager = SnapshotManager(storage=storage)
+        snapshots = [manager.build_dashboard(str(index)) for index in range(users)]
+        user_ids = [str(rng.randrange(users)) for _ in range(samples)]
+        results['snapshot_build'] = _time_each(manager.build_dashboard, user_ids)
+        for index in range(users):
+            manager.get_dashboard(str(index))
+        results['snapshot_cached'] = _time_each(manager.get_dashboard, user_ids)
+
+    picks = [rng.choice(snapshots) for _ in range(samples)]
+    results['premium_render'] = _time_each(formatter._render_premium_dashboard, picks)
+    results['dashboard_render'] = _time_each(formatter._render_dashboard, picks)
+    for snapshot in snapshots:
+        formatter.format_premium_dashboard(snapshot)
+        formatter.format_dashboard(snapshot)
+    results['premium_cached'] = _time_each(formatter.format_premium_dashboard, picks)
+    results['dashboard_cached'] = _time_each(formatter.format_dashboard, picks)
+
+    return {
+        'meta': {
+            'users': users, 'samples': samples, 'seed': seed,
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'run_at': datetime.now().isoformat(timespec='seconds')
+        },
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message render benchmark")
+    parser.add_argument("--users", type=int, default=20, help="users with a dashboard snapshot")
+    parser.add_argument("--samples", type=int, default=5000, help="timed renders per message kind")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the results document to this file")
+    parser.add_argument("--baseline", help="results document to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, e.g. 0.5 = 50%%")
+    args = parser.parse_args()
+
+    if args.users < 1 or args.samples < 1:
+        parser.error("--users and --samples must be positive")
+
+    document = run(args.users, args.samples, args.seed)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            document['regressions'] = compare(document, json.load(f), args.tolerance)
+
+    output = json.dumps(document, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+
+    return 1 if document.get('regressions') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Startup benchmark: time from a fresh interpreter to a constructed bot.
+
+Each scenario runs in its own interpreter, inside an empty working directory,
+so imports and data files are always cold:
+
+* ``bot``: ``import main`` and construct ``SalaryTelegramBot`` (needs the
+  Telegram library; reported as skipped without it)
+* ``managers_lazy``: the manager facades as the bot now builds them
+* ``managers_eager``: importing and constructing every manager up front,
+  as the bot did before managers became lazy
+
+Both manager scenarios import asyncio first, as the Telegram library does.
+
+Results use the benchmark_suite document layout, so ``--baseline`` gates
+on startup regressions the same way.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, Optional
+from benchmark_suite import _stats, compare
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS = {
+    'bot': "import main\nmain.SalaryTelegramBot('0:benchmark')",
+    'managers_lazy': """
+import asyncio
+from async_io import LazyFacade
+import importlib
+for module_name, class_name in (('analytics', 'Analytics'), ('export_manager', 'ExportManager'),
+                                ('notifications', 'NotificationManager'), ('goal_tracker', 'GoalTracker'),
+                                ('calendar_manager', 'CalendarManager')):
+    LazyFacade(lambda module_name=module_name, class_name=class_name:
+               getattr(importlib.import_module(module_name), class_name)(), class_name)
+""",
+    'managers_eager': """
+import asyncio
+from data_storage import DataStorage
+from analytics import Analytics
+from export_manager import ExportManager
+from notifications import NotificationManager
+from goal_tracker import GoalTracker
+from calendar_manager import CalendarManager
+storage = DataStorage()
+for manager_class in (Analytics, ExportManager, NotificationManager, GoalTracker, CalendarManager):
+    manager_class(storage=storage)
+""",
+}
+
+TIMER = "import time\n_started = time.perf_counter()\n{code}\nprint(time.perf_counter() - _started)\n"
+
+
+def time_scenario(code: str) -> Optional[float]:
+    """Seconds from the first statement to the end of code in a fresh interpreter, or None if it failed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=REPO_DIR, STORAGE_BACKEND=os.getenv("STORAGE_BACKEND", "json"))
+        completed = subprocess.run([sys.executable, "-c", TIMER.format(code=code)], cwd=tmp, env=env,
+                                   capture_output=True, text=True)
+    if completed.returncode != 0:
+        return None
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int = 10) -> Dict:
+    """Time every scenario `runs` times. Returns the results document."""
+    results = {}
+    for name, code in SCENARIOS.items():
+        timings = []
+        for _ in range(runs):
+            seconds = time_scenario(code)
+            if seconds is None:
+                break
+            timings.append(seconds)
+        if timings:
+            results[name] = _stats(timings)
+        else:
+            results[name] = {'skipped': "scenario failed (missing dependency?)"}
+
+    return {
+        'meta': {
+            'runs': runs, 'python': platform.python_version(), 'platform': platform.platform(),
+            'run_at': datetime.now().isoformat(timespec='seconds')
+        },
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bot startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per scenario")
+    parser.add_argument("--output", help="also write the results document to this file")
+    parser.add_argument("--baseline", help="results document to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, e.g. 0.5 = 50%%")
+    args = parser.parse_args()
+
+    document = run(args.runs)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            document['regressions'] = compare(document, json.load(f), args.tolerance)
+
+    output = json.dumps(document, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+
+    return 1 if document.get('regressions') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
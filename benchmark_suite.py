@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the calculator, storage, analytics and export hot paths.
+
+Seeds a temporary store with synthetic users and multi-year histories, then
+times the operations handlers run most and writes one JSON document of
+results. With ``--baseline`` the results are compared against an earlier
+run and the exit status is 1 when any metric regressed by more than
+``--tolerance``, so the suite can gate a deploy:
+
+    python benchmark_suite.py --output baseline.json
+    python benchmark_suite.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Tuple
+from salary_calculator import SalaryCalculator
+from data_storage import DataStorage
+from analytics import Analytics
+from notifications import NotificationManager
+from export_manager import ExportManager
+from storage_backends import (JsonFileBackend, ShardedJsonBackend, PackedRecordBackend, SqliteBackend,
+                              JournaledJsonBackend)
+from user_cache import CachedBackend
+
+BACKENDS = ('json', 'sharded', 'packed', 'sqlite', 'journal')
+
+# Typical shift windows; each is jittered by up to +/-30 minutes in 5-minute steps
+SHIFT_PATTERNS = (("08:30", "17:30"), ("16:45", "01:25"), ("08:30", "20:30"), ("16:45", "03:00"))
+
+# Metrics checked against a baseline; tail percentiles of microsecond calls are too noisy to gate on
+LOWER_IS_BETTER = ('p50_us',)
+HIGHER_IS_BETTER = ('ops_per_sec',)
+
+
+def _jitter(time_str: str, rng: random.Random) -> str:
+    hours, minutes = map(int, time_str.split(':'))
+    total = (hours * 60 + minutes + rng.randrange(-6, 7) * 5) % (24 * 60)
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+def synthetic_history(calculator: SalaryCalculator, rng: random.Random, years: float,
+                      end_date: date) -> Dict:
+    """A user's history ending at end_date: about five shifts a week over `years` years."""
+    user_data = {}
+    day = end_date - timedelta(days=int(years * 365) - 1)
+    while day <= end_date:
+        if rng.random() < 5 / 7:
+            start, end = rng.choice(SHIFT_PATTERNS)
+            result = calculator.calculate_salary(_jitter(start, rng), _jitter(end, rng))
+            date_str = day.isoformat()
+            timestamp = datetime.combine(day, datetime.min.time()) + timedelta(seconds=rng.randrange(86400))
+            user_data[date_str] = [{
+                'timestamp': timestamp.isoformat(),
+                'start_time': result['start_time'].strftime("%H:%M"),
+                'end_time': result['end_time'].strftime("%H:%M"),
+                'shift_type': result['shift_type'],
+                'total_minutes': result['total_minutes'],
+                'break_minutes': result['break_minutes'],
+                'paid_minutes': result['paid_minutes'],
+                'regular_minutes': result['regular_minutes'],
+                'ot_minutes': result['ot_minutes'],
+                'night_ot_minutes': result['night_ot_minutes'],
+                'regular_salary': result['regular_salary'],
+                'ot_salary': result['ot_salary'],
+                'night_ot_salary': result['night_ot_salary'],
+                'total_salary': result['total_salary'],
+                'calculation_date': date_str
+            }]
+        day += timedelta(days=1)
+    return user_data
+
+
+def synthetic_users(users: int, years: float, seed: int) -> Iterator[Tuple[str, Dict]]:
+    """Yield (user_id, history) pairs one at a time, so large populations are never all in memory."""
+    rng = random.Random(seed)
+    calculator = SalaryCalculator()
+    today = date.today()
+    for index in range(users):
+        # Histories of different lengths, up to `years`
+        yield f"user_{index}", synthetic_history(calculator, rng, years * rng.uniform(0.25, 1.0), today)
+
+
+def seed_backend(name: str, directory: str, users: int, years: float, seed: int):
+    """Create backend `name` under directory and fill it. Returns (backend, entries written)."""
+    entries = 0
+    if name == 'json':
+        # A single-file store is written once; saving user by user would rewrite it every time
+        all_data = {}
+        for user_id, history in synthetic_users(users, years, seed):
+            all_data[user_id] = history
+            entries += len(history)
+        backend = JsonFileBackend(os.path.join(directory, "salary_data.json"))
+        backend._write_all(all_data)
+        return backend, entries
+
+    if name == 'sharded':
+        backend = ShardedJsonBackend(os.path.join(directory, "shards"))
+    elif name == 'packed':
+        backend = PackedRecordBackend(os.path.join(directory, "packed"))
+    elif name == 'sqlite':
+        backend = SqliteBackend(os.path.join(directory, "salary_data.db"))
+    elif name == 'journal':
+        backend = JournaledJsonBackend(os.path.join(directory, "salary_data.snapshot.json"),
+                                       log_file=os.path.join(directory, "salary_data.log"),
+                                       fsync_policy="never")
+    else:
+        raise ValueError(f"Unknown backend '{name}'")
+
+    for user_id, history in synthetic_users(users, years, seed):
+        backend.save_user(user_id, history)
+        entries += len(history)
+    return backend, entries
+
+
+def _stats(latencies: List[float]) -> Dict:
+    """Percentiles in microseconds plus throughput for a list of per-call seconds."""
+    ordered = sorted(latencies)
+
+    def percentile(percent):
+        return ordered[min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered))) - 1))]
+
+    total = sum(ordered)
+    return {
+        'count': len(ordered),
+        'p50_us': round(percentile(50) * 1e6, 1),
+        'p95_us': round(percentile(95) * 1e6, 1),
+        'p99_us': round(percentile(99) * 1e6, 1),
+        'mean_us': round(total / len(ordered) * 1e6, 1),
+        'ops_per_sec': round(len(ordered) / total, 1) if total else None
+    }
+
+
+def _time_calls(func: Callable, arguments: List[tuple]) -> Dict:
+    latencies = []
+    for args in arguments:
+        started = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - started)
+    return _stats(latencies)
+
+
+def run(backend_name: str = 'packed', users: int = 200, years: float = 2.0, samples: int = 300,
+        seed: int = 42) -> Dict:
+    """Seed a store and time every hot path. Returns the results document."""
+    rng = random.Random(seed)
+    results: Dict[str, Dict] = {}
+
+    # Calculator: distinct windows first (memo misses), then the same windows again (memo hits)
+    calculator = SalaryCalculator()
+    windows = [(f"{start // 60:02d}:{start % 60:02d}", f"{end // 60:02d}:{end % 60:02d}")
+               for start in range(0, 24 * 60, 15) for end in range(0, 24 * 60, 15)]
+    rng.shuffle(windows)
+    windows = windows[:max(samples * 10, 1000)]
+    results['calculate_salary_cold'] = _time_calls(calculator.calculate_salary, windows)
+    hot = windows[:calculator.MEMO_SIZE // 2]
+    results['calculate_salary_warm'] = _time_calls(calculator.calculate_salary, hot * (len(windows) // len(hot)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        backend, entries = seed_backend(backend_name, tmp, users, years, seed)
+        results['seed'] = {'seconds': round(time.perf_counter() - started, 3), 'entries': entries}
+
+        storage = DataStorage(backend=CachedBackend(backend, max_users=256))
+        analytics = Analytics(storage=storage)
+        notifications = NotificationManager(storage=storage)
+        exports = ExportManager(storage=storage)
+
+        picks = [(f"user_{rng.randrange(users)}",) for _ in range(samples)]
+        results['get_date_range_data'] = _time_calls(lambda user_id: storage.get_date_range_data(user_id, 30), picks)
+        results['generate_summary_stats'] = _time_calls(
+            lambda user_id: analytics.generate_summary_stats(user_id, 30), picks)
+        results['get_streak_info'] = _time_calls(notifications.get_streak_info, picks)
+        results['check_missing_entries'] = _time_calls(notifications.check_missing_entries, picks)
+        results['generate_work_summary_alert'] = _time_calls(notifications.generate_work_summary_alert, picks)
+
+        shift = calculator.calculate_salary("08:30", "17:30")
+        results['save_calculation'] = _time_calls(lambda user_id: storage.save_calculation(user_id, shift), picks)
+
+        # Export sizes and times for the user with the longest history
+        user_id = max((f"user_{index}" for index in range(min(users, 50))),
+                      key=lambda candidate: len(storage.load_user_data(candidate)))
+        export_results = {'user_entries': sum(len(day) for day in storage.load_user_data(user_id).values())}
+        for export_format in ('csv', 'json', 'columnar'):
+            started = time.perf_counter()
+            with exports.open_export(user_id, export_format, 365) as buffer:
+                buffer.seek(0, os.SEEK_END)
+                export_results[f'{export_format}_bytes'] = buffer.tell()
+            export_results[f'{export_format}_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        results['export'] = export_results
+
+        if hasattr(backend, 'close'):
+            backend.close()
+
+    return {
+        'meta': {
+            'backend': backend_name, 'users': users, 'years': years, 'samples': samples, 'seed': seed,
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'run_at': datetime.now().isoformat(timespec='seconds')
+        },
+        'results': results
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Describe every metric that is worse than baseline by more than tolerance (a fraction)."""
+    regressions = []
+    for name, metrics in current['results'].items():
+        previous = baseline.get('results', {}).get(name, {})
+        for metric, value in metrics.items():
+            old = previous.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            if metric in LOWER_IS_BETTER or metric.endswith('_bytes'):
+                worse = value > old * (1 + tolerance)
+            elif metric in HIGHER_IS_BETTER:
+                worse = value < old * (1 - tolerance)
+            else:
+                continue
+            if worse:
+                regressions.append(f"{name}.{metric}: {old} -> {value}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calculator, storage, analytics and export benchmarks")
+    parser.add_argument("--backend", choices=BACKENDS, default="packed")
+    parser.add_argument("--users", type=int, default=200, help="synthetic users (1 to 100000)")
+    parser.add_argument("--years", type=float, default=2.0, help="longest history per user (up to 5)")
+    parser.add_argument("--samples", type=int, default=300, help="timed calls per operation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the results document to this file")
+    parser.add_argument("--baseline", help="results document to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, e.g. 0.5 = 50%%")
+    args = parser.parse_args()
+
+    if not 1 <= args.users <= 100000 or not 0 < args.years <= 5:
+        parser.error("--users must be 1..100000 and --years 0..5")
+
+    document = run(args.backend, args.users, args.years, args.samples, args.seed)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(document, json.load(f), args.tolerance)
+        document['regressions'] = regressions
+
+    output = json.dumps(document, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+
+    return 1 if document.get('regressions') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,57 +1,267 @@
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict
+from typing import Callable, Dict
+from message_templates import MessageTemplate
+
+RULE = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+BOX_TOP = "┌─────────────────────────────────────┐"
+BOX_END = "\n└─────────────────────────────────────┘"
+
+SALARY_TEMPLATE = MessageTemplate("""
+💸 **လစာခွဲခြမ်းစိတ်ဖြာမှု:**
+   💚 ပုံမှန် ({regular_hours} နာရီ x ¥2,100): ¥{regular_salary:,.0f}
+   🔴 OT ({ot_hours} နာရီ x ¥2,625): ¥{ot_salary:,.0f}
+
+💰 **စုစုပေါင်းလစာ: ¥{total_salary:,.0f}**
+
+⚡ **OT နှုန်း:** 7:35 ကျော်လွန်ချက် သို့မဟုတ် ညကျော်လျှင် ¥2,625/နာရီ
+""")
+
+# "🎯 DASHBOARD" keyboard button
+PREMIUM_EMPTY = MessageTemplate(f"""🎯 **PREMIUM DASHBOARD**
+
+{RULE}
+
+❌ **ဒေတာမရှိသေးပါ:** {{error}}
+
+💡 **စတင်နည်း:** အလုပ်ချိန်ပထမဆုံး ထည့်ပြီးမှ Dashboard အပြည့်အစုံ ကြည့်ရှုနိုင်ပါမည်
+
+🚀 **အချိန်ထည့်ပုံ:** 08:30 ~ 17:30 သို့မဟုတ် Set 08:30 AM To 05:30 PM
+
+{RULE}""")
+
+PREMIUM_OVERVIEW = MessageTemplate(f"""🎯 **PREMIUM DASHBOARD**
+
+{RULE}
+
+🏆 **လစာခွဲခြမ်းစိတ်ဖြာမှု (လ၀က်ဆုံး ၃၀ ရက်)**
+
+📊 **OVERVIEW:**
+{BOX_TOP}
+│ 📅 အလုပ်လုပ်ရက်: {{total_days:>15}} ရက် │
+│ ⏰ စုစုပေါင်းချိန်: {{total_work_hours:>13}} နာရီ │
+│ 💰 စုစုပေါင်းလစာ: {{total_salary:>10,.0f}}¥ │
+│ 🔥 လက်ရှိ Streak: {{current_streak:>14}} ရက် │
+└─────────────────────────────────────┘
+
+🎯 **အလုပ်ချိန်ခွဲခြမ်းမှု:**
+{BOX_TOP}
+│ 🟢 ပုံမှန်နာရီ: {{total_regular_hours:>16}} နာရီ │
+│ 🔴 OT နာရီ: {{total_ot_hours:>19}} နာရီ │
+│ 📈 နေ့စဉ်ပျမ်းမျှ: {{avg_daily_hours:>15}} နာရီ │
+│ 💸 နေ့စဉ်ပျမ်းမျှ: {{avg_daily_salary:>11,.0f}}¥ │
+└─────────────────────────────────────┘""")
+
+PREMIUM_GOALS = MessageTemplate(f"""
+
+🎯 **ပန်းတိုင်တိုးတက်မှု ({{month}}):**
+{BOX_TOP}""")
+
+PREMIUM_SALARY_GOAL = MessageTemplate("""
+│ 💰 လစာပန်းတိုင်: {progress_percent:>15.1f}% │
+│ [{progress_bar}] │
+│ လက်ရှိ: ¥{current:>16,.0f} │
+│ ပန်းတိုင်: ¥{target:>14,.0f} │""")
+
+PREMIUM_HOURS_GOAL = MessageTemplate("""
+│ ⏰ ချိန်ပန်းတိုင်: {progress_percent:>16.1f}% │
+│ [{progress_bar}] │
+│ လက်ရှိ: {current:>17.1f}နာရီ │
+│ ပန်းတိုင်: {target:>15}နာရီ │""")
+
+PREMIUM_HISTORY = f"""
+
+📋 **လုပ်ငန်းမှတ်တမ်း (နောက်ဆုံး ၅ ရက်):**
+{BOX_TOP}"""
+
+PREMIUM_HISTORY_ROW = MessageTemplate("""
+│ 📅 {date}: {hours:>4}နာရီ (OT:{ot_hours:>3}နာရီ) = ¥{salary:>6,.0f} │""")
+
+PREMIUM_INSIGHTS = MessageTemplate(f"""
+
+🚀 **DASHBOARD INSIGHTS:**
+• 🏆 အမြင့်ဆုံး Streak: {{longest_streak}} ရက်
+• 📊 စွမ်းအားအဆင့်: {{level}}
+• 🎯 လစဉ်ပျမ်းမျှ: {{monthly_days:.1f}} ရက်/လ
+
+{RULE}""")
+
+# Dashboard inline button
+DASHBOARD_EMPTY = MessageTemplate(f"""📊 **Dashboard**
+
+{RULE}
+
+❌ **အမှားရှိသည်:** {{error}}
+
+💡 **အကြံပြုချက်:** အလုပ်ချိန်မှတ်သားပြီးမှ Dashboard ကြည့်ပါ
+
+{RULE}""")
+
+DASHBOARD_OVERVIEW = MessageTemplate(f"""📊 **DASHBOARD - လစာခွဲခြမ်းစိတ်ဖြာမှု**
+
+{RULE}
+
+📈 **လအောက်ဆုံး ၃၀ ရက် အခြေအနေ**
+
+📅 **အလုပ်လုပ်ရက်:** {{total_days}} ရက်
+⏰ **စုစုပေါင်းအလုပ်ချိန်:** {{total_work_hours}} နာရီ
+   🟢 ပုံမှန်နာရီ: {{total_regular_hours}} နာရီ (¥2,100/နာရီ)
+   🔴 OT နာရီ: {{total_ot_hours}} နာရီ (¥2,625/နာရီ)
+
+💰 **စုစုပေါင်းလစာ:** ¥{{total_salary:,.0f}}
+
+📊 **နေ့စဉ်ပျမ်းမျှ:**
+   ⏰ အလုပ်ချိန်: {{avg_daily_hours}} နာရီ
+   💰 လစာ: ¥{{avg_daily_salary:,.0f}}
+
+{RULE}""")
+
+DASHBOARD_CHART = MessageTemplate(f"""
+
+📈 **နောက်ဆုံး ၁၄ ရက် အလုပ်ချိန်ဂရပ်**
+
+{{hours_chart}}
+
+{RULE}""")
+
+DASHBOARD_HISTORY = """
+
+📋 **နောက်ဆုံး ၅ ရက် မှတ်တမ်း**
+
+"""
+
+DASHBOARD_HISTORY_ROW = MessageTemplate("📅 {date}: {hours}နာရီ (OT: {ot_hours}နာရီ) = ¥{salary:,.0f}\n")
+
+
+def _progress_bar(percent: float) -> str:
+    filled = int(percent / 10)
+    return "█" * filled + "░" * (10 - filled)
+
 
 class BurmeseFormatter:
-    """Format calculation results into Burmese Telegram messages."""
+    """Format calculation results into Burmese Telegram messages.
+
+    Message layouts are compiled templates. Salary replies are cached by
+    their numbers, so a repeated (memoized) calculation reuses its text, and
+    dashboard text is rendered once per analytics snapshot.
+    """
+
+    MEMO_SIZE = 1024
+
+    def __init__(self):
+        self._salary_texts: "OrderedDict[tuple, str]" = OrderedDict()
+        self._hours_texts: Dict[int, str] = {}
+        self.render_hits = 0
+        self.render_misses = 0
 
     def format_salary_response(self, result: Dict) -> str:
         """Format salary calculation result into Burmese message."""
         if result.get('error'):
             return f"❌ **အမှားရှိသည်**\n\n{result['error']}"
 
-        # Basic information
-        shift_name = "နေ့ပိုင်း" if result['shift_type'] == 'C341' else "ညပိုင်း"
-        start_time = result['start_time'].strftime('%H:%M')
-        end_time = result['end_time'].strftime('%H:%M')
-
-        # Time calculations
-        total_hours = self._minutes_to_hours(result['total_minutes'])
-        break_hours = self._minutes_to_hours(result['break_minutes'])
-        paid_hours = self._minutes_to_hours(result['paid_minutes'])
-        regular_hours = self._minutes_to_hours(result['regular_minutes'])
-        ot_hours = self._minutes_to_hours(result['ot_minutes'])
-        night_ot_hours = self._minutes_to_hours(result['night_ot_minutes'])
-
-        # Format salary amounts
-        total_salary = result['total_salary']
-        regular_salary = result['regular_salary']
-        ot_salary = result['ot_salary']
-        night_ot_salary = result['night_ot_salary']
-
-        # Format salary breakdown with proper Burmese formatting and new OT rates
-        salary_breakdown = f"""
-💸 **လစာခွဲခြမ်းစိတ်ဖြာမှု:**
-   💚 ပုံမှန် ({regular_hours} နာရီ x ¥2,100): ¥{regular_salary:,.0f}
-   🔴 OT ({ot_hours + night_ot_hours} နာရီ x ¥2,625): ¥{ot_salary + night_ot_salary:,.0f}
+        key = (result['regular_minutes'], result['ot_minutes'], result['night_ot_minutes'],
+               result['regular_salary'], result['ot_salary'], result['night_ot_salary'], result['total_salary'])
+        text = self._salary_texts.get(key)
+        if text is not None:
+            self.render_hits += 1
+            self._salary_texts.move_to_end(key)
+            return text
 
-💰 **စုစုပေါင်းလစာ: ¥{total_salary:,.0f}**
+        self.render_misses += 1
+        text = SALARY_TEMPLATE.render(
+            regular_hours=self._minutes_to_hours(result['regular_minutes']),
+            # Day and night OT are shown together
+            ot_hours=self._minutes_to_hours(result['ot_minutes']) + self._minutes_to_hours(result['night_ot_minutes']),
+            regular_salary=result['regular_salary'],
+            ot_salary=result['ot_salary'] + result['night_ot_salary'],
+            total_salary=result['total_salary']
+        )
+        self._salary_texts[key] = text
+        if len(self._salary_texts) > self.MEMO_SIZE:
+            self._salary_texts.popitem(last=False)
+        return text
 
-⚡ **OT နှုန်း:** 7:35 ကျော်လွန်ချက် သို့မဟုတ် ညကျော်လျှင် ¥2,625/နာရီ
-"""
+    def format_premium_dashboard(self, snapshot) -> str:
+        """Premium dashboard text for an AnalyticsSnapshot, rendered once per snapshot."""
+        return self._rendered(snapshot, 'premium', self._render_premium_dashboard)
+
+    def format_dashboard(self, snapshot) -> str:
+        """Dashboard text for an AnalyticsSnapshot, rendered once per snapshot."""
+        return self._rendered(snapshot, 'dashboard', self._render_dashboard)
+
+    def _rendered(self, snapshot, name: str, render: Callable) -> str:
+        text = snapshot.rendered.get(name)
+        if text is None:
+            text = snapshot.rendered[name] = render(snapshot)
+        return text
+
+    def _render_premium_dashboard(self, snapshot) -> str:
+        stats = snapshot.stats
+        if stats.get('error'):
+            return PREMIUM_EMPTY.render(error=stats['error'])
+
+        history_data = snapshot.history
+        goal_progress = snapshot.goal_progress
+        streak_info = snapshot.streak_info
+        parts = [PREMIUM_OVERVIEW.render_map(dict(stats, current_streak=streak_info.get('current_streak', 0)))]
 
-        return salary_breakdown
+        if not goal_progress.get('error') and goal_progress.get('progress'):
+            parts.append(PREMIUM_GOALS.render(month=goal_progress.get('month', 'လက်ရှိလ')))
+            for goal_type, goal_data in goal_progress.get('progress', {}).items():
+                template = {'salary': PREMIUM_SALARY_GOAL, 'hours': PREMIUM_HOURS_GOAL}.get(goal_type)
+                if template:
+                    parts.append(template.render_map(
+                        dict(goal_data, progress_bar=_progress_bar(goal_data['progress_percent']))))
+            parts.append(BOX_END)
+
+        if not history_data.get('error') and history_data.get('history'):
+            parts.append(PREMIUM_HISTORY)
+            parts.extend(PREMIUM_HISTORY_ROW.render_map(day) for day in history_data['history'][:5])
+            parts.append(BOX_END)
+
+        avg_daily_hours = stats['avg_daily_hours']
+        level = ("🔥 အလွန်ကောင်း" if avg_daily_hours >= 8.0 else "⚡ ကောင်း" if avg_daily_hours >= 7.0
+                 else "💪 တိုးတက်ရန်လိုအပ်")
+        parts.append(PREMIUM_INSIGHTS.render(longest_streak=streak_info.get('longest_streak', 0), level=level,
+                                             monthly_days=stats['total_days'] * 30 / 30))
+        return ''.join(parts)
+
+    def _render_dashboard(self, snapshot) -> str:
+        stats = snapshot.stats
+        if stats.get('error'):
+            return DASHBOARD_EMPTY.render(error=stats['error'])
+
+        parts = [DASHBOARD_OVERVIEW.render_map(stats)]
+        if not snapshot.chart_data.get('error'):
+            parts.append(DASHBOARD_CHART.render(hours_chart=snapshot.hours_chart))
+
+        history_data = snapshot.history
+        if not history_data.get('error'):
+            parts.append(DASHBOARD_HISTORY)
+            parts.extend(DASHBOARD_HISTORY_ROW.render_map(day) for day in history_data['history'][:5])
+
+        parts.append("\n" + RULE)
+        return ''.join(parts)
 
     def _minutes_to_hours(self, minutes: int) -> str:
         """Convert minutes to hours and minutes format."""
-        if minutes == 0:
-            return "0မိနစ်"
+        text = self._hours_texts.get(minutes)
+        if text is not None:
+            return text
 
         hours = minutes // 60
         mins = minutes % 60
 
-        if hours > 0 and mins > 0:
-            return f"{hours}နာရီ {mins}မိနစ်"
+        if minutes == 0:
+            text = "0မိနစ်"
+        elif hours > 0 and mins > 0:
+            text = f"{hours}နာရီ {mins}မိနစ်"
         elif hours > 0:
-            return f"{hours}နာရီ"
+            text = f"{hours}နာရီ"
         else:
-            return f"{mins}မိနစ်"
\ No newline at end of file
+            text = f"{mins}မိနစ်"
+
+        if len(self._hours_texts) >= self.MEMO_SIZE:
+            self._hours_texts.clear()
+        self._hours_texts[minutes] = text
+        return text
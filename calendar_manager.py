@@ -2,19 +2,94 @@
 
 import json
 import os
+import threading
+from bisect import bisect_left, insort
 from datetime import datetime, timedelta, date
 from typing import Dict, List, Optional, Tuple
-from dateutil.relativedelta import relativedelta
+from data_storage import DataStorage
+
+
+class EventIndex:
+    """One user's events kept sorted by date, so date ranges are bisect slices.
+
+    ``events`` is the user's event list from the calendar document, sorted in
+    place; ``keys`` holds a parallel ``(date ordinal, sequence)`` per event,
+    and ``ids`` maps an event id to its keys, so an event is located by
+    bisect. Events on the same date keep the order they were added in.
+    Older calendar files can repeat an id; those events are removed one at
+    a time, in the order they were stored or added.
+    """
+
+    __slots__ = ('events', 'keys', 'ids', '_next_seq')
+
+    def __init__(self, events: List[Dict]):
+        keyed = sorted(((self._ordinal(event), seq), event) for seq, event in enumerate(events))
+        events[:] = [event for _, event in keyed]
+        self.events = events
+        self.keys = [key for key, _ in keyed]
+        self.ids: Dict[str, List[Tuple[int, int]]] = {}
+        for key, event in keyed:
+            self.ids.setdefault(event.get("id"), []).append(key)
+        self._next_seq = len(events)
+
+    @staticmethod
+    def _ordinal(event: Dict) -> int:
+        # Events with an unreadable date sort first and match no date range
+        try:
+            return datetime.strptime(event["date"], "%Y-%m-%d").toordinal()
+        except (KeyError, TypeError, ValueError):
+            return 0
+
+    def add(self, event: Dict) -> None:
+        key = (self._ordinal(event), self._next_seq)
+        self._next_seq += 1
+        position = bisect_left(self.keys, key)
+        self.keys.insert(position, key)
+        self.events.insert(position, event)
+        self.ids.setdefault(event["id"], []).append(key)
+
+    def remove(self, event_id: str) -> Optional[Dict]:
+        """Remove and return the first event with event_id, or None if there is none."""
+        keys = self.ids.get(event_id)
+        if not keys:
+            return None
+        # Sequence numbers follow the stored order, so this is the first match there
+        key = min(keys, key=lambda item: item[1])
+        keys.remove(key)
+        if not keys:
+            del self.ids[event_id]
+        position = bisect_left(self.keys, key)
+        del self.keys[position]
+        return self.events.pop(position)
+
+    def between(self, start: date, end: date) -> List[Tuple[date, Dict]]:
+        """(date, event) for every event from start to end inclusive, in date order."""
+        low = bisect_left(self.keys, (start.toordinal(), -1))
+        high = bisect_left(self.keys, (end.toordinal() + 1, -1))
+        return [(date.fromordinal(self.keys[i][0]), self.events[i]) for i in range(low, high)]
+
 
 class CalendarManager:
-    """Handle calendar functionality including scheduling and salary payment tracking."""
+    """Handle calendar functionality including scheduling and salary payment tracking.
+
+    The calendar document is kept in memory and saved on every change; it is
+    reloaded only when the stored copy changes underneath us. Each user's
+    events are indexed by date (``EventIndex``) on first use.
+    """
     
-    def __init__(self, calendar_file: str = "calendar_data.json"):
+    def __init__(self, calendar_file: str = "calendar_data.json", storage: Optional[DataStorage] = None):
         self.calendar_file = calendar_file
+        self.storage = storage or DataStorage()
+        self._lock = threading.RLock()
+        self._data: Optional[Dict] = None
+        self._version = None
+        self._indexes: Dict[str, EventIndex] = {}
         self.ensure_calendar_file()
     
     def ensure_calendar_file(self):
         """Ensure calendar file exists."""
+        if self.storage.backend.supports_documents:
+            return
         if not os.path.exists(self.calendar_file):
             default_data = {
                 "users": {},
@@ -24,24 +99,70 @@ class CalendarManager:
             with open(self.calendar_file, 'w', encoding='utf-8') as f:
                 json.dump(default_data, f, ensure_ascii=False, indent=2)
     
+    def _stored_version(self):
+        """Token that changes when the stored calendar changes, or None if unknown."""
+        if self.storage.backend.supports_documents:
+            return self.storage.backend.data_version('calendar')
+        try:
+            stat = os.stat(self.calendar_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    
+    def _calendar(self) -> Dict:
+        """The in-memory calendar document, reloaded if the stored copy changed. Caller holds the lock."""
+        version = self._stored_version()
+        if self._data is None or (version is not None and version != self._version):
+            self._data = self._read_calendar_data()
+            self._version = self._stored_version()
+            self._indexes = {}
+        return self._data
+    
+    def _user_index(self, user_id: str) -> Optional[EventIndex]:
+        """A user's date index, or None if the user has no calendar. Caller holds the lock."""
+        users = self._calendar()["users"]
+        if user_id not in users:
+            return None
+        index = self._indexes.get(user_id)
+        if index is None:
+            index = self._indexes[user_id] = EventIndex(users[user_id]["events"])
+        return index
+    
     def load_calendar_data(self) -> Dict:
         """Load calendar data."""
+        with self._lock:
+            return self._calendar()
+    
+    def _read_calendar_data(self) -> Dict:
+        """Read calendar data from storage."""
         try:
+            if self.storage.backend.supports_documents:
+                data = self.storage.backend.load_document('calendar')
+                return data or {"users": {}, "salary_payment_day": 25, "global_events": []}
             with open(self.calendar_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             self.ensure_calendar_file()
-            return self.load_calendar_data()
+            return self._read_calendar_data()
     
     def save_calendar_data(self, data: Dict) -> bool:
         """Save calendar data."""
-        try:
-            with open(self.calendar_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            return True
-        except Exception as e:
-            print(f"Error saving calendar data: {e}")
-            return False
+        with self._lock:
+            if data is not self._data:
+                self._data, self._indexes = data, {}
+            try:
+                if self.storage.backend.supports_documents:
+                    self.storage.backend.save_document('calendar', data)
+                else:
+                    with open(self.calendar_file, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, ensure_ascii=False, indent=2)
+                self._version = self._stored_version()
+                return True
+            except Exception as e:
+                print(f"Error saving calendar data: {e}")
+                # The in-memory copy no longer matches storage; read it again next time
+                self._data, self._indexes = None, {}
+                return False
     
     def get_next_salary_payment_date(self) -> Dict:
         """Get next salary payment date."""
@@ -54,6 +175,8 @@ class CalendarManager:
         if today <= current_month_payment:
             next_payment = current_month_payment
         else:
+            # Imported here: dateutil is only needed once the month's payment day has passed
+            from dateutil.relativedelta import relativedelta
             next_month = today + relativedelta(months=1)
             next_payment = date(next_month.year, next_month.month, payment_day)
         
@@ -90,22 +213,29 @@ class CalendarManager:
             # Validate date format
             event_datetime = datetime.strptime(event_date, "%Y-%m-%d")
             
-            data = self.load_calendar_data()
-            if user_id not in data["users"]:
-                data["users"][user_id] = {"events": []}
-            
-            event = {
-                "id": f"{user_id}_{event_date}_{len(data['users'][user_id]['events'])}",
-                "date": event_date,
-                "type": event_type,
-                "description": description,
-                "reminder_time": reminder_time,
-                "created_at": datetime.now().isoformat()
-            }
-            
-            data["users"][user_id]["events"].append(event)
+            with self._lock:
+                data = self._calendar()
+                if user_id not in data["users"]:
+                    data["users"][user_id] = {"events": []}
+                index = self._user_index(user_id)
+                
+                # Counting events alone can repeat an id after a delete
+                number = len(index.events)
+                while f"{user_id}_{event_date}_{number}" in index.ids:
+                    number += 1
+                event = {
+                    "id": f"{user_id}_{event_date}_{number}",
+                    "date": event_date,
+                    "type": event_type,
+                    "description": description,
+                    "reminder_time": reminder_time,
+                    "created_at": datetime.now().isoformat()
+                }
+                
+                index.add(event)
+                saved = self.save_calendar_data(data)
             
-            if self.save_calendar_data(data):
+            if saved:
                 return {
                     "success": True,
                     "message": f"ပွဲအစီအစဉ် '{description}' ကို {self._format_burmese_date(event_datetime.date())} တွင် ထည့်ပြီးပါပြီ",
@@ -119,28 +249,18 @@ class CalendarManager:
     
     def get_user_events(self, user_id: str, days: int = 30) -> Dict:
         """Get user events for the next N days."""
-        data = self.load_calendar_data()
-        
-        if user_id not in data["users"]:
-            return {"error": "မည်သည့်ပွဲအစီအစဉ်မျှ မရှိသေးပါ"}
-        
-        user_events = data["users"][user_id]["events"]
         today = date.today()
-        end_date = today + timedelta(days=days)
-        
-        upcoming_events = []
-        for event in user_events:
-            event_date = datetime.strptime(event["date"], "%Y-%m-%d").date()
-            if today <= event_date <= end_date:
-                days_until = (event_date - today).days
-                upcoming_events.append({
-                    **event,
-                    "days_until": days_until,
-                    "burmese_date": self._format_burmese_date(event_date)
-                })
+        with self._lock:
+            index = self._user_index(user_id)
+            if index is None:
+                return {"error": "မည်သည့်ပွဲအစီအစဉ်မျှ မရှိသေးပါ"}
+            matches = index.between(today, today + timedelta(days=days))
         
-        # Sort by date
-        upcoming_events.sort(key=lambda x: x["date"])
+        upcoming_events = [{
+            **event,
+            "days_until": (event_date - today).days,
+            "burmese_date": self._format_burmese_date(event_date)
+        } for event_date, event in matches]
         
         return {
             "events": upcoming_events,
@@ -150,44 +270,40 @@ class CalendarManager:
     
     def delete_user_event(self, user_id: str, event_id: str) -> Dict:
         """Delete user event."""
-        data = self.load_calendar_data()
-        
-        if user_id not in data["users"]:
-            return {"error": "မည်သည့်ပွဲအစီအစဉ်မျှ မရှိသေးပါ"}
-        
-        user_events = data["users"][user_id]["events"]
-        
-        # Find and remove event
-        for i, event in enumerate(user_events):
-            if event["id"] == event_id:
-                deleted_event = user_events.pop(i)
-                if self.save_calendar_data(data):
-                    return {
-                        "success": True,
-                        "message": f"ပွဲအစီအစဉ် '{deleted_event['description']}' ကို ဖျက်ပြီးပါပြီ"
-                    }
-                else:
-                    return {"error": "ပွဲအစီအစဉ်ဖျက်ရာတွင် အမှားရှိခဲ့သည်"}
+        with self._lock:
+            index = self._user_index(user_id)
+            if index is None:
+                return {"error": "မည်သည့်ပွဲအစီအစဉ်မျှ မရှိသေးပါ"}
+            
+            deleted_event = index.remove(event_id)
+            if deleted_event is None:
+                return {"error": "ပွဲအစီအစဉ်ရှာမတွေ့ပါ"}
+            saved = self.save_calendar_data(self._data)
         
-        return {"error": "ပွဲအစီအစဉ်ရှာမတွေ့ပါ"}
+        if saved:
+            return {
+                "success": True,
+                "message": f"ပွဲအစီအစဉ် '{deleted_event['description']}' ကို ဖျက်ပြီးပါပြီ"
+            }
+        else:
+            return {"error": "ပွဲအစီအစဉ်ဖျက်ရာတွင် အမှားရှိခဲ့သည်"}
     
     def get_monthly_calendar(self, user_id: str, year: int, month: int) -> Dict:
         """Get monthly calendar view."""
         try:
-            data = self.load_calendar_data()
-            payment_day = data.get("salary_payment_day", 25)
+            first_day = date(year, month, 1)
+            next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+            with self._lock:
+                payment_day = self._calendar().get("salary_payment_day", 25)
+                index = self._user_index(user_id)
+                matches = index.between(first_day, next_month - timedelta(days=1)) if index else []
             
             # Get events for the month
-            user_events = []
-            if user_id in data["users"]:
-                for event in data["users"][user_id]["events"]:
-                    event_date = datetime.strptime(event["date"], "%Y-%m-%d").date()
-                    if event_date.year == year and event_date.month == month:
-                        user_events.append({
-                            **event,
-                            "day": event_date.day,
-                            "burmese_date": self._format_burmese_date(event_date)
-                        })
+            user_events = [{
+                **event,
+                "day": event_date.day,
+                "burmese_date": self._format_burmese_date(event_date)
+            } for event_date, event in matches]
             
             # Calculate salary payment date for the month
             try:
@@ -222,10 +338,7 @@ class CalendarManager:
     def get_work_schedule_suggestions(self, user_id: str) -> Dict:
         """Get work schedule suggestions based on salary payment dates."""
         try:
-            from data_storage import DataStorage
-            
-            storage = DataStorage()
-            user_data = storage.load_user_data(user_id)
+            user_data = self.storage.load_user_data(user_id)
             
             if not user_data:
                 return {"error": "အလုပ်မှတ်တမ်းမရှိသေးပါ"}
@@ -253,11 +366,8 @@ class CalendarManager:
                 target_monthly_salary = avg_daily_salary * 25  # Assume 25 working days per month
                 # Calculate current month total
                 current_month = datetime.now().strftime("%Y-%m")
-                current_month_total = 0
-                for date_str, date_data in user_data.items():
-                    if date_str.startswith(current_month) and isinstance(date_data, list):
-                        for calc in date_data:
-                            current_month_total += calc["total_salary"]
+                month_totals = self.storage.get_rollups(user_id).month(current_month)
+                current_month_total = month_totals.total_salary if month_totals else 0
                 
                 remaining_needed = max(0, target_monthly_salary - current_month_total)
                 suggested_daily = remaining_needed / days_until_payment if days_until_payment > 0 else 0
@@ -306,25 +416,16 @@ class CalendarManager:
     def get_today_events(self, user_id: str) -> Dict:
         """Get today's events."""
         try:
-            data = self.load_calendar_data()
-            
-            if user_id not in data["users"]:
-                return {
-                    "events": [], 
-                    "total": 0,
-                    "date": date.today().strftime("%Y-%m-%d"),
-                    "burmese_date": self._format_burmese_date(date.today())
-                }
-            
-            today_str = date.today().strftime("%Y-%m-%d")
-            today_events = []
+            today = date.today()
+            with self._lock:
+                index = self._user_index(user_id)
+                matches = index.between(today, today) if index else []
             
-            for event in data["users"][user_id]["events"]:
-                if event["date"] == today_str:
-                    today_events.append({
-                        **event,
-                        "burmese_date": self._format_burmese_date(date.today())
-                    })
+            today_str = today.strftime("%Y-%m-%d")
+            today_events = [{
+                **event,
+                "burmese_date": self._format_burmese_date(today)
+            } for _, event in matches]
             
             return {
                 "events": today_events,
@@ -0,0 +1,83 @@
+"""Table-driven routing of inline button callback_data to handler coroutines."""
+
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from metrics import metrics
+
+Handler = Callable[..., Awaitable[None]]
+
+# Called after every dispatch as hook(route, seconds, error)
+Hook = Callable[[str, float, Optional[BaseException]], None]
+
+UNKNOWN_ROUTE = "unknown"
+
+
+class CallbackRouter:
+    """Maps callback_data to handlers: exact keys through one dict lookup, then a short list of prefixes.
+
+    Exact keys win over prefixes, so ``day_shift_manual`` can have its own
+    handler while every other ``day_shift_<time>`` goes to the prefix route.
+    Each dispatch is timed as the metrics span ``callback.<route>`` and
+    passed to any registered hooks.
+    """
+
+    def __init__(self, span_prefix: str = "callback."):
+        self.span_prefix = span_prefix
+        self._routes: Dict[str, Tuple[str, Handler]] = {}
+        self._prefixes: List[Tuple[str, str, Handler]] = []
+        self._hooks: List[Hook] = []
+
+    def add(self, key: str, handler: Handler) -> None:
+        """Route callback_data equal to key."""
+        if key in self._routes:
+            raise ValueError(f"Callback '{key}' is already routed")
+        self._routes[key] = (self.span_prefix + key, handler)
+
+    def add_prefix(self, prefix: str, handler: Handler) -> None:
+        """Route callback_data starting with prefix (checked in the order added)."""
+        if any(existing == prefix for existing, _, _ in self._prefixes):
+            raise ValueError(f"Callback prefix '{prefix}' is already routed")
+        self._prefixes.append((prefix, f"{self.span_prefix}{prefix}*", handler))
+
+    def add_hook(self, hook: Hook) -> None:
+        """Call hook(route, seconds, error) after every dispatch."""
+        self._hooks.append(hook)
+
+    def keys(self) -> List[str]:
+        """Every exact key and prefix, for tests and benchmarks."""
+        return list(self._routes) + [prefix for prefix, _, _ in self._prefixes]
+
+    def resolve(self, callback_data: Optional[str]) -> Optional[Tuple[str, Handler]]:
+        """The (route name, handler) for callback_data, or None when nothing matches."""
+        route = self._routes.get(callback_data)
+        if route is not None:
+            return route
+        if callback_data:
+            for prefix, name, handler in self._prefixes:
+                if callback_data.startswith(prefix):
+                    return name, handler
+        return None
+
+    async def dispatch(self, callback_data: Optional[str], *args) -> bool:
+        """Run the handler for callback_data with args. Returns False when no route matches."""
+        route = self.resolve(callback_data)
+        if route is None:
+            metrics.record(self.span_prefix + UNKNOWN_ROUTE)
+            return False
+
+        name, handler = route
+        hooks = self._hooks
+        started = time.perf_counter() if hooks else 0.0
+        error = None
+        try:
+            with metrics.span(name):
+                await handler(*args)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if hooks:
+                seconds = time.perf_counter() - started
+                for hook in hooks:
+                    hook(name, seconds, error)
+        return True
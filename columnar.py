@@ -0,0 +1,230 @@
+"""Compact columnar file format for bulk salary history extracts.
+
+A file is the magic line ``SPCOL1``, a 4-byte little-endian header length,
+a JSON header (row count, column types and byte lengths, dictionaries and
+free-form metadata) and then each column as a packed little-endian array.
+Minutes are int32, salaries float64, times int16 minutes of day, dates
+int32 days since 1970-01-01, and user_id (uint32 codes) / shift_type are
+dictionary encoded, so downstream tools can load a column with a single
+``numpy.frombuffer`` (or ``array.frombytes``) call.
+"""
+
+import json
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from datetime import date, datetime
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+MAGIC = b"SPCOL1\n"
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+EPOCH = datetime(1970, 1, 1)
+
+# (column, array typecode); dictionary columns hold indexes into header['dictionaries']
+COLUMNS = (
+    ('user_id', 'I'),
+    ('date', 'i'),
+    ('timestamp', 'q'),
+    ('start_time', 'h'),
+    ('end_time', 'h'),
+    ('shift_type', 'B'),
+    ('total_minutes', 'i'),
+    ('break_minutes', 'i'),
+    ('paid_minutes', 'i'),
+    ('regular_minutes', 'i'),
+    ('ot_minutes', 'i'),
+    ('night_ot_minutes', 'i'),
+    ('regular_salary', 'd'),
+    ('ot_salary', 'd'),
+    ('night_ot_salary', 'd'),
+    ('total_salary', 'd'),
+)
+
+DICTIONARY_COLUMNS = ('user_id', 'shift_type')
+
+# Fixed-width type names written to the header for readers in other languages
+TYPE_NAMES = {'B': 'uint8', 'h': 'int16', 'H': 'uint16', 'i': 'int32', 'I': 'uint32', 'q': 'int64',
+              'd': 'float64'}
+TYPECODES = {name: typecode for typecode, name in TYPE_NAMES.items()}
+
+MISSING = -1
+
+
+def _time_minutes(time_str) -> int:
+    try:
+        hours, minutes = str(time_str).split(':')
+        return int(hours) * 60 + int(minutes)
+    except ValueError:
+        return MISSING
+
+
+def _timestamp_seconds(timestamp) -> int:
+    try:
+        return int((datetime.fromisoformat(timestamp) - EPOCH).total_seconds())
+    except (TypeError, ValueError):
+        return MISSING
+
+
+class ColumnarBuilder:
+    """Accumulate calculation entries into typed column arrays."""
+
+    def __init__(self):
+        self.columns: Dict[str, array] = {name: array(typecode) for name, typecode in COLUMNS}
+        self.dictionaries: Dict[str, List[str]] = {name: [] for name in DICTIONARY_COLUMNS}
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in DICTIONARY_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.columns['date'])
+
+    def _code(self, column: str, value: str) -> int:
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.dictionaries[column].append(value)
+        return code
+
+    def add(self, user_id: str, date_str: str, entry: Dict) -> None:
+        """Append one stored calculation."""
+        columns = self.columns
+        columns['user_id'].append(self._code('user_id', user_id))
+        columns['date'].append(datetime.fromisoformat(date_str).toordinal() - EPOCH_ORDINAL)
+        columns['timestamp'].append(_timestamp_seconds(entry.get('timestamp')))
+        columns['start_time'].append(_time_minutes(entry.get('start_time', '')))
+        columns['end_time'].append(_time_minutes(entry.get('end_time', '')))
+        columns['shift_type'].append(self._code('shift_type', entry.get('shift_type', '')))
+        for name in ('total_minutes', 'break_minutes', 'paid_minutes', 'regular_minutes',
+                     'ot_minutes', 'night_ot_minutes'):
+            columns[name].append(int(entry.get(name, 0)))
+        for name in ('regular_salary', 'ot_salary', 'night_ot_salary', 'total_salary'):
+            columns[name].append(float(entry.get(name, 0)))
+
+    def add_user(self, user_id: str, user_data: Dict) -> None:
+        """Append every entry of a user's history, oldest date first."""
+        for date_str in sorted(user_data):
+            for entry in user_data[date_str]:
+                self.add(user_id, date_str, entry)
+
+    def _column_bytes(self) -> List[bytes]:
+        buffers = []
+        for name, typecode in COLUMNS:
+            values = self.columns[name]
+            if sys.byteorder != 'little':
+                values = array(typecode, values)
+                values.byteswap()
+            buffers.append(values.tobytes())
+        return buffers
+
+    def _write_header(self, fileobj: BinaryIO, rows: int, lengths: List[int], meta: Optional[Dict]) -> int:
+        header = json.dumps({
+            'rows': rows,
+            'columns': [{'name': name, 'type': TYPE_NAMES[typecode], 'length': length}
+                        for (name, typecode), length in zip(COLUMNS, lengths)],
+            'dictionaries': self.dictionaries,
+            'meta': meta or {}
+        }, ensure_ascii=False).encode('utf-8')
+
+        fileobj.write(MAGIC)
+        fileobj.write(struct.pack('<I', len(header)))
+        fileobj.write(header)
+        return len(MAGIC) + 4 + len(header)
+
+    def write(self, fileobj: BinaryIO, meta: Optional[Dict] = None) -> int:
+        """Write the columns to a binary file object. Returns the bytes written."""
+        buffers = self._column_bytes()
+        written = self._write_header(fileobj, len(self), [len(buffer) for buffer in buffers], meta)
+        for buffer in buffers:
+            fileobj.write(buffer)
+        return written + sum(len(buffer) for buffer in buffers)
+
+
+class SpooledColumnarBuilder(ColumnarBuilder):
+    """A ColumnarBuilder that moves its rows to a temporary file every ``spill_rows`` rows.
+
+    Only the dictionaries and the rows since the last spill stay in memory,
+    so many builders can be filled at once (one per month of a bulk export)
+    whatever the history length.
+    """
+
+    def __init__(self, spill_rows: int = 4096, spool_dir: Optional[str] = None):
+        super().__init__()
+        self.spill_rows = spill_rows
+        self._spool_dir = spool_dir
+        self._spool: Optional[BinaryIO] = None
+        # Per column, the (offset, length) of every spilled chunk
+        self._chunks: List[List[Tuple[int, int]]] = [[] for _ in COLUMNS]
+        self._spilled_rows = 0
+
+    def __len__(self) -> int:
+        return self._spilled_rows + len(self.columns['date'])
+
+    def add(self, user_id: str, date_str: str, entry: Dict) -> None:
+        super().add(user_id, date_str, entry)
+        if len(self.columns['date']) >= self.spill_rows:
+            self.spill()
+
+    def spill(self) -> None:
+        """Move the rows held in memory to the spool file."""
+        rows = len(self.columns['date'])
+        if not rows:
+            return
+        if self._spool is None:
+            self._spool = tempfile.TemporaryFile(dir=self._spool_dir)
+        self._spool.seek(0, os.SEEK_END)
+        for chunks, buffer in zip(self._chunks, self._column_bytes()):
+            chunks.append((self._spool.tell(), len(buffer)))
+            self._spool.write(buffer)
+        self._spilled_rows += rows
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS}
+
+    def write(self, fileobj: BinaryIO, meta: Optional[Dict] = None) -> int:
+        """Write every spilled and held row, column by column. Returns the bytes written."""
+        self.spill()
+        lengths = [sum(length for _, length in chunks) for chunks in self._chunks]
+        written = self._write_header(fileobj, len(self), lengths, meta)
+        for chunks in self._chunks:
+            for offset, length in chunks:
+                self._spool.seek(offset)
+                fileobj.write(self._spool.read(length))
+        return written + sum(lengths)
+
+    def close(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+
+def read_columnar(fileobj: BinaryIO, decode: bool = True) -> Dict:
+    """Read a columnar file into ``{'rows', 'meta', 'dictionaries', 'columns'}``.
+
+    With decode, dictionary columns come back as strings, dates as ISO
+    strings and times as ``HH:MM``; otherwise the raw arrays are returned.
+    """
+    if fileobj.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a columnar salary export")
+    header_length, = struct.unpack('<I', fileobj.read(4))
+    header = json.loads(fileobj.read(header_length).decode('utf-8'))
+
+    # Types come from the header, so files written with narrower codes still read
+    columns = {}
+    for column in header['columns']:
+        values = array(TYPECODES[column['type']])
+        values.frombytes(fileobj.read(column['length']))
+        if sys.byteorder != 'little':
+            values.byteswap()
+        columns[column['name']] = values
+
+    if decode:
+        for name in DICTIONARY_COLUMNS:
+            dictionary = header['dictionaries'][name]
+            columns[name] = [dictionary[code] for code in columns[name]]
+        columns['date'] = [date.fromordinal(days + EPOCH_ORDINAL).isoformat() for days in columns['date']]
+        for name in ('start_time', 'end_time'):
+            columns[name] = ['' if minutes == MISSING else f"{minutes // 60:02d}:{minutes % 60:02d}"
+                             for minutes in columns[name]]
+
+    return {'rows': header['rows'], 'meta': header['meta'], 'dictionaries': header['dictionaries'],
+            'columns': columns}
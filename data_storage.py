@@ -1,23 +1,27 @@
 import json
 import os
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 import logging
+from storage_backends import StorageBackend
+from user_cache import CachedBackend, SnapshotSlot, shared_backend
+from rollups import UserRollups, WorkedDays
+from shift_record import ShiftRecords
+from metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 class DataStorage:
     """Handle storage and retrieval of salary calculation data."""
 
-    def __init__(self, data_file: str = "salary_data.json"):
+    def __init__(self, data_file: str = "salary_data.json", backend: Optional[StorageBackend] = None):
         self.data_file = data_file
+        self.backend = backend or shared_backend(data_file)
         self.ensure_data_file()
 
     def ensure_data_file(self):
         """Ensure the data file exists."""
-        if not os.path.exists(self.data_file):
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        self.backend.ensure_storage()
 
     def save_calculation(self, user_id: str, calculation_result: Dict) -> bool:
         """Save a salary calculation result for a user."""
@@ -56,15 +60,12 @@ class DataStorage:
             logger.error(f"Error saving calculation: {e}")
             return False
 
+    @metrics.timed("storage.save_calculation")
     def save_calculation(self, user_id: str, calculation_data: Dict) -> bool:
         """Save calculation result for a user."""
         try:
-            user_data = self.load_user_data(user_id)
             today = datetime.now().strftime("%Y-%m-%d")
 
-            if today not in user_data:
-                user_data[today] = []
-
             # Create calculation entry
             calculation_entry = {
                 'timestamp': datetime.now().isoformat(),
@@ -83,22 +84,17 @@ class DataStorage:
                 'total_salary': calculation_data['total_salary']
             }
 
-            user_data[today].append(calculation_entry)
-
-            return self.save_user_data(user_id, user_data)
+            self.backend.append_entry(user_id, today, calculation_entry)
+            return True
 
         except Exception as e:
             print(f"Error saving calculation: {e}")
             return False
 
+    @metrics.timed("storage.save_calculation_with_date")
     def save_calculation_with_date(self, user_id: str, calculation_data: Dict, target_date: str) -> bool:
         """Save calculation result for a user with specific date."""
         try:
-            user_data = self.load_user_data(user_id)
-
-            if target_date not in user_data:
-                user_data[target_date] = []
-
             # Create calculation entry
             calculation_entry = {
                 'timestamp': datetime.now().isoformat(),
@@ -118,60 +114,55 @@ class DataStorage:
                 'calculation_date': target_date
             }
 
-            user_data[target_date].append(calculation_entry)
-
-            return self.save_user_data(user_id, user_data)
+            self.backend.append_entry(user_id, target_date, calculation_entry)
+            return True
 
         except Exception as e:
             print(f"Error saving calculation with date: {e}")
             return False
 
+    @metrics.timed("storage.load_user_data")
     def load_user_data(self, user_id: str) -> Dict:
         """Load all data for a specific user."""
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                all_data = json.load(f)
-                return all_data.get(user_id, {})
+            return self.backend.load_user(user_id)
         except Exception as e:
             logger.error(f"Error loading user data: {e}")
             return {}
 
-    def save_user_data(self, user_id: str, user_data: Dict) -> bool:
-        """Save all data for a specific user."""
+    @metrics.timed("storage.list_users")
+    def list_users(self) -> List[str]:
+        """List every user with stored data."""
         try:
-            # Load all data
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                all_data = json.load(f)
-
-            # Update user's data
-            all_data[user_id] = user_data
+            return self.backend.list_users()
+        except Exception as e:
+            logger.error(f"Error listing users: {e}")
+            return []
 
-            # Save back
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(all_data, f, ensure_ascii=False, indent=2)
+    def iter_worked_dates(self, start_date: date, end_date: date) -> Iterator[Tuple[str, Set[str]]]:
+        """Stream (user_id, dates in the range with entries) for every user, in one pass."""
+        try:
+            yield from self.backend.iter_worked_dates(start_date, end_date)
+        except Exception as e:
+            logger.error(f"Error streaming worked dates: {e}")
 
+    @metrics.timed("storage.save_user_data")
+    def save_user_data(self, user_id: str, user_data: Dict) -> bool:
+        """Save all data for a specific user."""
+        try:
+            self.backend.save_user(user_id, user_data)
             return True
 
         except Exception as e:
             logger.error(f"Error saving user data: {e}")
             return False
 
+    @metrics.timed("storage.get_date_range_data")
     def get_date_range_data(self, user_id: str, days: int = 30) -> Dict:
         """Get data for the last N days."""
         try:
-            user_data = self.load_user_data(user_id)
-
-            if not user_data:
-                return {'calculations': {}}
-
-            # Get recent dates
             today = date.today()
-            recent_data = {}
-
-            for i in range(days):
-                check_date = (today - timedelta(days=i)).isoformat()
-                if check_date in user_data:
-                    recent_data[check_date] = user_data[check_date]
+            recent_data = self.backend.load_date_range(user_id, today - timedelta(days=days - 1), today)
 
             return {'calculations': recent_data}
 
@@ -179,89 +170,110 @@ class DataStorage:
             logger.error(f"Error getting date range data: {e}")
             return {'calculations': {}}
 
-    def delete_user_data(self, user_id: str) -> bool:
-        """Delete all data for a specific user."""
+    def get_rollups(self, user_id: str) -> UserRollups:
+        """Get a user's day/week/month totals, kept up to date by the cache when enabled."""
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                all_data = json.load(f)
-
-            if user_id in all_data:
-                del all_data[user_id]
-
-                with open(self.data_file, 'w', encoding='utf-8') as f:
-                    json.dump(all_data, f, ensure_ascii=False, indent=2)
+            if isinstance(self.backend, CachedBackend):
+                return self.backend.get_view(user_id, 'rollups', UserRollups)
+            return UserRollups(self.load_user_data(user_id))
+        except Exception as e:
+            logger.error(f"Error getting rollups: {e}")
+            return UserRollups()
 
-                return True
+    def get_shift_records(self, user_id: str) -> ShiftRecords:
+        """Get a user's entries as ShiftRecords, built once and kept up to date by the cache when enabled."""
+        try:
+            if isinstance(self.backend, CachedBackend):
+                return self.backend.get_view(user_id, 'records', ShiftRecords)
+            return ShiftRecords(self.load_user_data(user_id))
+        except Exception as e:
+            logger.error(f"Error getting shift records: {e}")
+            return ShiftRecords()
 
-            return False
+    def get_worked_days(self, user_id: str) -> WorkedDays:
+        """Get the bitset of days a user worked, kept up to date by the cache when enabled."""
+        try:
+            if isinstance(self.backend, CachedBackend):
+                return self.backend.get_view(user_id, 'worked_days', WorkedDays)
+            return WorkedDays(self.load_user_data(user_id))
+        except Exception as e:
+            logger.error(f"Error getting worked days: {e}")
+            return WorkedDays()
+
+    def get_snapshot(self, user_id: str, name: str, key, build: Callable[[], Any]) -> Any:
+        """Get build()'s result for a user, reused until the user's data changes, the snapshot is
+        invalidated or key (e.g. today's date) differs. Built every time when the cache is disabled."""
+        if not isinstance(self.backend, CachedBackend):
+            return build()
+        try:
+            slot = self.backend.get_view(user_id, f'snapshot:{name}', SnapshotSlot)
+        except Exception as e:
+            logger.error(f"Error getting snapshot slot: {e}")
+            return build()
+
+        generation = slot.generation
+        value = slot.get(key)
+        if value is None:
+            value = build()
+            slot.store(generation, key, value)
+        return value
+
+    def invalidate_snapshots(self, user_id: str) -> None:
+        """Drop a user's stored snapshots after a change the cache cannot see (such as a goal update)."""
+        if isinstance(self.backend, CachedBackend):
+            for view in self.backend.cached_views(user_id).values():
+                if isinstance(view, SnapshotSlot):
+                    view.clear()
+
+    @metrics.timed("storage.delete_user_data")
+    def delete_user_data(self, user_id: str) -> bool:
+        """Delete all data for a specific user."""
+        try:
+            return self.backend.delete_user(user_id)
 
         except Exception as e:
             logger.error(f"Error deleting user data: {e}")
             return False
 
+    @metrics.timed("storage.delete_old_data")
     def delete_old_data(self, user_id: str, days: int) -> bool:
         """Delete data older than specified days."""
         try:
-            user_data = self.load_user_data(user_id)
-
-            if not user_data:
-                return True
-
             cutoff_date = (datetime.now() - timedelta(days=days)).date()
-
-            # Filter out old data
-            dates_to_delete = []
-            for date_str in user_data.keys():
-                try:
-                    data_date = datetime.fromisoformat(date_str).date()
-                    if data_date < cutoff_date:
-                        dates_to_delete.append(date_str)
-                except ValueError:
-                    continue
-
-            # Delete old dates
-            for date_str in dates_to_delete:
-                del user_data[date_str]
-
-            return self.save_user_data(user_id, user_data)
+            self.backend.delete_dates_before(user_id, cutoff_date)
+            return True
         except Exception as e:
             logger.error(f"Error deleting old data: {e}")
             return False
 
+    @metrics.timed("storage.delete_date_data")
     def delete_date_data(self, user_id: str, date_str: str) -> bool:
         """Delete data for a specific date."""
         try:
-            user_data = self.load_user_data(user_id)
-
-            if date_str in user_data:
-                del user_data[date_str]
-                return self.save_user_data(user_id, user_data)
-
-            return False
+            return self.backend.delete_date(user_id, date_str)
 
         except Exception as e:
             logger.error(f"Error deleting date data: {e}")
             return False
 
+    @metrics.timed("storage.delete_work_history")
     def delete_work_history(self, user_id: str) -> bool:
         """Delete only work history, keep other data."""
         try:
-            user_data = self.load_user_data(user_id)
-
-            # Clear the work history by setting the user's data to an empty dictionary.
-            user_data = {}
-            return self.save_user_data(user_id, user_data)
+            # A single write under the backend's lock; nothing is read first, so no concurrent save is lost
+            return self.save_user_data(user_id, {})
 
         except Exception as e:
             logger.error(f"Error deleting work history: {e}")
             return False
 
+    @metrics.timed("storage.get_user_data_summary")
     def get_user_data_summary(self, user_id: str) -> dict:
         """Get summary of user data for display."""
         try:
-            user_data = self.load_user_data(user_id)
+            summary = self.backend.summarize_user(user_id)
 
-            if not user_data:
+            if not summary:
                 return {
                     'total_records': 0,
                     'total_days': 0,
@@ -275,27 +287,22 @@ class DataStorage:
                     'estimated_json_size': '0KB'
                 }
 
-            total_records = sum(len(day_data) for day_data in user_data.values())
-            total_days = len(user_data)
+            total_records = summary['total_records']
+            total_days = summary['total_days']
 
             # Get date range
-            dates = list(user_data.keys())
-            first_record = min(dates) if dates else None
-            last_record = max(dates) if dates else None
+            first_record = summary['first_record']
+            last_record = summary['last_record']
 
             # Estimate file sizes
             estimated_csv_size = f"{total_records * 150}B"
             estimated_json_size = f"{total_records * 300}B"
 
-            # Calculate monthly average
-            if dates:
-                try:
-                    first_date = datetime.fromisoformat(first_record).date()
-                    last_date = datetime.fromisoformat(last_record).date()
-                    days_diff = (last_date - first_date).days + 1
-                    monthly_avg = (total_days / days_diff * 30) if days_diff > 0 else total_days
-                except:
-                    monthly_avg = 0
+            # Calculate monthly average from the worked-days bitset
+            worked_days = self.get_worked_days(user_id)
+            if worked_days:
+                days_diff = (worked_days.last_day() - worked_days.first_day()).days + 1
+                monthly_avg = len(worked_days) / days_diff * 30
             else:
                 monthly_avg = 0
 
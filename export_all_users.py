@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""Bulk export: every user's history as one columnar file per month."""
+
+import argparse
+import json
+from data_storage import DataStorage
+from export_manager import ExportManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export all users' salary history, one columnar file per month")
+    parser.add_argument("--data-file", default="salary_data.json")
+    parser.add_argument("--output-dir", default="exports")
+    parser.add_argument("--year", type=int, help="only export months of this year")
+    args = parser.parse_args()
+
+    manager = ExportManager(storage=DataStorage(args.data_file))
+    result = manager.export_all_users_monthly(args.output_dir, args.year)
+    print(json.dumps(result, ensure_ascii=False))
+    return 1 if 'error' in result else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
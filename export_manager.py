@@ -12,8 +12,8 @@ from time_utils import TimeUtils
 class ExportManager:
     """Handle data export functionality for salary calculations."""
     
-    def __init__(self):
-        self.storage = DataStorage()
+    def __init__(self, storage: Optional[DataStorage] = None):
+        self.storage = storage or DataStorage()
         self.time_utils = TimeUtils()
     
     def export_to_csv(self, user_id: str, days: int = 30) -> Optional[str]:
@@ -172,16 +172,34 @@ class ExportManager:
             return {'error': 'ပို့ရန်ဒေတာ အကျဉ်းချုပ် ရယူရာတွင် အမှားရှိသည်။'}
 import json
 import csv
+import io
+import itertools
+import os
+import tempfile
 from io import StringIO
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
+from typing import BinaryIO, Dict, Iterator, List, Optional
 from data_storage import DataStorage
+from columnar import ColumnarBuilder, SpooledColumnarBuilder
+from metrics import metrics
+from shift_record import ShiftRecord
+
+COLUMNAR_EXTENSION = 'spcol'
+
+# Exports larger than this many bytes spill from memory to a temporary file
+SPOOL_MAX_SIZE = int(os.getenv("EXPORT_SPOOL_SIZE", str(1024 * 1024)))
+
+CSV_HEADER = [
+    'ရက်စွဲ', 'စချိန်', 'ဆုံးချိန်', 'Shift', 'စုစုပေါင်းမိနစ်',
+    'Break မိနစ်', 'လုပ်ငန်းမိနစ်', 'ပုံမှန်နာရီ', 'OT နာရီ', 'ညOT နာရီ',
+    'စုစုပေါင်းလစာ', 'ပုံမှန်လစာ', 'OT လစာ', 'ညOT လစာ'
+]
 
 class ExportManager:
     """Handle data export functionality."""
     
-    def __init__(self):
-        self.storage = DataStorage()
+    def __init__(self, storage: Optional[DataStorage] = None):
+        self.storage = storage or DataStorage()
     
     def get_export_summary(self, user_id: str, days: int = 30) -> Dict:
         """Get export summary information."""
@@ -209,46 +227,137 @@ class ExportManager:
         except Exception as e:
             return {'error': f'ပို့မှုအချက်အလက်ရယူရာတွင် အမှားရှိခဲ့သည်: {str(e)}'}
     
-    def export_to_csv(self, user_id: str, days: int = 30) -> Optional[str]:
-        """Export data to CSV format."""
+    def iter_export_dates(self, user_id: str, days: Optional[int] = 30) -> Iterator:
+        """(date_str, entries) for the last `days` days, or the whole history when days is None, oldest first.
+        
+        Dates are streamed from the storage backend, so an export neither
+        copies the user's history nor loads the user into the shared cache.
+        """
+        if days is None:
+            return self.storage.backend.iter_dates(user_id)
+        today = date.today()
+        return self.storage.backend.iter_dates(user_id, today - timedelta(days=days - 1), today)
+    
+    def iter_csv_rows(self, user_id: str, days: Optional[int] = 30) -> Iterator[List]:
+        """Yield the CSV header and then one row per stored calculation, oldest date first."""
+        header = False
+        for date_str, entries in self.iter_export_dates(user_id, days):
+            if not header:
+                header = True
+                yield CSV_HEADER
+            
+            for entry in entries:
+                record = ShiftRecord.from_entry(date_str, entry)
+                yield [
+                    record.date,
+                    record.start_time,
+                    record.end_time,
+                    record.shift_type,
+                    record.total_minutes,
+                    record.break_minutes,
+                    record.paid_minutes,
+                    round(record.regular_minutes / 60, 2),
+                    round(record.ot_minutes / 60, 2),
+                    round(record.night_ot_minutes / 60, 2),
+                    record.total_salary,
+                    record.regular_salary,
+                    record.ot_salary,
+                    record.night_ot_salary
+                ]
+    
+    def iter_json_chunks(self, user_id: str, days: Optional[int] = 30) -> Iterator[str]:
+        """Yield the JSON export's object shell and then one chunk per date, oldest first."""
+        dates = self.iter_export_dates(user_id, days)
+        first = next(dates, None)
+        if first is None:
+            return
+        
+        shell = json.dumps({
+            'user_id': user_id,
+            'export_date': datetime.now().isoformat(),
+            'period_days': days
+        }, ensure_ascii=False, indent=2)
+        yield shell[:-2] + ',\n  "calculations": {'
+        
+        separator = '\n  '
+        for date_str, entries in itertools.chain([first], dates):
+            # Encoded at the top level, then indented to sit inside "calculations"
+            chunk = json.dumps({date_str: entries}, ensure_ascii=False, indent=2)[2:-2]
+            yield separator + chunk.replace('\n', '\n  ')
+            separator = ',\n  '
+        yield '\n  }\n}'
+    
+    def open_export(self, user_id: str, export_format: str = 'csv', days: Optional[int] = 30,
+                    encoding: str = 'utf-8') -> Optional[BinaryIO]:
+        """Stream a 'csv', 'json' or 'columnar' export into a spooled buffer ready for send_document.
+        
+        Covers the last `days` days, or the whole history when days is None.
+        Rows are written as they are generated, so memory stays bounded by
+        EXPORT_SPOOL_SIZE; larger exports roll over to an anonymous temp file.
+        Returns the buffer rewound to the start (caller closes it), or None
+        when there is nothing to export.
+        """
+        buffer = None
         try:
-            # Get user data directly
-            user_data = self.storage.load_user_data(user_id)
+            if export_format == 'columnar':
+                builder = ColumnarBuilder()
+                for date_str, entries in self.iter_export_dates(user_id, days):
+                    for entry in entries:
+                        builder.add(user_id, date_str, entry)
+                if not len(builder):
+                    return None
+                buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+                builder.write(buffer, {'user_id': user_id, 'export_date': datetime.now().isoformat(),
+                                       'period_days': days})
+                metrics.add_bytes("export.columnar", written=buffer.tell())
+                buffer.seek(0)
+                return buffer
+            
+            if export_format == 'csv':
+                chunks = self.iter_csv_rows(user_id, days)
+            elif export_format == 'json':
+                chunks = self.iter_json_chunks(user_id, days)
+            else:
+                raise ValueError(f"Unknown export format: {export_format}")
+            
+            first = next(chunks, None)
+            if first is None:
+                return None
             
-            if not user_data:
+            buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+            text = io.TextIOWrapper(buffer, encoding=encoding, newline='')
+            if export_format == 'csv':
+                writer = csv.writer(text)
+                writer.writerow(first)
+                writer.writerows(chunks)
+            else:
+                text.write(first)
+                for chunk in chunks:
+                    text.write(chunk)
+            text.flush()
+            text.detach()
+            metrics.add_bytes(f"export.{export_format}", written=buffer.tell())
+            buffer.seek(0)
+            return buffer
+            
+        except Exception as e:
+            print(f"{export_format.upper()} export error: {e}")
+            if buffer is not None:
+                buffer.close()
+            return None
+    
+    def export_to_csv(self, user_id: str, days: Optional[int] = 30) -> Optional[str]:
+        """Export data to CSV format."""
+        try:
+            rows = self.iter_csv_rows(user_id, days)
+            header = next(rows, None)
+            if header is None:
                 return None
             
             output = StringIO()
             writer = csv.writer(output)
-            
-            # Header
-            writer.writerow([
-                'ရက်စွဲ', 'စချိန်', 'ဆုံးချိန်', 'Shift', 'စုစုပေါင်းမိနစ်',
-                'Break မိနစ်', 'လုပ်ငန်းမိနစ်', 'ပုံမှန်နာရီ', 'OT နာရီ', 'ညOT နာရီ',
-                'စုစုပေါင်းလစာ', 'ပုံမှန်လစာ', 'OT လစာ', 'ညOT လစာ'
-            ])
-            
-            # Data rows
-            for date_str in sorted(user_data.keys()):
-                date_calculations = user_data[date_str]
-                if isinstance(date_calculations, list):
-                    for calc in date_calculations:
-                        writer.writerow([
-                            date_str,
-                            calc.get('start_time', ''),
-                            calc.get('end_time', ''),
-                            calc.get('shift_type', ''),
-                            calc.get('total_minutes', 0),
-                            calc.get('break_minutes', 0),
-                            calc.get('paid_minutes', 0),
-                            round(calc.get('regular_minutes', 0) / 60, 2),
-                            round(calc.get('ot_minutes', 0) / 60, 2),
-                            round(calc.get('night_ot_minutes', 0) / 60, 2),
-                            calc.get('total_salary', 0),
-                            calc.get('regular_salary', 0),
-                            calc.get('ot_salary', 0),
-                            calc.get('night_ot_salary', 0)
-                        ])
+            writer.writerow(header)
+            writer.writerows(rows)
             
             return output.getvalue()
             
@@ -256,24 +365,93 @@ class ExportManager:
             print(f"CSV export error: {e}")
             return None
     
-    def export_to_json(self, user_id: str, days: int = 30) -> Optional[str]:
+    def export_to_json(self, user_id: str, days: Optional[int] = 30) -> Optional[str]:
         """Export data to JSON format."""
         try:
-            # Get user data directly
-            user_data = self.storage.load_user_data(user_id)
+            chunks = list(self.iter_json_chunks(user_id, days))
+            return ''.join(chunks) if chunks else None
             
-            if not user_data:
-                return None
+        except Exception as e:
+            print(f"JSON export error: {e}")
+            return None
+    
+    def export_all_users_monthly(self, output_dir: str, year: Optional[int] = None) -> Dict:
+        """Write every user's history as one columnar file per month (salary_YYYY-MM.spcol).
+
+        Users are streamed straight from the backend, so the scan leaves the
+        user cache alone, and each month's rows are spooled to a temporary
+        file as they accumulate, so memory does not grow with history length.
+        """
+        builders: Dict[str, SpooledColumnarBuilder] = {}
+        try:
+            prefix = f"{year:04d}-" if year else ''
+            os.makedirs(output_dir, exist_ok=True)
+            users = 0
+            
+            for user_id, user_data in self.storage.backend.iter_users():
+                users += 1
+                for date_str in sorted(user_data):
+                    if not date_str.startswith(prefix):
+                        continue
+                    builder = builders.get(date_str[:7])
+                    if builder is None:
+                        builder = builders[date_str[:7]] = SpooledColumnarBuilder(spool_dir=output_dir)
+                    for calc in user_data[date_str]:
+                        builder.add(user_id, date_str, calc)
+            
+            files = []
+            total_bytes = 0
+            for month in sorted(builders):
+                path = os.path.join(output_dir, f"salary_{month}.{COLUMNAR_EXTENSION}")
+                with open(path, 'wb') as f:
+                    total_bytes += builders[month].write(f, {'month': month,
+                                                             'export_date': datetime.now().isoformat()})
+                files.append(path)
             
-            export_data = {
-                'user_id': user_id,
-                'export_date': datetime.now().isoformat(),
-                'period_days': days,
-                'calculations': user_data
+            return {
+                'files': files,
+                'users': users,
+                'records': sum(len(builder) for builder in builders.values()),
+                'bytes': total_bytes
             }
             
-            return json.dumps(export_data, ensure_ascii=False, indent=2)
+        except Exception as e:
+            return {'error': f'အသုံးပြုသူအားလုံး ပို့ရာတွင် အမှားရှိခဲ့သည်: {str(e)}'}
+        finally:
+            for builder in builders.values():
+                builder.close()
+    
+    def generate_monthly_report(self, user_id: str, month: int, year: int) -> Optional[Dict]:
+        """Generate monthly report for specific month/year."""
+        try:
+            target_month = f"{year:04d}-{month:02d}"
+            totals = self.storage.get_rollups(user_id).month(target_month)
+            
+            if not totals:
+                return {'error': f'{month}/{year} အတွက် ဒေတာမတွေ့ပါ။'}
+            
+            user_data = self.storage.load_user_data(user_id)
+            monthly_data = {date_str: calculations for date_str, calculations in user_data.items()
+                            if date_str.startswith(target_month)}
+            
+            total_days = totals.days
+            avg_daily_salary = totals.total_salary / total_days if total_days > 0 else 0
+            avg_daily_hours = (totals.total_minutes / 60) / total_days if total_days > 0 else 0
+            
+            return {
+                'month': month,
+                'year': year,
+                'total_days': total_days,
+                'total_salary': totals.total_salary,
+                'total_hours': round(totals.total_minutes / 60, 2),
+                'total_regular_hours': round(totals.regular_minutes / 60, 2),
+                'total_ot_hours': round(totals.ot_minutes / 60, 2),
+                'total_night_ot_hours': round(totals.night_ot_minutes / 60, 2),
+                'avg_daily_salary': round(avg_daily_salary, 0),
+                'avg_daily_hours': round(avg_daily_hours, 2),
+                'shift_counts': dict(totals.shift_counts),
+                'daily_breakdown': monthly_data
+            }
             
         except Exception as e:
-            print(f"JSON export error: {e}")
-            return None
+            return {'error': 'လစဉ်အစီရင်ခံစာ ပြုလုပ်ရာတွင် အမှားရှိသည်။'}
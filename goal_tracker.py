@@ -9,8 +9,8 @@ from data_storage import DataStorage
 class GoalTracker:
     """Handle goal setting and tracking functionality."""
 
-    def __init__(self):
-        self.storage = DataStorage()
+    def __init__(self, storage: Optional[DataStorage] = None):
+        self.storage = storage or DataStorage()
         self.goals_file = "goals.json"
 
     def ensure_goals_file(self):
@@ -364,9 +364,9 @@ from data_storage import DataStorage
 class GoalTracker:
     """Handle goal tracking and progress monitoring."""
 
-    def __init__(self, goals_file: str = "goals.json"):
+    def __init__(self, goals_file: str = "goals.json", storage: Optional[DataStorage] = None):
         self.goals_file = goals_file
-        self.storage = DataStorage()
+        self.storage = storage or DataStorage()
         self.ensure_goals_file()
 
     def ensure_goals_file(self):
@@ -651,17 +651,20 @@ import os
 from datetime import datetime, date
 from typing import Dict, List, Optional
 from data_storage import DataStorage
+from rollups import Totals
 
 class GoalTracker:
     """Handle goal tracking and progress monitoring."""
 
-    def __init__(self, goals_file: str = "goals.json"):
+    def __init__(self, goals_file: str = "goals.json", storage: Optional[DataStorage] = None):
         self.goals_file = goals_file
-        self.storage = DataStorage()
+        self.storage = storage or DataStorage()
         self.ensure_goals_file()
 
     def ensure_goals_file(self):
         """Ensure goals file exists."""
+        if self.storage.backend.supports_documents:
+            return
         if not os.path.exists(self.goals_file):
             with open(self.goals_file, 'w', encoding='utf-8') as f:
                 json.dump({}, f, ensure_ascii=False, indent=2)
@@ -669,6 +672,8 @@ class GoalTracker:
     def load_goals(self) -> Dict:
         """Load goals data."""
         try:
+            if self.storage.backend.supports_documents:
+                return self.storage.backend.load_document('goals')
             with open(self.goals_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except:
@@ -677,6 +682,9 @@ class GoalTracker:
     def save_goals(self, goals: Dict) -> bool:
         """Save goals data."""
         try:
+            if self.storage.backend.supports_documents:
+                self.storage.backend.save_document('goals', goals)
+                return True
             with open(self.goals_file, 'w', encoding='utf-8') as f:
                 json.dump(goals, f, ensure_ascii=False, indent=2)
             return True
@@ -707,6 +715,7 @@ class GoalTracker:
             }
 
             if self.save_goals(goals):
+                self.storage.invalidate_snapshots(user_id)
                 unit = '¥' if goal_type == 'salary' else 'နာရီ'
                 return {
                     'success': True,
@@ -731,26 +740,20 @@ class GoalTracker:
                 if current_month not in goals[user_id]['monthly']:
                     return {'error': 'ဤလအတွက် ပန်းတိုင် မသတ်မှတ်ထားပါ။'}
 
-                # Get monthly data
-                monthly_data = self.storage.get_date_range_data(user_id, 31)
-
-                if not monthly_data or not monthly_data.get('calculations'):
-                    return {'error': 'ဤလအတွက် ဒေတာ မတွေ့ပါ။'}
-
-                # Filter for current month
-                current_month_data = {}
-                for date_str, calculations in monthly_data['calculations'].items():
-                    if date_str.startswith(current_month):
-                        current_month_data[date_str] = calculations
+                # Current month totals from the pre-aggregated rollups, days from the worked-days bitset
+                today = date.today()
+                month_start = today.replace(day=1)
+                month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+                worked_days = self.storage.get_worked_days(user_id)
+                month_totals = self.storage.get_rollups(user_id).month(current_month)
 
-                # Calculate current totals
-                current_salary = 0
-                current_hours = 0
+                if not month_totals:
+                    if not worked_days.count(today - timedelta(days=30), today):
+                        return {'error': 'ဤလအတွက် ဒေတာ မတွေ့ပါ။'}
+                    month_totals = Totals()
 
-                for calculations in current_month_data.values():
-                    for calc in calculations:
-                        current_salary += calc['total_salary']
-                        current_hours += calc['total_minutes'] / 60
+                current_salary = month_totals.total_salary
+                current_hours = month_totals.total_minutes / 60
 
                 # Get goals for current month
                 month_goals = goals[user_id]['monthly'][current_month]
@@ -782,8 +785,8 @@ class GoalTracker:
                     'period': 'monthly',
                     'month': current_month,
                     'progress': progress,
-                    'days_worked': len(current_month_data),
-                    'days_remaining': (datetime.now().replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1) - datetime.now().date()
+                    'days_worked': worked_days.count(month_start, month_end),
+                    'days_remaining': (month_end - today).days
                 }
 
             elif period == 'weekly':
@@ -796,20 +799,14 @@ class GoalTracker:
                 if week_key not in goals[user_id]['weekly']:
                     return {'error': 'ဤအပတ်အတွက် ပန်းတိုင် မသတ်မှတ်ထားပါ။'}
 
-                # Get weekly data
-                weekly_data = self.storage.get_date_range_data(user_id, 7)
+                # Totals for the last 7 days
+                week_totals = self.storage.get_rollups(user_id).range(today - timedelta(days=6), today)
 
-                if not weekly_data or not weekly_data.get('calculations'):
+                if not week_totals.entries:
                     return {'error': 'ဤအပတ်အတွက် ဒေတာ မတွေ့ပါ။'}
 
-                # Calculate current totals
-                current_salary = 0
-                current_hours = 0
-
-                for calculations in weekly_data['calculations'].values():
-                    for calc in calculations:
-                        current_salary += calc['total_salary']
-                        current_hours += calc['total_minutes'] / 60
+                current_salary = week_totals.total_salary
+                current_hours = week_totals.total_minutes / 60
 
                 # Get goals for current week
                 week_goals = goals[user_id]['weekly'][week_key]
@@ -841,7 +838,7 @@ class GoalTracker:
                     'period': 'weekly',
                     'week': week_key,
                     'progress': progress,
-                    'days_worked': len(weekly_data['calculations']),
+                    'days_worked': self.storage.get_worked_days(user_id).count(today - timedelta(days=6), today),
                     'days_remaining': 7 - today.weekday()
                 }
 
@@ -946,6 +943,7 @@ class GoalTracker:
                 del goals[user_id]
                 success = self.save_goals(goals)
                 if success:
+                    self.storage.invalidate_snapshots(user_id)
                     return True
                 else:
                     return False
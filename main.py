@@ -1,16 +1,23 @@
+import time
+
+# Measured from here: module imports, bot construction and the wait for the first poll
+STARTED = time.perf_counter()
+
+import asyncio
+import importlib
+import io
 import os
 import logging
+import threading
 from datetime import datetime, timedelta
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, CallbackQueryHandler
 from salary_calculator import SalaryCalculator
 from burmese_formatter import BurmeseFormatter
-from data_storage import DataStorage
-from analytics import Analytics
-from export_manager import ExportManager
-from notifications import NotificationManager
-from goal_tracker import GoalTracker
-from calendar_manager import CalendarManager
+from async_io import LazyFacade
+from metrics import metrics, start_exporters
+from callback_router import CallbackRouter
+from reminder_scheduler import deliver, next_fire_time
 
 # Configure logging
 logging.basicConfig(
@@ -21,22 +28,139 @@ logger = logging.getLogger(__name__)
 
 class SalaryTelegramBot:
     def __init__(self, token: str):
+        init_started = time.perf_counter()
+        self.import_seconds = init_started - STARTED
         self.token = token
         self.calculator = SalaryCalculator()
         self.formatter = BurmeseFormatter()
-        self.storage = DataStorage()
-        self.analytics = Analytics()
-        self.export_manager = ExportManager()
-        self.notification_manager = NotificationManager()
-        self.goal_tracker = GoalTracker()
-        self.calendar_manager = CalendarManager()
-        self.application = Application.builder().token(token).build()
+        # Managers share one DataStorage so user data is read through one cache.
+        # Handlers await them through facades so disk I/O runs in a thread pool;
+        # each is imported and built on its first call, so startup touches no files.
+        self._storage = None
+        self._storage_lock = threading.Lock()
+        self.storage = LazyFacade(self.get_storage, "DataStorage")
+        self.analytics = self._lazy_manager("analytics", "Analytics")
+        self.export_manager = self._lazy_manager("export_manager", "ExportManager")
+        self.notification_manager = self._lazy_manager("notifications", "NotificationManager")
+        self.goal_tracker = self._lazy_manager("goal_tracker", "GoalTracker")
+        self.calendar_manager = self._lazy_manager("calendar_manager", "CalendarManager")
+        self.dashboard = self._lazy_manager("analytics_snapshot", "SnapshotManager")
+        self.missing_entries = self._lazy_manager("missing_entries", "MissingEntryScanner")
+        self.callbacks = self._build_callback_router()
+        self.application = Application.builder().token(token).post_init(self.on_startup).build()
 
         # Add handlers
         self.application.add_handler(CommandHandler("start", self.start))
         self.application.add_handler(CommandHandler("help", self.help))
         self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_time_input))
         self.application.add_handler(CallbackQueryHandler(self.handle_button_callback))
+        self.init_seconds = time.perf_counter() - init_started
+        metrics.record("startup.imports", self.import_seconds)
+        metrics.record("startup.init", self.init_seconds)
+
+    def get_storage(self):
+        """Get the DataStorage shared by every manager, creating it on first use."""
+        if self._storage is None:
+            with self._storage_lock:
+                if self._storage is None:
+                    from data_storage import DataStorage
+                    self._storage = DataStorage()
+        return self._storage
+
+    def _lazy_manager(self, module_name: str, class_name: str) -> LazyFacade:
+        """Facade for a manager class that is imported and constructed on its first call."""
+        def build():
+            manager_class = getattr(importlib.import_module(module_name), class_name)
+            return manager_class(storage=self.get_storage())
+        return LazyFacade(build, class_name)
+
+    async def on_startup(self, application: Application) -> None:
+        """Record how long startup took and start delivering reminders, just before the first poll."""
+        ready = time.perf_counter() - STARTED
+        metrics.record("startup.ready", ready)
+        logger.info(f"Started in {ready * 1000:.0f} ms (imports {self.import_seconds * 1000:.0f} ms, "
+                    f"init {self.init_seconds * 1000:.0f} ms)")
+
+        rate = float(os.getenv("REMINDER_RATE", "25"))
+        scheduler = await self.notification_manager.get_scheduler()
+        application.create_task(scheduler.run(self.send_reminder, rate=rate))
+        logger.info(f"Scheduled {len(scheduler)} work reminders")
+
+        nudge_time = os.getenv("MISSING_ENTRY_TIME", "21:00")
+        if nudge_time != "off":
+            application.create_task(self.run_missing_entry_nudges(nudge_time, rate))
+
+    async def run_missing_entry_nudges(self, nudge_time: str, rate: float) -> None:
+        """Every day at nudge_time (HH:MM), nudge active users who have not logged yesterday's shift."""
+        while True:
+            await asyncio.sleep(max(0.0, next_fire_time(nudge_time, time.time()) - time.time()))
+            try:
+                send_list = await self.missing_entries.build_send_list()
+                sent = await deliver(send_list, self.send_notice, rate)
+                logger.info(f"Sent {sent} of {len(send_list)} missing entry nudges")
+            except Exception as e:
+                logger.error(f"Error sending missing entry nudges: {e}")
+
+    async def send_reminder(self, user_id: str, message: str) -> None:
+        """Send a user their daily work reminder."""
+        await self.send_notice(user_id, f"⏰ {message}")
+
+    async def send_notice(self, user_id: str, text: str) -> None:
+        """Send a message the user did not ask for (reminders, nudges)."""
+        await self.application.bot.send_message(chat_id=int(user_id), text=text)
+
+    def _build_callback_router(self) -> CallbackRouter:
+        """Map every inline button's callback_data to its handler."""
+        router = CallbackRouter()
+        routes = {
+            "analysis": self._on_analysis,
+            "dashboard": self._on_dashboard,
+            "history": self._on_history,
+            "delete_menu": self._on_delete_menu,
+            "export_then_delete": self._on_export_then_delete,
+            "data_info": self._on_data_info,
+            "delete_old_month": self._on_delete_old_month,
+            "delete_old_week": self._on_delete_old_week,
+            "delete_goals": self._on_delete_goals,
+            "delete_history": self._on_delete_history,
+            "delete_all_confirm": self._on_delete_all_confirm,
+            "delete_all_final": self._on_delete_all_final,
+            "goals_menu": self._on_goals_menu,
+            "export_menu": self._on_export_menu,
+            "notifications_menu": self._on_notifications_menu,
+            "export_csv": self._on_export_csv,
+            "export_json": self._on_export_json,
+            "work_streak": self._on_work_streak,
+            "performance_alert": self._on_performance_alert,
+            "goal_progress": self._on_goal_progress,
+            "export_csv_direct": self._on_export_csv_direct,
+            "export_json_direct": self._on_export_json_direct,
+            "export_with_analytics": self._on_export_with_analytics,
+            "delete_old_month_direct": self._on_delete_old_month_direct,
+            "delete_old_week_direct": self._on_delete_old_week_direct,
+            "delete_goals_direct": self._on_delete_goals_direct,
+            "delete_history_direct": self._on_delete_history_direct,
+            "export_then_delete_direct": self._on_export_then_delete_direct,
+            "csv_then_delete_final": self._on_csv_then_delete_final,
+            "json_then_delete_final": self._on_json_then_delete_final,
+            "delete_all_confirm_direct": self._on_delete_all_confirm_direct,
+            "delete_all_final_direct": self._on_delete_all_final_direct,
+            "cancel_delete": self._on_cancel_delete,
+            "select_day_shift": self._on_select_day_shift,
+            "select_night_shift": self._on_select_night_shift,
+            "day_shift_manual": self._on_shift_manual,
+            "night_shift_manual": self._on_shift_manual,
+            "manual_time_input": self._on_manual_time_input,
+            "back_to_main": self._on_back_to_main,
+        }
+        for key, handler in routes.items():
+            router.add(key, handler)
+
+        # Per-time and per-preset buttons; exact keys such as "day_shift_manual" are matched first
+        router.add_prefix("day_shift_", self._on_day_shift_time)
+        router.add_prefix("night_shift_", self._on_night_shift_time)
+        router.add_prefix("preset_", self._on_preset)
+        return router
 
     def get_main_keyboard(self):
         """Create the main reply keyboard."""
@@ -63,6 +187,7 @@ class SalaryTelegramBot:
         ]
         return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=False)
 
+    @metrics.timed("command.start")
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Send a message when the command /start is issued."""
         welcome_message = """🤖 **လစာတွက်ချက်စက်ရုံ**
@@ -88,6 +213,7 @@ class SalaryTelegramBot:
         keyboard = self.get_main_keyboard()
         await update.message.reply_text(welcome_message, parse_mode='Markdown', reply_markup=keyboard)
 
+    @metrics.timed("command.help")
     async def help(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Send comprehensive help message."""
         help_message = """📚 **လစာတွက်ချက်ဘော့် - အသေးစိတ်လမ်းညွှန်**
@@ -209,6 +335,7 @@ class SalaryTelegramBot:
         keyboard = self.get_main_keyboard()
         await update.message.reply_text(help_message, parse_mode='Markdown', reply_markup=keyboard)
 
+    @metrics.timed("message.text")
     async def handle_time_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle time input from user."""
         try:
@@ -268,7 +395,7 @@ class SalaryTelegramBot:
                 return
 
             # Save calculation data
-            calculation_saved = self.storage.save_calculation(user_id, result)
+            calculation_saved = await self.storage.save_calculation(user_id, result)
 
             # Format response in Burmese
             response = self.formatter.format_salary_response(result)
@@ -302,6 +429,7 @@ class SalaryTelegramBot:
                 keyboard = self.get_main_keyboard()
                 await update.message.reply_text("❌ **စနစ်အမှားရှိသည်**\n\nကျေးဇူးပြု၍ ထပ်မံကြိုးစားပါ။", parse_mode='Markdown', reply_markup=keyboard)
 
+    @metrics.timed("message.keyboard_button")
     async def handle_keyboard_button(self, update: Update, context: ContextTypes.DEFAULT_TYPE, button_text: str) -> None:
         """Handle keyboard button presses."""
         user_id = str(update.effective_user.id)
@@ -310,7 +438,7 @@ class SalaryTelegramBot:
         try:
             if button_text == "📊 ခွဲခြမ်းစိတ်ဖြာမှု":
                 # Generate summary statistics
-                stats = self.analytics.generate_summary_stats(user_id, 30)
+                stats = await self.analytics.generate_summary_stats(user_id, 30)
 
                 if stats.get('error'):
                     response = f"❌ **အမှားရှိသည်**\n\n{stats['error']}"
@@ -337,7 +465,7 @@ class SalaryTelegramBot:
 
             elif button_text == "📋 မှတ်တမ်း":
                 # Show recent history
-                history_data = self.analytics.get_recent_history(user_id, 7)
+                history_data = await self.analytics.get_recent_history(user_id, 7)
 
                 if history_data.get('error'):
                     response = f"❌ **အမှားရှိသည်**\n\n{history_data['error']}"
@@ -355,106 +483,16 @@ class SalaryTelegramBot:
                 await update.message.reply_text(response, parse_mode='Markdown', reply_markup=keyboard)
 
             elif button_text == "🎯 DASHBOARD":
-                # Generate enhanced dashboard with premium design
-                stats = self.analytics.generate_summary_stats(user_id, 30)
-                history_data = self.analytics.get_recent_history(user_id, 7)
-
-                # Get goal progress for dashboard
-                goal_progress = self.goal_tracker.check_goal_progress(user_id, 'monthly')
-
-                # Get work streak info
-                streak_info = self.notification_manager.get_streak_info(user_id)
-
-                if stats.get('error'):
-                    response = f"""🎯 **PREMIUM DASHBOARD**
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-❌ **ဒေတာမရှိသေးပါ:** {stats['error']}
-
-💡 **စတင်နည်း:** အလုပ်ချိန်ပထမဆုံး ထည့်ပြီးမှ Dashboard အပြည့်အစုံ ကြည့်ရှုနိုင်ပါမည်
-
-🚀 **အချိန်ထည့်ပုံ:** 08:30 ~ 17:30 သို့မဟုတ် Set 08:30 AM To 05:30 PM
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-                else:
-                    # Create premium dashboard design
-                    response = f"""🎯 **PREMIUM DASHBOARD**
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🏆 **လစာခွဲခြမ်းစိတ်ဖြာမှု (လ၀က်ဆုံး ၃၀ ရက်)**
-
-📊 **OVERVIEW:**
-┌─────────────────────────────────────┐
-│ 📅 အလုပ်လုပ်ရက်: {stats['total_days']:>15} ရက် │
-│ ⏰ စုစုပေါင်းချိန်: {stats['total_work_hours']:>13} နာရီ │
-│ 💰 စုစုပေါင်းလစာ: {stats['total_salary']:>10,.0f}¥ │
-│ 🔥 လက်ရှိ Streak: {streak_info.get('current_streak', 0):>14} ရက် │
-└─────────────────────────────────────┘
-
-🎯 **အလုပ်ချိန်ခွဲခြမ်းမှု:**
-┌─────────────────────────────────────┐
-│ 🟢 ပုံမှန်နာရီ: {stats['total_regular_hours']:>16} နာရီ │
-│ 🔴 OT နာရီ: {stats['total_ot_hours']:>19} နာရီ │
-│ 📈 နေ့စဉ်ပျမ်းမျှ: {stats['avg_daily_hours']:>15} နာရီ │
-│ 💸 နေ့စဉ်ပျမ်းမျှ: {stats['avg_daily_salary']:>11,.0f}¥ │
-└─────────────────────────────────────┘"""
-
-                    # Add goal progress if available
-                    if not goal_progress.get('error') and goal_progress.get('progress'):
-                        response += f"""
-
-🎯 **ပန်းတိုင်တိုးတက်မှု ({goal_progress.get('month', 'လက်ရှိလ')}):**
-┌─────────────────────────────────────┐"""
-
-                        for goal_type, goal_data in goal_progress.get('progress', {}).items():
-                            if goal_type == 'salary':
-                                progress_bar = "█" * int(goal_data['progress_percent'] / 10) + "░" * (10 - int(goal_data['progress_percent'] / 10))
-                                response += f"""
-│ 💰 လစာပန်းတိုင်: {goal_data['progress_percent']:>15.1f}% │
-│ [{progress_bar}] │
-│ လက်ရှိ: ¥{goal_data['current']:>16,.0f} │
-│ ပန်းတိုင်: ¥{goal_data['target']:>14,.0f} │"""
-                            elif goal_type == 'hours':
-                                progress_bar = "█" * int(goal_data['progress_percent'] / 10) + "░" * (10 - int(goal_data['progress_percent'] / 10))
-                                response += f"""
-│ ⏰ ချိန်ပန်းတိုင်: {goal_data['progress_percent']:>16.1f}% │
-│ [{progress_bar}] │
-│ လက်ရှိ: {goal_data['current']:>17.1f}နာရီ │
-│ ပန်းတိုင်: {goal_data['target']:>15}နာရီ │"""
-
-                        response += """
-└─────────────────────────────────────┘"""
-
-                    # Add recent work history
-                    if not history_data.get('error') and history_data.get('history'):
-                        response += f"""
-
-📋 **လုပ်ငန်းမှတ်တမ်း (နောက်ဆုံး ၅ ရက်):**
-┌─────────────────────────────────────┐"""
-
-                        for day in history_data['history'][:5]:
-                            response += f"""
-│ 📅 {day['date']}: {day['hours']:>4}နာရီ (OT:{day['ot_hours']:>3}နာရီ) = ¥{day['salary']:>6,.0f} │"""
-
-                        response += """
-└─────────────────────────────────────┘"""
-
-                    response += f"""
-
-🚀 **DASHBOARD INSIGHTS:**
-• 🏆 အမြင့်ဆုံး Streak: {streak_info.get('longest_streak', 0)} ရက်
-• 📊 စွမ်းအားအဆင့်: {"🔥 အလွန်ကောင်း" if stats['avg_daily_hours'] >= 8.0 else "⚡ ကောင်း" if stats['avg_daily_hours'] >= 7.0 else "💪 တိုးတက်ရန်လိုအပ်"}
-• 🎯 လစဉ်ပျမ်းမျှ: {stats['total_days'] * 30 / 30:.1f} ရက်/လ
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
+                # Premium dashboard from the user's stored snapshot; the text is
+                # rendered once per snapshot
+                snapshot = await self.dashboard.get_dashboard(user_id)
+                response = self.formatter.format_premium_dashboard(snapshot)
 
                 await update.message.reply_text(response, parse_mode='Markdown', reply_markup=keyboard)
 
             elif button_text == "📤 ပို့မှု":
                 # Show export options with inline buttons
-                export_summary = self.export_manager.get_export_summary(user_id, 30)
+                export_summary = await self.export_manager.get_export_summary(user_id, 30)
 
                 if export_summary.get('error'):
                     response = f"""📤 **ဒေတာပို့မှုမီနူး**
@@ -500,8 +538,8 @@ class SalaryTelegramBot:
 
             elif button_text == "🔔 သတိပေးချက်":
                 # Show notifications and streak info
-                streak_info = self.notification_manager.get_streak_info(user_id)
-                alert_info = self.notification_manager.generate_work_summary_alert(user_id)
+                streak_info = await self.notification_manager.get_streak_info(user_id)
+                alert_info = await self.notification_manager.generate_work_summary_alert(user_id)
 
                 response = f"""🔔 **သတိပေးချက်မီနူး**
 
@@ -529,7 +567,7 @@ class SalaryTelegramBot:
 
             elif button_text == "🗑️ ဒေတာဖျက်မှု":
                 # Get user data summary for display
-                user_data_summary = self.storage.get_user_data_summary(user_id)
+                user_data_summary = await self.storage.get_user_data_summary(user_id)
 
                 response = f"""🗑️ **ဒေတာဖျက်မှုဌာန**
 
@@ -574,8 +612,8 @@ class SalaryTelegramBot:
 
             elif button_text == "📅 ပြက္ခဒိန်":
                 # Show calendar and upcoming events
-                events = self.calendar_manager.get_user_events(user_id, 30)
-                today_events = self.calendar_manager.get_today_events(user_id)
+                events = await self.calendar_manager.get_user_events(user_id, 30)
+                today_events = await self.calendar_manager.get_today_events(user_id)
 
                 if events.get('error'):
                     response = f"""📅 **ပြက္ခဒိန်မီနူး**
@@ -659,7 +697,7 @@ class SalaryTelegramBot:
             await update.message.reply_text(response, parse_mode='Markdown', reply_markup=keyboard)
 
     async def handle_button_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Handle button callbacks for analysis features."""
+        """Handle button callbacks by routing callback_data through self.callbacks."""
         query = update.callback_query
         await query.answer()
 
@@ -667,14 +705,19 @@ class SalaryTelegramBot:
         callback_data = query.data
 
         try:
-            if callback_data == "analysis":
-                # Generate summary statistics
-                stats = self.analytics.generate_summary_stats(user_id, 30)
+            await self.callbacks.dispatch(callback_data, query, context, user_id, callback_data)
+        except Exception as e:
+            logger.error(f"Error handling button callback: {e}")
+            await query.edit_message_text("❌ **စနစ်အမှားရှိသည်**\n\nကျေးဇူးပြု၍ ထပ်မံကြိုးစားပါ။", parse_mode='Markdown')
 
-                if stats.get('error'):
-                    response = f"❌ **အမှားရှိသည်**\n\n{stats['error']}"
-                else:
-                    response = f"""📊 **လစာခွဲခြမ်းစိတ်ဖြာမှု (နောက်ဆုံး ၃၀ ရက်)**
+    async def _on_analysis(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Generate summary statistics."""
+        stats = await self.analytics.generate_summary_stats(user_id, 30)
+
+        if stats.get('error'):
+            response = f"❌ **အမှားရှိသည်**\n\n{stats['error']}"
+        else:
+            response = f"""📊 **လစာခွဲခြမ်းစိတ်ဖြာမှု (နောက်ဆုံး ၃၀ ရက်)**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -692,118 +735,62 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "dashboard":
-                # Show comprehensive dashboard
-                stats = self.analytics.generate_summary_stats(user_id, 30)
-                chart_data = self.analytics.generate_bar_chart_data(user_id, 14)
-                history_data = self.analytics.get_recent_history(user_id, 7)
+    async def _on_dashboard(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show comprehensive dashboard."""
+        snapshot = await self.dashboard.get_dashboard(user_id)
+        response = self.formatter.format_dashboard(snapshot)
 
-                if stats.get('error'):
-                    response = f"""📊 **Dashboard**
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    async def _on_history(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show recent history."""
+        history_data = await self.analytics.get_recent_history(user_id, 7)
 
-❌ **အမှားရှိသည်:** {stats['error']}
+        if history_data.get('error'):
+            response = f"❌ **အမှားရှိသည်**\n\n{history_data['error']}"
+        else:
+            response = "📋 **နောက်ဆုံး ၇ ရက် မှတ်တမ်း**\n\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
 
-💡 **အကြံပြုချက်:** အလုပ်ချိန်မှတ်သားပြီးမှ Dashboard ကြည့်ပါ
+            for day in history_data['history']:
+                response += f"📅 **{day['date']}**\n"
+                response += f"⏰ {day['hours']}နာရီ (OT: {day['ot_hours']}နာရီ)\n"
+                response += f"💰 ¥{day['salary']:,.0f}\n"
+                response += f"🕒 {day['shifts']}\n\n"
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-                else:
-                    # Create comprehensivedashboard
-                    response = f"""📊 **DASHBOARD - လစာခွဲခြမ်းစိတ်ဖြာမှု**
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📈 **လအောက်ဆုံး ၃၀ ရက် အခြေအနေ**
-
-📅 **အလုပ်လုပ်ရက်:** {stats['total_days']} ရက်
-⏰ **စုစုပေါင်းအလုပ်ချိန်:** {stats['total_work_hours']} နာရီ
-   🟢 ပုံမှန်နာရီ: {stats['total_regular_hours']} နာရီ (¥2,100/နာရီ)
-   🔴 OT နာရီ: {stats['total_ot_hours']} နာရီ (¥2,625/နာရီ)
-
-💰 **စုစုပေါင်းလစာ:** ¥{stats['total_salary']:,.0f}
+            response += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 
-📊 **နေ့စဉ်ပျမ်းမျှ:**
-   ⏰ အလုပ်ချိန်: {stats['avg_daily_hours']} နာရီ
-   💰 လစာ: ¥{stats['avg_daily_salary']:,.0f}
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-
-                    # Add charts if available
-                    if not chart_data.get('error'):
-                        hours_chart = self.analytics.create_text_bar_chart(chart_data['chart_data'], 'hours')
-
-                        response += f"""
-
-📈 **နောက်ဆုံး ၁၄ ရက် အလုပ်ချိန်ဂရပ်**
-
-{hours_chart}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-
-                    # Add recent history
-                    if not history_data.get('error'):
-                        response += f"""
-
-📋 **နောက်ဆုံး ၅ ရက် မှတ်တမ်း**
-
-"""
-                        for day in history_data['history'][:5]:  # Show last 5 days
-                            response += f"📅 {day['date']}: {day['hours']}နာရီ (OT: {day['ot_hours']}နာရီ) = ¥{day['salary']:,.0f}\n"
-
-                    response += "\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-
-                await query.edit_message_text(response, parse_mode='Markdown')
-
-            elif callback_data == "history":
-                # Show recent history
-                history_data = self.analytics.get_recent_history(user_id, 7)
-
-                if history_data.get('error'):
-                    response = f"❌ **အမှားရှိသည်**\n\n{history_data['error']}"
-                else:
-                    response = "📋 **နောက်ဆုံး ၇ ရက် မှတ်တမ်း**\n\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-
-                    for day in history_data['history']:
-                        response += f"📅 **{day['date']}**\n"
-                        response += f"⏰ {day['hours']}နာရီ (OT: {day['ot_hours']}နာရီ)\n"
-                        response += f"💰 ¥{day['salary']:,.0f}\n"
-                        response += f"🕒 {day['shifts']}\n\n"
-
-                    response += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-
-                await query.edit_message_text(response, parse_mode='Markdown')
-
-            elif callback_data == "delete_menu":
-                # Show delete options with enhanced styling and more options
-                keyboard = [
-                    [
-                        InlineKeyboardButton("📤 Export ပြီးမှ ဖျက်မယ်", callback_data="export_then_delete"),
-                        InlineKeyboardButton("📊 ဒေတာအချက်အလက်", callback_data="data_info")
-                    ],
-                    [
-                        InlineKeyboardButton("🗓️ တစ်လဟောင်းဒေတာ", callback_data="delete_old_month"),
-                        InlineKeyboardButton("📅 တစ်ပတ်ဟောင်းဒေတာ", callback_data="delete_old_week")
-                    ],
-                    [
-                        InlineKeyboardButton("🎯 ပန်းတိုင်ဖျက်မယ်", callback_data="delete_goals"),
-                        InlineKeyboardButton("📋 မှတ်တမ်းဖျက်မယ်", callback_data="delete_history")
-                    ],
-                    [
-                        InlineKeyboardButton("💥 အားလုံးဖျက်မယ် ⚠️", callback_data="delete_all_confirm")
-                    ],
-                    [
-                        InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="back_to_main")
-                    ]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_delete_menu(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show delete options with enhanced styling and more options."""
+        keyboard = [
+            [
+                InlineKeyboardButton("📤 Export ပြီးမှ ဖျက်မယ်", callback_data="export_then_delete"),
+                InlineKeyboardButton("📊 ဒေတာအချက်အလက်", callback_data="data_info")
+            ],
+            [
+                InlineKeyboardButton("🗓️ တစ်လဟောင်းဒေတာ", callback_data="delete_old_month"),
+                InlineKeyboardButton("📅 တစ်ပတ်ဟောင်းဒေတာ", callback_data="delete_old_week")
+            ],
+            [
+                InlineKeyboardButton("🎯 ပန်းတိုင်ဖျက်မယ်", callback_data="delete_goals"),
+                InlineKeyboardButton("📋 မှတ်တမ်းဖျက်မယ်", callback_data="delete_history")
+            ],
+            [
+                InlineKeyboardButton("💥 အားလုံးဖျက်မယ် ⚠️", callback_data="delete_all_confirm")
+            ],
+            [
+                InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="back_to_main")
+            ]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                # Get user data summary for display
-                user_data_summary = self.storage.get_user_data_summary(user_id)
+        # Get user data summary for display
+        user_data_summary = await self.storage.get_user_data_summary(user_id)
 
-                response = f"""🗑️ **ဒေတာဖျက်မှုဌာန**
+        response = f"""🗑️ **ဒေတာဖျက်မှုဌာန**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -825,20 +812,20 @@ class SalaryTelegramBot:
 
 မည်သည့်ရွေးချယ်မှုကို လုပ်လိုပါသလဲ?"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "export_then_delete":
-                # Export data first, then show delete options
-                keyboard = [
-                    [
-                        InlineKeyboardButton("📊 CSV Export ပြီး ဖျက်မယ်", callback_data="csv_then_delete"),
-                        InlineKeyboardButton("📄 JSON Export ပြီး ဖျက်မယ်", callback_data="json_then_delete")
-                    ],
-                    [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_export_then_delete(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Export data first, then show delete options."""
+        keyboard = [
+            [
+                InlineKeyboardButton("📊 CSV Export ပြီး ဖျက်မယ်", callback_data="csv_then_delete"),
+                InlineKeyboardButton("📄 JSON Export ပြီး ဖျက်မယ်", callback_data="json_then_delete")
+            ],
+            [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                response = """📤🗑️ **Export ပြီးမှ ဖျက်မှု**
+        response = """📤🗑️ **Export ပြီးမှ ဖျက်မှု**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -853,17 +840,17 @@ class SalaryTelegramBot:
 
 မည်သည့်ပုံစံဖြင့် Export လုပ်လိုပါသလဲ?"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "data_info":
-                # Show detailed data information
-                user_data_summary = self.storage.get_user_data_summary(user_id)
-                keyboard = [
-                    [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_data_info(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show detailed data information."""
+        user_data_summary = await self.storage.get_user_data_summary(user_id)
+        keyboard = [
+            [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                response = f"""📊 **ဒေတာအသေးစိတ်အချက်အလက်**
+        response = f"""📊 **ဒေတာအသေးစိတ်အချက်အလက်**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -889,18 +876,18 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "delete_old_month":
-                # Delete data older than 1 month
-                success = self.storage.delete_old_data(user_id, 30)
-                keyboard = [
-                    [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_delete_old_month(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Delete data older than 1 month."""
+        success = await self.storage.delete_old_data(user_id, 30)
+        keyboard = [
+            [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                if success:
-                    response = """🗓️ **တစ်လဟောင်းဒေတာ ဖျက်ပြီးပါပြီ**
+        if success:
+            response = """🗓️ **တစ်လဟောင်းဒေတာ ဖျက်ပြီးပါပြီ**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -911,8 +898,8 @@ class SalaryTelegramBot:
 🎯 **အကြံပြုချက်:** နောက်လ Export လုပ်ပြီးမှ ဖျက်ပါ
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-                else:
-                    response = """❌ **ဖျက်မှုမအောင်မြင်**
+        else:
+            response = """❌ **ဖျက်မှုမအောင်မြင်**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -921,18 +908,18 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "delete_old_week":
-                # Delete data older than 1 week
-                success = self.storage.delete_old_data(user_id, 7)
-                keyboard = [
-                    [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_delete_old_week(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Delete data older than 1 week."""
+        success = await self.storage.delete_old_data(user_id, 7)
+        keyboard = [
+            [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                if success:
-                    response = """📅 **တစ်ပတ်ဟောင်းဒေတာ ဖျက်ပြီးပါပြီ**
+        if success:
+            response = """📅 **တစ်ပတ်ဟောင်းဒေတာ ဖျက်ပြီးပါပြီ**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -941,8 +928,8 @@ class SalaryTelegramBot:
 💾 **နေရာ:** စတိုရေ့ချ် နေရာလွတ်ရရှိပါပြီ
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-                else:
-                    response = """❌ **ဖျက်မှုမအောင်မြင်**
+        else:
+            response = """❌ **ဖျက်မှုမအောင်မြင်**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -951,18 +938,18 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "delete_goals":
-                # Delete goals only
-                success = self.goal_tracker.delete_all_goals(user_id)
-                keyboard = [
-                    [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_delete_goals(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Delete goals only."""
+        success = await self.goal_tracker.delete_all_goals(user_id)
+        keyboard = [
+            [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                if success:
-                    response = """🎯 **ပန်းတိုင်များ ဖျက်ပြီးပါပြီ**
+        if success:
+            response = """🎯 **ပန်းတိုင်များ ဖျက်ပြီးပါပြီ**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -971,8 +958,8 @@ class SalaryTelegramBot:
 🎯 **သတိ:** ပန်းတိုင်အသစ်များ ပြန်သတ်မှတ်နိုင်ပါသည်
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-                else:
-                    response = """❌ **ပန်းတိုင်ဖျက်မှု မအောင်မြင်**
+        else:
+            response = """❌ **ပန်းတိုင်ဖျက်မှု မအောင်မြင်**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -981,18 +968,18 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "delete_history":
-                # Delete work history only
-                success = self.storage.delete_work_history(user_id)
-                keyboard = [
-                    [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_delete_history(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Delete work history only."""
+        success = await self.storage.delete_work_history(user_id)
+        keyboard = [
+            [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="delete_menu")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                if success:
-                    response = """📋 **အလုပ်မှတ်တမ်း ဖျက်ပြီးပါပြီ**
+        if success:
+            response = """📋 **အလုပ်မှတ်တမ်း ဖျက်ပြီးပါပြီ**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1001,8 +988,8 @@ class SalaryTelegramBot:
 📱 **သတိ:** ယခုမှ အလုပ်ချိန်အသစ် စတင်နိုင်ပါသည်
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-                else:
-                    response = """❌ **မှတ်တမ်းဖျက်မှု မအောင်မြင်**
+        else:
+            response = """❌ **မှတ်တမ်းဖျက်မှု မအောင်မြင်**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1011,19 +998,19 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "delete_all_confirm":
-                # Show final confirmation for deleting all data
-                keyboard = [
-                    [
-                        InlineKeyboardButton("💥 ဟုတ်ကဲ့ အားလုံးဖျက်မယ်", callback_data="delete_all_final"),
-                        InlineKeyboardButton("❌ မဖျက်တော့ပါ", callback_data="delete_menu")
-                    ]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_delete_all_confirm(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show final confirmation for deleting all data."""
+        keyboard = [
+            [
+                InlineKeyboardButton("💥 ဟုတ်ကဲ့ အားလုံးဖျက်မယ်", callback_data="delete_all_final"),
+                InlineKeyboardButton("❌ မဖျက်တော့ပါ", callback_data="delete_menu")
+            ]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                response = """💥 **နောက်ဆုံးအတည်ပြုချက်**
+        response = """💥 **နောက်ဆုံးအတည်ပြုချက်**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1045,14 +1032,14 @@ class SalaryTelegramBot:
 
 💭 **နောက်ဆုံးမေးခွန်း:** သေချာပါသလား?"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "delete_all_final":
-                # Final delete all user data
-                success = self.storage.delete_user_data(user_id)
+    async def _on_delete_all_final(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Final delete all user data."""
+        success = await self.storage.delete_user_data(user_id)
 
-                if success:
-                    response = """🗑️ **အားလုံးဖျက်မှု အောင်မြင်သည်**
+        if success:
+            response = """🗑️ **အားလုံးဖျက်မှု အောင်မြင်သည်**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1068,8 +1055,8 @@ class SalaryTelegramBot:
 💪 **စတင်လိုက်ပါ!** အလုပ်ချိန်ပထမဆုံး ထည့်ကြည့်ပါ
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-                else:
-                    response = """❌ **အားလုံးဖျက်မှု မအောင်မြင်**
+        else:
+            response = """❌ **အားလုံးဖျက်မှု မအောင်မြင်**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1079,24 +1066,24 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "goals_menu":
-                # Show goals menu
-                keyboard = [
-                    [
-                        InlineKeyboardButton("🎯 ပန်းတိုင်သတ်မှတ်", callback_data="set_goals"),
-                        InlineKeyboardButton("📊 တိုးတက်မှု", callback_data="goal_progress")
-                    ],
-                    [
-                        InlineKeyboardButton("🏆 အောင်မြင်မှု", callback_data="achievements"),
-                        InlineKeyboardButton("💡 အကြံပြုချက်", callback_data="goal_recommendations")
-                    ],
-                    [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="back_to_main")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_goals_menu(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show goals menu."""
+        keyboard = [
+            [
+                InlineKeyboardButton("🎯 ပန်းတိုင်သတ်မှတ်", callback_data="set_goals"),
+                InlineKeyboardButton("📊 တိုးတက်မှု", callback_data="goal_progress")
+            ],
+            [
+                InlineKeyboardButton("🏆 အောင်မြင်မှု", callback_data="achievements"),
+                InlineKeyboardButton("💡 အကြံပြုချက်", callback_data="goal_recommendations")
+            ],
+            [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="back_to_main")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                response = """🎯 **ပန်းတိုင်စီမံခန့်ခွဲမှု**
+        response = """🎯 **ပန်းတိုင်စီမံခန့်ခွဲမှု**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1104,24 +1091,24 @@ class SalaryTelegramBot:
 
 မည်သည့်ရွေးချယ်မှုကို လုပ်လိုပါသလဲ?"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "export_menu":
-                # Show export menu with enhanced styling
-                keyboard = [
-                    [
-                        InlineKeyboardButton("📊 CSV ဖိုင်ပို့မှု", callback_data="export_csv"),
-                        InlineKeyboardButton("📄 JSON ဖိုင်ပို့မှု", callback_data="export_json")
-                    ],
-                    [
-                        InlineKeyboardButton("📅 လစဉ်အစီရင်ခံစာ", callback_data="monthly_report"),
-                        InlineKeyboardButton("ℹ️ ပို့မှုအချက်အလက်", callback_data="export_info")
-                    ],
-                    [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="back_to_main")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_export_menu(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show export menu with enhanced styling."""
+        keyboard = [
+            [
+                InlineKeyboardButton("📊 CSV ဖိုင်ပို့မှု", callback_data="export_csv"),
+                InlineKeyboardButton("📄 JSON ဖိုင်ပို့မှု", callback_data="export_json")
+            ],
+            [
+                InlineKeyboardButton("📅 လစဉ်အစီရင်ခံစာ", callback_data="monthly_report"),
+                InlineKeyboardButton("ℹ️ ပို့မှုအချက်အလက်", callback_data="export_info")
+            ],
+            [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="back_to_main")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                response = """📤 **ဒေတာပို့မှုဌာန**
+        response = """📤 **ဒေတာပို့မှုဌာန**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1137,24 +1124,24 @@ class SalaryTelegramBot:
 
 မည်သည့်ပုံစံဖြင့် ပို့လိုပါသလဲ?"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "notifications_menu":
-                # Show notifications menu
-                keyboard = [
-                    [
-                        InlineKeyboardButton("⏰ အလုပ်သတိပေးချက်", callback_data="work_reminder"),
-                        InlineKeyboardButton("⚠️ စွမ်းအားသတိပေးချက်", callback_data="performance_alert")
-                    ],
-                    [
-                        InlineKeyboardButton("🔥 အလုပ်ဆက်တိုက်", callback_data="work_streak"),
-                        InlineKeyboardButton("📅 လစ်ဟန်ရက်", callback_data="missing_days")
-                    ],
-                    [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="back_to_main")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_notifications_menu(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show notifications menu."""
+        keyboard = [
+            [
+                InlineKeyboardButton("⏰ အလုပ်သတိပေးချက်", callback_data="work_reminder"),
+                InlineKeyboardButton("⚠️ စွမ်းအားသတိပေးချက်", callback_data="performance_alert")
+            ],
+            [
+                InlineKeyboardButton("🔥 အလုပ်ဆက်တိုက်", callback_data="work_streak"),
+                InlineKeyboardButton("📅 လစ်ဟန်ရက်", callback_data="missing_days")
+            ],
+            [InlineKeyboardButton("🔙 ပြန်သွားမည်", callback_data="back_to_main")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                response = """🔔 **သတိပေးချက်မီနူး**
+        response = """🔔 **သတိပေးချက်မီနူး**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1162,20 +1149,17 @@ class SalaryTelegramBot:
 
 မည်သည့်ရွေးချယ်မှုကို လုပ်လိုပါသလဲ?"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "export_csv":
-                # Export to CSV with enhanced styling
-                try:
-                    csv_data = self.export_manager.export_to_csv(user_id, 30)
+    async def _on_export_csv(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Export to CSV with enhanced styling."""
+        try:
+            csv_file = await self.export_manager.open_export(user_id, 'csv', 30, encoding='utf-8-sig')
 
-                    if csv_data and csv_data.strip():
-                        # Save to file and send
-                        filename = f"salary_data_{user_id}_{datetime.now().strftime('%Y%m%d')}.csv"
-                        with open(filename, 'w', encoding='utf-8-sig') as f:
-                            f.write(csv_data)
+            if csv_file:
+                filename = f"salary_data_{user_id}_{datetime.now().strftime('%Y%m%d')}.csv"
 
-                        response = f"""📊 CSV ဖိုင်ပို့မှုအောင်မြင်သည်
+                response = f"""📊 CSV ဖိုင်ပို့မှုအောင်မြင်သည်
 
 ✅ ပြီးမြောက်မှုအခြေအနေ: အောင်မြင်
 📁 ဖိုင်အမည်: {filename}
@@ -1191,48 +1175,40 @@ class SalaryTelegramBot:
 • ရက်စွဲ, အချိန်, Shift အမျိုးအစား
 • လုပ်ငန်းချိန်, OT ချိန်, လစာအသေးစိတ်"""
 
-                        await query.edit_message_text(response)
-
-                        # Send file
-                        try:
-                            with open(filename, 'rb') as f:
-                                await context.bot.send_document(
-                                    chat_id=query.message.chat_id,
-                                    document=f,
-                                    filename=filename,
-                                    caption="📊 လစာဒေတာ CSV ဖိုင် - Excel/Sheets တွင် ဖွင့်နိုင်ပါသည်"
-                                )
-                            # Clean up file after sending
-                            try:
-                                os.remove(filename)
-                            except:
-                                pass
-                        except Exception as e:
-                            logger.error(f"Error sending CSV file: {e}")
-                            await query.edit_message_text("❌ ဖိုင်ပို့ရာတွင် အမှားရှိခဲ့သည်")
-                    else:
-                        response = """❌ CSV ပို့မှုမအောင်မြင်
+                await query.edit_message_text(response)
+
+                # Send file
+                try:
+                    with csv_file:
+                        await context.bot.send_document(
+                            chat_id=query.message.chat_id,
+                            document=csv_file,
+                            filename=filename,
+                            caption="📊 လစာဒေတာ CSV ဖိုင် - Excel/Sheets တွင် ဖွင့်နိုင်ပါသည်"
+                        )
+                except Exception as e:
+                    logger.error(f"Error sending CSV file: {e}")
+                    await query.edit_message_text("❌ ဖိုင်ပို့ရာတွင် အမှားရှိခဲ့သည်")
+            else:
+                response = """❌ CSV ပို့မှုမအောင်မြင်
 
 🔴 အမှား: ပို့ရန်ဒေတာ မတွေ့ပါ
 💡 အကြံပြုချက်: အချိန်မှတ်သားပြီးမှ export လုပ်ပါ
 🔄 ဖြေရှင်းနည်း: အလုပ်ချိန်ထည့်ပြီး ပြန်လည်ကြိုးစားပါ"""
-                        await query.edit_message_text(response)
-                except Exception as e:
-                    logger.error(f"Error in CSV export: {e}")
-                    await query.edit_message_text("❌ စနစ်အမှားရှိခဲ့သည်\n\nCSV export လုပ်ရာတွင် ပြဿနာရှိပါသည်။")
+                await query.edit_message_text(response)
+        except Exception as e:
+            logger.error(f"Error in CSV export: {e}")
+            await query.edit_message_text("❌ စနစ်အမှားရှိခဲ့သည်\n\nCSV export လုပ်ရာတွင် ပြဿနာရှိပါသည်။")
 
-            elif callback_data == "export_json":
-                # Export to JSON with enhanced styling
-                try:
-                    json_data = self.export_manager.export_to_json(user_id, 30)
+    async def _on_export_json(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Export to JSON with enhanced styling."""
+        try:
+            json_file = await self.export_manager.open_export(user_id, 'json', 30)
 
-                    if json_data and json_data.strip():
-                        # Save to file and send
-                        filename = f"salary_data_{user_id}_{datetime.now().strftime('%Y%m%d')}.json"
-                        with open(filename, 'w', encoding='utf-8') as f:
-                            f.write(json_data)
+            if json_file:
+                filename = f"salary_data_{user_id}_{datetime.now().strftime('%Y%m%d')}.json"
 
-                        response = f"""📄 JSON ဖိုင်ပို့မှုအောင်မြင်သည်
+                response = f"""📄 JSON ဖိုင်ပို့မှုအောင်မြင်သည်
 
 ✅ ပြီးမြောက်မှုအခြေအနေ: အောင်မြင်
 📁 ဖိုင်အမည်: {filename}
@@ -1250,44 +1226,39 @@ class SalaryTelegramBot:
 • Metadata နှင့် timestamps
 • Structured format for developers"""
 
-                        await query.edit_message_text(response)
-
-                        # Send file
-                        try:
-                            with open(filename, 'rb') as f:
-                                await context.bot.send_document(
-                                    chat_id=query.message.chat_id,
-                                    document=f,
-                                    filename=filename,
-                                    caption="📄 လစာဒေတာ JSON ဖိုင် - Programming applications အတွက်"
-                                )
-                            # Clean up file after sending
-                            try:
-                                os.remove(filename)
-                            except:
-                                pass
-                        except Exception as e:
-                            logger.error(f"Error sending JSON file: {e}")
-                            await query.edit_message_text("❌ ဖိုင်ပို့ရာတွင် အမှားရှိခဲ့သည်")
-                    else:
-                        response = """❌ JSON ပို့မှုမအောင်မြင်
+                await query.edit_message_text(response)
+
+                # Send file
+                try:
+                    with json_file:
+                        await context.bot.send_document(
+                            chat_id=query.message.chat_id,
+                            document=json_file,
+                            filename=filename,
+                            caption="📄 လစာဒေတာ JSON ဖိုင် - Programming applications အတွက်"
+                        )
+                except Exception as e:
+                    logger.error(f"Error sending JSON file: {e}")
+                    await query.edit_message_text("❌ ဖိုင်ပို့ရာတွင် အမှားရှိခဲ့သည်")
+            else:
+                response = """❌ JSON ပို့မှုမအောင်မြင်
 
 🔴 အမှား: ပို့ရန်ဒေတာ မတွေ့ပါ
 💡 အကြံပြုချက်: အချိန်မှတ်သားပြီးမှ export လုပ်ပါ
 🔄 ဖြေရှင်းနည်း: အလုပ်ချိန်ထည့်ပြီး ပြန်လည်ကြိုးစားပါ"""
-                        await query.edit_message_text(response)
-                except Exception as e:
-                    logger.error(f"Error in JSON export: {e}")
-                    await query.edit_message_text("❌ စနစ်အမှားရှိခဲ့သည်\n\nJSON export လုပ်ရာတွင် ပြဿနာရှိပါသည်။")
+                await query.edit_message_text(response)
+        except Exception as e:
+            logger.error(f"Error in JSON export: {e}")
+            await query.edit_message_text("❌ စနစ်အမှားရှိခဲ့သည်\n\nJSON export လုပ်ရာတွင် ပြဿနာရှိပါသည်။")
 
-            elif callback_data == "work_streak":
-                # Show work streak information
-                streak_info = self.notification_manager.get_streak_info(user_id)
+    async def _on_work_streak(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show work streak information."""
+        streak_info = await self.notification_manager.get_streak_info(user_id)
 
-                if streak_info.get('error'):
-                    response = f"❌ **အမှားရှိသည်**\n\n{streak_info['error']}"
-                else:
-                    response = f"""🔥 **အလုပ်ဆက်တိုက်ရက်ရေ**
+        if streak_info.get('error'):
+            response = f"❌ **အမှားရှိသည်**\n\n{streak_info['error']}"
+        else:
+            response = f"""🔥 **အလုပ်ဆက်တိုက်ရက်ရေ**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1299,38 +1270,38 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "performance_alert":
-                # Show performance alert
-                alert_info = self.notification_manager.generate_work_summary_alert(user_id)
+    async def _on_performance_alert(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show performance alert."""
+        alert_info = await self.notification_manager.generate_work_summary_alert(user_id)
 
-                if alert_info.get('error'):
-                    response = f"❌ **အမှားရှိသည်**\n\n{alert_info['error']}"
-                elif alert_info.get('alert'):
-                    response = f"""{alert_info['message']}
+        if alert_info.get('error'):
+            response = f"❌ **အမှားရှိသည်**\n\n{alert_info['error']}"
+        elif alert_info.get('alert'):
+            response = f"""{alert_info['message']}
 
 💡 **အကြံပြုချက်များ:**
 {chr(10).join(f'• {suggestion}' for suggestion in alert_info.get('suggestions', []))}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
-                else:
-                    response = f"""✅ **{alert_info['message']}**
+        else:
+            response = f"""✅ **{alert_info['message']}**
 
 🎯 သင့်အလုပ်စွမ်းအားမှာ ကောင်းမွန်နေပါသည်!
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "goal_progress":
-                # Show goal progress
-                progress = self.goal_tracker.check_goal_progress(user_id, 'monthly')
+    async def _on_goal_progress(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show goal progress."""
+        progress = await self.goal_tracker.check_goal_progress(user_id, 'monthly')
 
-                if progress.get('error'):
-                    response = f"❌ **အမှားရှိသည်**\n\n{progress['error']}"
-                else:
-                    response = f"""📊 **လစဉ်ပန်းတိုင်တိုးတက်မှု**
+        if progress.get('error'):
+            response = f"❌ **အမှားရှိသည်**\n\n{progress['error']}"
+        else:
+            response = f"""📊 **လစဉ်ပန်းတိုင်တိုးတက်မှု**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1339,17 +1310,17 @@ class SalaryTelegramBot:
 
 """
 
-                    for goal_type, goal_data in progress.get('progress', {}).items():
-                        if goal_type == 'salary':
-                            response += f"""💰 **လစာပန်းတိုင်:**
+            for goal_type, goal_data in progress.get('progress', {}).items():
+                if goal_type == 'salary':
+                    response += f"""💰 **လစာပန်းတိုင်:**
    🎯 ပန်းတိုင်: ¥{goal_data['target']:,.0f}
    💵 လက်ရှိ: ¥{goal_data['current']:,.0f}
    📈 တိုးတက်မှု: {goal_data['progress_percent']:.1f}%
    🔄 ကျန်: ¥{goal_data['remaining']:,.0f}
 
 """
-                        elif goal_type == 'hours':
-                            response += f"""⏰ **အလုပ်ချိန်ပန်းတိုင်:**
+                elif goal_type == 'hours':
+                    response += f"""⏰ **အလုပ်ချိန်ပန်းတိုင်:**
    🎯 ပန်းတိုင်: {goal_data['target']} နာရီ
    ⏱️ လက်ရှိ: {goal_data['current']:.1f} နာရီ
    📈 တိုးတက်မှု: {goal_data['progress_percent']:.1f}%
@@ -1357,21 +1328,18 @@ class SalaryTelegramBot:
 
 """
 
-                    response += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+            response += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "export_csv_direct":
-                # Direct CSV export without menu
-                csv_data = self.export_manager.export_to_csv(user_id, 30)
+    async def _on_export_csv_direct(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Direct CSV export without menu."""
+        csv_file = await self.export_manager.open_export(user_id, 'csv', 30)
 
-                if csv_data:
-                    # Save to file and send
-                    filename = f"salary_data_{user_id}_{datetime.now().strftime('%Y%m%d')}.csv"
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write(csv_data)
+        if csv_file:
+            filename = f"salary_data_{user_id}_{datetime.now().strftime('%Y%m%d')}.csv"
 
-                    response = f"""📊 CSV ဖိုင်ပို့မှုအောင်မြင်သည်
+            response = f"""📊 CSV ဖိုင်ပို့မှုအောင်မြင်သည်
 
 ✅ ပြီးမြောက်မှု: အောင်မြင်
 📁 ဖိုင်အမည်: {filename}
@@ -1380,36 +1348,30 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                    await query.edit_message_text(response)
-
-                    # Send file
-                    with open(filename, 'rb') as f:
-                        await context.bot.send_document(
-                            chat_id=query.message.chat_id,
-                            document=f,
-                            filename=filename,
-                            caption="📊 လစာဒေတာ CSV ဖိုင် - Excel/Sheets တွင် ဖွင့်နိုင်ပါသည်"
-                        )
+            await query.edit_message_text(response)
 
-                    # Clean up file
-                    os.remove(filename)
-                else:
-                    response = """❌ CSV ပို့မှုမအောင်မြင်
+            # Send file
+            with csv_file:
+                await context.bot.send_document(
+                    chat_id=query.message.chat_id,
+                    document=csv_file,
+                    filename=filename,
+                    caption="📊 လစာဒေတာ CSV ဖိုင် - Excel/Sheets တွင် ဖွင့်နိုင်ပါသည်"
+                )
+        else:
+            response = """❌ CSV ပို့မှုမအောင်မြင်
 
 ဒေတာ မတွေ့ပါ။ အချိန်မှတ်သားပြီးမှ export လုပ်ပါ။"""
-                    await query.edit_message_text(response)
+            await query.edit_message_text(response)
 
-            elif callback_data == "export_json_direct":
-                # Direct JSON export without menu
-                json_data = self.export_manager.export_to_json(user_id, 30)
+    async def _on_export_json_direct(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Direct JSON export without menu."""
+        json_file = await self.export_manager.open_export(user_id, 'json', 30)
 
-                if json_data:
-                    # Save to file and send
-                    filename = f"salary_data_{user_id}_{datetime.now().strftime('%Y%m%d')}.json"
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write(json_data)
+        if json_file:
+            filename = f"salary_data_{user_id}_{datetime.now().strftime('%Y%m%d')}.json"
 
-                    response = f"""📄 JSON ဖိုင်ပို့မှုအောင်မြင်သည်
+            response = f"""📄 JSON ဖိုင်ပို့မှုအောင်မြင်သည်
 
 ✅ ပြီးမြောက်မှု: အောင်မြင်
 📁 ဖိုင်အမည်: {filename}
@@ -1418,33 +1380,30 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                    await query.edit_message_text(response)
+            await query.edit_message_text(response)
 
-                    # Send file
-                    with open(filename, 'rb') as f:
-                        await context.bot.send_document(
-                            chat_id=query.message.chat_id,
-                            document=f,
-                            filename=filename,
-                            caption="📄 လစာဒေတာ JSON ဖိုင် - Programming applications အတွက်"
-                        )
-
-                    # Clean up file
-                    os.remove(filename)
-                else:
-                    response = """❌ JSON ပို့မှုမအောင်မြင်
+            # Send file
+            with json_file:
+                await context.bot.send_document(
+                    chat_id=query.message.chat_id,
+                    document=json_file,
+                    filename=filename,
+                    caption="📄 လစာဒေတာ JSON ဖိုင် - Programming applications အတွက်"
+                )
+        else:
+            response = """❌ JSON ပို့မှုမအောင်မြင်
 
 ဒေတာ မတွေ့ပါ။ အချိန်မှတ်သားပြီးမှ export လုပ်ပါ။"""
-                    await query.edit_message_text(response)
+            await query.edit_message_text(response)
 
-            elif callback_data == "export_with_analytics":
-                # Export with analytics data
-                # First create analytics summary
-                stats = self.analytics.generate_summary_stats(user_id, 30)
-                chart_data = self.analytics.generate_bar_chart_data(user_id, 14)
+    async def _on_export_with_analytics(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Export with analytics data."""
+        # First create analytics summary
+        stats = await self.analytics.generate_summary_stats(user_id, 30)
+        chart_data = await self.analytics.generate_bar_chart_data(user_id, 14)
 
-                # Create comprehensive report
-                report_content = f"""လစာတွက်ချက်စက်ရုံ - အစီရင်ခံစာ
+        # Create comprehensive report
+        report_content = f"""လစာတွက်ချက်စက်ရုံ - အစီရင်ခံစာ
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 📊 ခွဲခြမ်းစိတ်ဖြာမှု (နောက်ဆုံး ၃၀ ရက်):
@@ -1460,202 +1419,188 @@ class SalaryTelegramBot:
 
 📈 အလုပ်ချိန်ပုံစံ (နောက်ဆုံး ၁၄ ရက်):"""
 
-                if not chart_data.get('error'):
-                    for day_data in chart_data['chart_data']:
-                        report_content += f"\n{day_data['date']}: {day_data['hours']}နာရီ (¥{day_data['salary']:,.0f})"
+        if not chart_data.get('error'):
+            for day_data in chart_data['chart_data']:
+                report_content += f"\n{day_data['date']}: {day_data['hours']}နာရီ (¥{day_data['salary']:,.0f})"
 
-                # Export data with analytics
-                csv_data = self.export_manager.export_to_csv(user_id, 30)
+        # Export data with analytics
+        user_data = await self.storage.load_user_data(user_id)
 
-                if csv_data:
-                    filename = f"salary_analytics_report_{user_id}_{datetime.now().strftime('%Y%m%d')}.txt"
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write(report_content)
+        if user_data:
+            filename = f"salary_analytics_report_{user_id}_{datetime.now().strftime('%Y%m%d')}.txt"
+            report_file = io.BytesIO(report_content.encode('utf-8'))
 
-                    response = """📈 **ခွဲခြမ်းစိတ်ဖြာမှုပါ အစီရင်ခံစာ ပို့မှုအောင်မြင်သည်**
+            response = """📈 **ခွဲခြမ်းစိတ်ဖြာမှုပါ အစီရင်ခံစာ ပို့မှုအောင်မြင်သည်**
 
 ✅ လုံးဝစုံလင်သော ခွဲခြမ်းစိတ်ဖြာမှုပါ အစီရင်ခံစာကို ပို့ပြီးပါပြီ"""
 
-                    await query.edit_message_text(response, parse_mode='Markdown')
-
-                    # Send analytics report
-                    with open(filename, 'rb') as f:
-                        await context.bot.send_document(
-                            chat_id=query.message.chat_id,
-                            document=f,
-                            filename=filename,
-                            caption="📈 လစာခွဲခြမ်းစိတ်ဖြာမှု အစီရင်ခံစာ"
-                        )
+            await query.edit_message_text(response, parse_mode='Markdown')
 
-                    # Clean up file
-                    os.remove(filename)
-                else:
-                    response = "❌ အစီရင်ခံစာ ပြုလုပ်ရန် ဒေတာ မတွေ့ပါ"
-                    await query.edit_message_text(response, parse_mode='Markdown')
+            # Send analytics report
+            with report_file:
+                await context.bot.send_document(
+                    chat_id=query.message.chat_id,
+                    document=report_file,
+                    filename=filename,
+                    caption="📈 လစာခွဲခြမ်းစိတ်ဖြာမှု အစီရင်ခံစာ"
+                )
+        else:
+            response = "❌ အစီရင်ခံစာ ပြုလုပ်ရန် ဒေတာ မတွေ့ပါ"
+            await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "delete_old_month_direct":
-                # Direct delete old month data
-                success = self.storage.delete_old_data(user_id, 30)
+    async def _on_delete_old_month_direct(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Direct delete old month data."""
+        success = await self.storage.delete_old_data(user_id, 30)
 
-                if success:
-                    response = """🗓️ **တစ်လဟောင်းဒေတာ ဖျက်ပြီးပါပြီ**
+        if success:
+            response = """🗓️ **တစ်လဟောင်းဒေတာ ဖျက်ပြီးပါပြီ**
 
 ✅ ၃၀ ရက်ထက်ပိုဟောင်းသော ဒေတာများ ဖျက်ပြီး
 🔄 လက်ရှိလ ဒေတာများ ကျန်ရှိနေပါသည်"""
-                else:
-                    response = "❌ ဟောင်းဒေတာဖျက်ရာတွင် ပြဿနာရှိခဲ့သည်"
+        else:
+            response = "❌ ဟောင်းဒေတာဖျက်ရာတွင် ပြဿနာရှိခဲ့သည်"
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "delete_old_week_direct":
-                # Direct delete old week data
-                success = self.storage.delete_old_data(user_id, 7)
+    async def _on_delete_old_week_direct(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Direct delete old week data."""
+        success = await self.storage.delete_old_data(user_id, 7)
 
-                if success:
-                    response = """📅 **တစ်ပတ်ဟောင်းဒေတာ ဖျက်ပြီးပါပြီ**
+        if success:
+            response = """📅 **တစ်ပတ်ဟောင်းဒေတာ ဖျက်ပြီးပါပြီ**
 
 ✅ ၇ ရက်ထက်ပိုဟောင်းသော ဒေတာများ ဖျက်ပြီး
 🔄 ယခုပတ် ဒေတာများ ကျန်ရှိနေပါသည်"""
-                else:
-                    response = "❌ ဟောင်းဒေတာဖျက်ရာတွင် ပြဿနာရှိခဲ့သည်"
+        else:
+            response = "❌ ဟောင်းဒေတာဖျက်ရာတွင် ပြဿနာရှိခဲ့သည်"
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "delete_goals_direct":
-                # Direct delete goals
-                success = self.goal_tracker.delete_all_goals(user_id)
+    async def _on_delete_goals_direct(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Direct delete goals."""
+        success = await self.goal_tracker.delete_all_goals(user_id)
 
-                if success:
-                    response = """🎯 **ပန်းတိုင်များ ဖျက်ပြီးပါပြီ**
+        if success:
+            response = """🎯 **ပန်းတိုင်များ ဖျက်ပြီးပါပြီ**
 
 ✅ သတ်မှတ်ပန်းတိုင်များ အားလုံး ဖျက်ပြီး
 🔄 အလုပ်မှတ်တမ်းများ မပျက်ပါ"""
-                else:
-                    response = "❌ ပန်းတိုင်ဖျက်ရာတွင် ပြဿနာရှိခဲ့သည်"
+        else:
+            response = "❌ ပန်းတိုင်ဖျက်ရာတွင် ပြဿနာရှိခဲ့သည်"
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "delete_history_direct":
-                # Direct delete work history
-                success = self.storage.delete_work_history(user_id)
+    async def _on_delete_history_direct(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Direct delete work history."""
+        success = await self.storage.delete_work_history(user_id)
 
-                if success:
-                    response = """📋 **အလုပ်မှတ်တမ်း ဖျက်ပြီးပါပြီ**
+        if success:
+            response = """📋 **အလုပ်မှတ်တမ်း ဖျက်ပြီးပါပြီ**
 
 ✅ အလုပ်ချိန်မှတ်တမ်းများ အားလုံး ဖျက်ပြီး
 🔄 ပန်းတိုင်နှင့် ပွဲအစီအစဉ်များ မပျက်ပါ"""
-                else:
-                    response = "❌ မှတ်တမ်းဖျက်ရာတွင် ပြဿနာရှိခဲ့သည်"
+        else:
+            response = "❌ မှတ်တမ်းဖျက်ရာတွင် ပြဿနာရှိခဲ့သည်"
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "export_then_delete_direct":
-                # Show export then delete options
-                keyboard = [
-                    [
-                        InlineKeyboardButton("📊 CSV Export ပြီး ဖျက်မယ်", callback_data="csv_then_delete_final"),
-                        InlineKeyboardButton("📄 JSON Export ပြီး ဖျက်မယ်", callback_data="json_then_delete_final")
-                    ]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_export_then_delete_direct(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show export then delete options."""
+        keyboard = [
+            [
+                InlineKeyboardButton("📊 CSV Export ပြီး ဖျက်မယ်", callback_data="csv_then_delete_final"),
+                InlineKeyboardButton("📄 JSON Export ပြီး ဖျက်မယ်", callback_data="json_then_delete_final")
+            ]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                response = """📤🗑️ **Export ပြီးမှ ဖျက်မှု**
+        response = """📤🗑️ **Export ပြီးမှ ဖျက်မှု**
 
 🔒 လုံခြုံသောနည်းလမ်း: ဒေတာများကို အရင် backup လုပ်ပြီးမှ ဖျက်ပါ
 
 မည်သည့်ပုံစံဖြင့် Export လုပ်လိုပါသလဲ?"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "csv_then_delete_final":
-                # Export CSV then delete all
-                csv_data = self.export_manager.export_to_csv(user_id, 365)  # Get all data
+    async def _on_csv_then_delete_final(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Export CSV then delete all."""
+        csv_file = await self.export_manager.open_export(user_id, 'csv', None)  # Get all data
 
-                if csv_data:
-                    filename = f"backup_before_delete_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write(csv_data)
+        if csv_file:
+            filename = f"backup_before_delete_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
 
-                    # Send backup file first
-                    with open(filename, 'rb') as f:
-                        await context.bot.send_document(
-                            chat_id=query.message.chat_id,
-                            document=f,
-                            filename=filename,
-                            caption="💾 ဒေတာ backup ဖိုင် - ဖျက်ခြင်းမတိုင်မီ သိမ်းထားပါ"
-                        )
+            # Send backup file first
+            with csv_file:
+                await context.bot.send_document(
+                    chat_id=query.message.chat_id,
+                    document=csv_file,
+                    filename=filename,
+                    caption="💾 ဒေတာ backup ဖိုင် - ဖျက်ခြင်းမတိုင်မီ သိမ်းထားပါ"
+                )
 
-                    # Now delete all data
-                    delete_success = self.storage.delete_user_data(user_id)
+            # Now delete all data
+            delete_success = await self.storage.delete_user_data(user_id)
 
-                    if delete_success:
-                        response = """📊💥 **CSV Export ပြီး အားလုံးဖျက်မှု အောင်မြင်သည်**
+            if delete_success:
+                response = """📊💥 **CSV Export ပြီး အားလုံးဖျက်မှု အောင်မြင်သည်**
 
 ✅ ဒေတာများကို CSV backup လုပ်ပြီး အားလုံးဖျက်ပြီးပါပြီ
 💾 Backup ဖိုင်ကို သိမ်းထားပါ
 🔄 စနစ်သည် စတင်အခြေအနေသို့ ပြန်သွားပါပြီ"""
-                    else:
-                        response = """❌ Export အောင်မြင်သော်လည်း ဖျက်မှုမအောင်မြင်
+            else:
+                response = """❌ Export အောင်မြင်သော်လည်း ဖျက်မှုမအောင်မြင်
 
 💾 သင့်ဒေတာများ backup လုပ်ပြီးပါပြီ"""
+        else:
+            response = "❌ Export လုပ်ရန် ဒေတာ မတွေ့ပါ"
 
-                    # Clean up backup file
-                    os.remove(filename)
-                else:
-                    response = "❌ Export လုပ်ရန် ဒေတာ မတွေ့ပါ"
-
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "json_then_delete_final":
-                # Export JSON then delete all
-                json_data = self.export_manager.export_to_json(user_id, 365)  # Get all data
+    async def _on_json_then_delete_final(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Export JSON then delete all."""
+        json_file = await self.export_manager.open_export(user_id, 'json', None)  # Get all data
 
-                if json_data:
-                    filename = f"backup_before_delete_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write(json_data)
+        if json_file:
+            filename = f"backup_before_delete_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
 
-                    # Send backup file first
-                    with open(filename, 'rb') as f:
-                        await context.bot.send_document(
-                            chat_id=query.message.chat_id,
-                            document=f,
-                            filename=filename,
-                            caption="💾 ဒေတာ backup ဖိုင် - ဖျက်ခြင်းမတိုင်မီ သိမ်းထားပါ"
-                        )
+            # Send backup file first
+            with json_file:
+                await context.bot.send_document(
+                    chat_id=query.message.chat_id,
+                    document=json_file,
+                    filename=filename,
+                    caption="💾 ဒေတာ backup ဖိုင် - ဖျက်ခြင်းမတိုင်မီ သိမ်းထားပါ"
+                )
 
-                    # Now delete all data
-                    delete_success = self.storage.delete_user_data(user_id)
+            # Now delete all data
+            delete_success = await self.storage.delete_user_data(user_id)
 
-                    if delete_success:
-                        response = """📄💥 **JSON Export ပြီး အားလုံးဖျက်မှု အောင်မြင်သည်**
+            if delete_success:
+                response = """📄💥 **JSON Export ပြီး အားလုံးဖျက်မှု အောင်မြင်သည်**
 
 ✅ ဒေတာများကို JSON backup လုပ်ပြီး အားလုံးဖျက်ပြီးပါပြီ
 💾 Backup ဖိုင်ကို သိမ်းထားပါ
 🔄 စနစ်သည် စတင်အခြေအနေသို့ ပြန်သွားပါပြီ"""
-                    else:
-                        response = """❌ Export အောင်မြင်သော်လည်း ဖျက်မှုမအောင်မြင်
+            else:
+                response = """❌ Export အောင်မြင်သော်လည်း ဖျက်မှုမအောင်မြင်
 
 💾 သင့်ဒေတာများ backup လုပ်ပြီးပါပြီ"""
+        else:
+            response = "❌ Export လုပ်ရန် ဒေတာ မတွေ့ပါ"
 
-                    # Clean up backup file
-                    os.remove(filename)
-                else:
-                    response = "❌ Export လုပ်ရန် ဒေတာ မတွေ့ပါ"
-
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "delete_all_confirm_direct":
-                # Show final confirmation for deleting all data
-                keyboard = [
-                    [
-                        InlineKeyboardButton("💥 ဟုတ်ကဲ့ အားလုံးဖျက်မယ်", callback_data="delete_all_final_direct"),
-                        InlineKeyboardButton("❌ မဖျက်တော့ပါ", callback_data="cancel_delete")
-                    ]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_delete_all_confirm_direct(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show final confirmation for deleting all data."""
+        keyboard = [
+            [
+                InlineKeyboardButton("💥 ဟုတ်ကဲ့ အားလုံးဖျက်မယ်", callback_data="delete_all_final_direct"),
+                InlineKeyboardButton("❌ မဖျက်တော့ပါ", callback_data="cancel_delete")
+            ]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                response = """💥 **နောက်ဆုံးအတည်ပြုချက်**
+        response = """💥 **နောက်ဆုံးအတည်ပြုချက်**
 
 ⚠️ **အန္တရာယ်ကြီးမားသော လုပ်ဆောင်ချက်** ⚠️
 
@@ -1669,58 +1614,59 @@ class SalaryTelegramBot:
 
 သေချာပါသလား?"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "delete_all_final_direct":
-                # Final delete all user data
-                success = self.storage.delete_user_data(user_id)
+    async def _on_delete_all_final_direct(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Final delete all user data."""
+        success = await self.storage.delete_user_data(user_id)
 
-                if success:
-                    response = """🗑️ **အားလုံးဖျက်မှု အောင်မြင်သည်**
+        if success:
+            response = """🗑️ **အားလုံးဖျက်မှု အောင်မြင်သည်**
 
 ✅ သင့်ဒေတာအားလုံး ဖျက်ပြီးပါပြီ
 🔄 စနစ်အခြေအနေ: စတင်အခြေအနေသို့ ပြန်သွားပါပြီ
 📱 အချိန်ထည့်ပြီး စတင်နိုင်ပါပြီ
 
 💪 **စတင်လိုက်ပါ!** အလုပ်ချိန်ပထမဆုံး ထည့်ကြည့်ပါ"""
-                else:
-                    response = """❌ **အားလုံးဖျက်မှု မအောင်မြင်**
+        else:
+            response = """❌ **အားလုံးဖျက်မှု မအောင်မြင်**
 
 🔴 ဒေတာဖျက်ရာတွင် စနစ်ပြဿနာရှိခဲ့သည်
 🔄 ထပ်မံကြိုးစားပါ သို့မဟုတ် Bot restart လုပ်ပါ"""
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "cancel_delete":
-                response = """❌ **ဖျက်မှုကို ပယ်ဖျက်သည်**
+    async def _on_cancel_delete(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Cancel data deletion."""
+        response = """❌ **ဖျက်မှုကို ပယ်ဖျက်သည်**
 
 ✅ သင့်ဒေတာများ လုံခြုံပါသည်
 🔄 မည်သည့်အရာမှ ပြောင်းလဲခြင်း မရှိပါ"""
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "select_day_shift":
-                # Show day shift end time options
-                keyboard = [
-                    [
-                        InlineKeyboardButton("🕐 13:00 (6နာရီ 40မိနစ်)", callback_data="day_shift_13:00"),
-                        InlineKeyboardButton("🕑 14:00 (7နာရီ 40မိနစ်)", callback_data="day_shift_14:00")
-                    ],
-                    [
-                        InlineKeyboardButton("🕒 15:00 (8နာရီ 40မိနစ်)", callback_data="day_shift_15:00"),
-                        InlineKeyboardButton("🕓 16:00 (9နာရီ 40မိနစ်)", callback_data="day_shift_16:00")
-                    ],
-                    [
-                        InlineKeyboardButton("🕔 17:00 (10နာရီ 40မိနစ်)", callback_data="day_shift_17:00"),
-                        InlineKeyboardButton("🕕 18:00 (11နာရီ 40မိနစ်)", callback_data="day_shift_18:00")
-                    ],
-                    [
-                        InlineKeyboardButton("⌨️ အချိန်ကိုယ်တိုင်ရေး", callback_data="day_shift_manual")
-                    ]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_select_day_shift(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show day shift end time options."""
+        keyboard = [
+            [
+                InlineKeyboardButton("🕐 13:00 (6နာရီ 40မိနစ်)", callback_data="day_shift_13:00"),
+                InlineKeyboardButton("🕑 14:00 (7နာရီ 40မိနစ်)", callback_data="day_shift_14:00")
+            ],
+            [
+                InlineKeyboardButton("🕒 15:00 (8နာရီ 40မိနစ်)", callback_data="day_shift_15:00"),
+                InlineKeyboardButton("🕓 16:00 (9နာရီ 40မိနစ်)", callback_data="day_shift_16:00")
+            ],
+            [
+                InlineKeyboardButton("🕔 17:00 (10နာရီ 40မိနစ်)", callback_data="day_shift_17:00"),
+                InlineKeyboardButton("🕕 18:00 (11နာရီ 40မိနစ်)", callback_data="day_shift_18:00")
+            ],
+            [
+                InlineKeyboardButton("⌨️ အချိန်ကိုယ်တိုင်ရေး", callback_data="day_shift_manual")
+            ]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                response = """🌅 **Day Shift - အပြီးချိန်ရွေးချယ်ပါ**
+        response = """🌅 **Day Shift - အပြီးချိန်ရွေးချယ်ပါ**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1733,34 +1679,34 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data == "select_night_shift":
-                # Show night shift end time options
-                keyboard = [
-                    [
-                        InlineKeyboardButton("🕐 01:00 (8နာရီ 25မိနစ်)", callback_data="night_shift_01:00"),
-                        InlineKeyboardButton("🕑 02:00 (9နာရီ 25မိနစ်)", callback_data="night_shift_02:00")
-                    ],
-                    [
-                        InlineKeyboardButton("🕒 03:00 (10နာရီ 25မိနစ်)", callback_data="night_shift_03:00"),
-                        InlineKeyboardButton("🕓 04:00 (11နာရီ 25မိနစ်)", callback_data="night_shift_04:00")
-                    ],
-                    [
-                        InlineKeyboardButton("🕔 05:00 (12နာရီ 25မိနစ်)", callback_data="night_shift_05:00"),
-                        InlineKeyboardButton("🕕 06:00 (13နာရီ 25မိနစ်)", callback_data="night_shift_06:00")
-                    ],
-                    [
-                        InlineKeyboardButton("🕖 07:00 (14နာရီ 25မိနစ်)", callback_data="night_shift_07:00"),
-                        InlineKeyboardButton("🕗 08:00 (15နာရီ 25မိနစ်)", callback_data="night_shift_08:00")
-                    ],
-                    [
-                        InlineKeyboardButton("⌨️ အချိန်ကိုယ်တိုင်ရေး", callback_data="night_shift_manual")
-                    ]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    async def _on_select_night_shift(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show night shift end time options."""
+        keyboard = [
+            [
+                InlineKeyboardButton("🕐 01:00 (8နာရီ 25မိနစ်)", callback_data="night_shift_01:00"),
+                InlineKeyboardButton("🕑 02:00 (9နာရီ 25မိနစ်)", callback_data="night_shift_02:00")
+            ],
+            [
+                InlineKeyboardButton("🕒 03:00 (10နာရီ 25မိနစ်)", callback_data="night_shift_03:00"),
+                InlineKeyboardButton("🕓 04:00 (11နာရီ 25မိနစ်)", callback_data="night_shift_04:00")
+            ],
+            [
+                InlineKeyboardButton("🕔 05:00 (12နာရီ 25မိနစ်)", callback_data="night_shift_05:00"),
+                InlineKeyboardButton("🕕 06:00 (13နာရီ 25မိနစ်)", callback_data="night_shift_06:00")
+            ],
+            [
+                InlineKeyboardButton("🕖 07:00 (14နာရီ 25မိနစ်)", callback_data="night_shift_07:00"),
+                InlineKeyboardButton("🕗 08:00 (15နာရီ 25မိနစ်)", callback_data="night_shift_08:00")
+            ],
+            [
+                InlineKeyboardButton("⌨️ အချိန်ကိုယ်တိုင်ရေး", callback_data="night_shift_manual")
+            ]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-                response = """🌙 **Night Shift - အပြီးချိန်ရွေးချယ်ပါ**
+        response = """🌙 **Night Shift - အပြီးချိန်ရွေးချယ်ပါ**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1774,24 +1720,24 @@ class SalaryTelegramBot:
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-                await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
+        await query.edit_message_text(response, parse_mode='Markdown', reply_markup=reply_markup)
 
-            elif callback_data.startswith("day_shift_") and callback_data != "day_shift_manual":
-                # Handle day shift time selection
-                end_time = callback_data.replace("day_shift_", "")
-                await self.handle_shift_calculation(query, context, "06:20", end_time, "Day Shift")
+    async def _on_day_shift_time(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Handle day shift time selection."""
+        end_time = callback_data.replace("day_shift_", "")
+        await self.handle_shift_calculation(query, context, "06:20", end_time, "Day Shift")
 
-            elif callback_data.startswith("night_shift_") and callback_data != "night_shift_manual":
-                # Handle night shift time selection
-                end_time = callback_data.replace("night_shift_", "")
-                await self.handle_shift_calculation(query, context, "16:35", end_time, "Night Shift")
+    async def _on_night_shift_time(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Handle night shift time selection."""
+        end_time = callback_data.replace("night_shift_", "")
+        await self.handle_shift_calculation(query, context, "16:35", end_time, "Night Shift")
 
-            elif callback_data in ["day_shift_manual", "night_shift_manual"]:
-                # Show manual input for specific shift
-                shift_type = "Day" if callback_data == "day_shift_manual" else "Night"
-                start_time = "06:20" if shift_type == "Day" else "16:35"
+    async def _on_shift_manual(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show manual input for specific shift."""
+        shift_type = "Day" if callback_data == "day_shift_manual" else "Night"
+        start_time = "06:20" if shift_type == "Day" else "16:35"
 
-                response = f"""⌨️ **{shift_type} Shift - အပြီးချိန်ကိုယ်တိုင်ရေး**
+        response = f"""⌨️ **{shift_type} Shift - အပြီးချိန်ကိုယ်တိုင်ရေး**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1809,15 +1755,15 @@ class SalaryTelegramBot:
 
 💬 **ယခု keyboard ကိုအသုံးပြု၍ ရေးထည့်ပါ**"""
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data.startswith("preset_"):
-                # Handle preset time buttons
-                await self.handle_preset_time(query, context, callback_data)
+    async def _on_preset(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Handle preset time buttons."""
+        await self.handle_preset_time(query, context, callback_data)
 
-            elif callback_data == "manual_time_input":
-                # Show manual input instructions
-                response = """⌨️ **အချိန်ကိုယ်တိုင်ရေးထည့်ခြင်း**
+    async def _on_manual_time_input(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Show manual input instructions."""
+        response = """⌨️ **အချိန်ကိုယ်တိုင်ရေးထည့်ခြင်း**
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -1839,17 +1785,13 @@ class SalaryTelegramBot:
 
 💬 **ယခု စာရေးရန်** keyboard ကို အသုံးပြု၍ သင့်အချိန်ကို ရေးထည့်ပါ"""
 
-                await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
-            elif callback_data == "back_to_main":
-                # Go back to main menu
-                response = "🏠 **ပင်မစာမျက်နှာ**\n\nအချိန်ပေးပို့ပြီး လစာတွက်ချက်ပါ (ဥပမာ: 08:30 ~ 17:30 သို့မဟုတ် Set 08:30 AM To 05:30 PM)"
+    async def _on_back_to_main(self, query, context: ContextTypes.DEFAULT_TYPE, user_id: str, callback_data: str) -> None:
+        """Go back to main menu."""
+        response = "🏠 **ပင်မစာမျက်နှာ**\n\nအချိန်ပေးပို့ပြီး လစာတွက်ချက်ပါ (ဥပမာ: 08:30 ~ 17:30 သို့မဟုတ် Set 08:30 AM To 05:30 PM)"
 
-                await query.edit_message_text(response, parse_mode='Markdown')
-
-        except Exception as e:
-            logger.error(f"Error handling button callback: {e}")
-            await query.edit_message_text("❌ **စနစ်အမှားရှိသည်**\n\nကျေးဇူးပြု၍ ထပ်မံကြိုးစားပါ။", parse_mode='Markdown')
+        await query.edit_message_text(response, parse_mode='Markdown')
 
     async def handle_calendar_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_input: str) -> None:
         """Handle calendar event commands."""
@@ -1875,7 +1817,7 @@ class SalaryTelegramBot:
             # Validate date format
             try:
                 datetime.strptime(event_date, "%Y-%m-%d")
-                result = self.calendar_manager.add_user_event(user_id, event_date, "custom", description)
+                result = await self.calendar_manager.add_user_event(user_id, event_date, "custom", description)
 
                 if result.get('error'):
                     response = f"❌ **အမှားရှိသည်**\n\n{result['error']}"
@@ -1920,7 +1862,7 @@ class SalaryTelegramBot:
                 await update.message.reply_text(response, parse_mode='Markdown', reply_markup=keyboard)
                 return
 
-            result = self.calendar_manager.set_salary_payment_day(day)
+            result = await self.calendar_manager.set_salary_payment_day(day)
 
             if result.get('error'):
                 response = f"❌ **အမှားရှိသည်**\n\n{result['error']}"
@@ -1954,7 +1896,7 @@ class SalaryTelegramBot:
 
             try:
                 target_salary = float(parts[1])
-                result = self.goal_tracker.set_monthly_goal(user_id, 'salary', target_salary)
+                result = await self.goal_tracker.set_monthly_goal(user_id, 'salary', target_salary)
 
                 if result.get('error'):
                     response = f"❌ **အမှားရှိသည်**\n\n{result['error']}"
@@ -1992,7 +1934,7 @@ class SalaryTelegramBot:
 
             try:
                 target_hours = float(parts[1])
-                result = self.goal_tracker.set_monthly_goal(user_id, 'hours', target_hours)
+                result = await self.goal_tracker.set_monthly_goal(user_id, 'hours', target_hours)
 
                 if result.get('error'):
                     response = f"❌ **အမှားရှိသည်**\n\n{result['error']}"
@@ -2040,7 +1982,7 @@ class SalaryTelegramBot:
                 return
 
             # Save calculation data
-            calculation_saved = self.storage.save_calculation(user_id, result)
+            calculation_saved = await self.storage.save_calculation(user_id, result)
 
             # Format response in Burmese
             response = self.formatter.format_salary_response(result)
@@ -2075,7 +2017,7 @@ class SalaryTelegramBot:
                 return
 
             # Save calculation data
-            calculation_saved = self.storage.save_calculation(user_id, result)
+            calculation_saved = await self.storage.save_calculation(user_id, result)
 
             # Format response in Burmese
             formatted_response = self.formatter.format_salary_response(result)
@@ -2146,6 +2088,7 @@ class SalaryTelegramBot:
         except (ValueError, IndexError):
             return None
 
+    @metrics.timed("message.text_command")
     async def handle_text_commands(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_input: str) -> None:
         """Handle text-based commands like CSV export, delete, etc."""
         user_id = str(update.effective_user.id)
@@ -2153,55 +2096,41 @@ class SalaryTelegramBot:
 
         try:
             if user_input == "CSV ပို့မယ်":
-                csv_data = self.export_manager.export_to_csv(user_id, 30)
-                if csv_data and csv_data.strip():
+                csv_file = await self.export_manager.open_export(user_id, 'csv', 30, encoding='utf-8-sig')
+                if csv_file:
                     filename = f"salary_data_{user_id}_{datetime.now().strftime('%Y%m%d')}.csv"
-                    with open(filename, 'w', encoding='utf-8-sig') as f:
-                        f.write(csv_data)
 
                     await update.message.reply_text("📊 CSV ဖိုင်ပြုလုပ်ပြီးပါပြီ", reply_markup=keyboard)
 
-                    with open(filename, 'rb') as f:
+                    with csv_file:
                         await context.bot.send_document(
                             chat_id=update.message.chat_id,
-                            document=f,
+                            document=csv_file,
                             filename=filename,
                             caption="📊 လစာဒေတာ CSV ဖိုင်"
                         )
-
-                    try:
-                        os.remove(filename)
-                    except:
-                        pass
                 else:
                     await update.message.reply_text("❌ ပို့ရန်ဒေတာမရှိပါ", parse_mode='Markdown', reply_markup=keyboard)
 
             elif user_input == "JSON ပို့မယ်":
-                json_data = self.export_manager.export_to_json(user_id, 30)
-                if json_data and json_data.strip():
+                json_file = await self.export_manager.open_export(user_id, 'json', 30)
+                if json_file:
                     filename = f"salary_data_{user_id}_{datetime.now().strftime('%Y%m%d')}.json"
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        f.write(json_data)
 
                     await update.message.reply_text("📄 JSON ဖိုင်ပြုလုပ်ပြီးပါပြီ", reply_markup=keyboard)
 
-                    with open(filename, 'rb') as f:
+                    with json_file:
                         await context.bot.send_document(
                             chat_id=update.message.chat_id,
-                            document=f,
+                            document=json_file,
                             filename=filename,
                             caption="📄 လစာဒေတာ JSON ဖိုင်"
                         )
-
-                    try:
-                        os.remove(filename)
-                    except:
-                        pass
                 else:
                     await update.message.reply_text("❌ ပို့ရန်ဒေတာမရှိပါ", parse_mode='Markdown', reply_markup=keyboard)
 
             elif user_input == "အားလုံးဖျက်မယ်":
-                success = self.storage.delete_user_data(user_id)
+                success = await self.storage.delete_user_data(user_id)
                 if success:
                     response = "✅ **အားလုံးဖျက်ပြီးပါပြီ**\n\nသင့်ဒေတာအားလုံး ဖျက်လိုက်ပါပြီ။"
                 else:
@@ -2227,6 +2156,9 @@ def main():
         logger.error("TELEGRAM_BOT_TOKEN environment variable is not set")
         return
 
+    # Serve or dump handler metrics when METRICS_PORT / METRICS_FILE are set
+    start_exporters()
+
     # Create and run bot
     bot = SalaryTelegramBot(bot_token)
     bot.run()
@@ -0,0 +1,44 @@
+"""Message templates compiled once, so rendering only formats the slots."""
+
+from string import Formatter
+from typing import Dict, Tuple
+
+
+class MessageTemplate:
+    """A ``str.format`` style template with named slots, e.g. ``"¥{salary:,.0f}"``.
+
+    The template is parsed when it is created: the static text between slots
+    is kept as ready-made strings and each slot keeps its format spec, so a
+    render formats the slot values and joins them with the prebuilt text.
+    """
+
+    __slots__ = ('source', 'fields', '_parts', '_tail')
+
+    def __init__(self, source: str):
+        self.source = source
+        parts = []
+        text = ''
+        for literal, field, spec, conversion in Formatter().parse(source):
+            # Escaped braces split the static text into several pieces
+            text += literal
+            if field is None:
+                continue
+            if not field.isidentifier() or conversion:
+                raise ValueError(f"Template slots must be plain names: {{{field}}}")
+            parts.append((text, field, spec or ''))
+            text = ''
+        self._parts: Tuple[Tuple[str, str, str], ...] = tuple(parts)
+        self._tail = text
+        self.fields = tuple(dict.fromkeys(field for _, field, _ in parts))
+
+    def render(self, **values) -> str:
+        """Fill every slot from values (a missing slot raises KeyError)."""
+        return self.render_map(values)
+
+    def render_map(self, values: Dict) -> str:
+        chunks = []
+        for literal, field, spec in self._parts:
+            chunks.append(literal)
+            chunks.append(format(values[field], spec))
+        chunks.append(self._tail)
+        return ''.join(chunks)
@@ -0,0 +1,272 @@
+"""Lightweight in-process timing and byte counters for handlers, managers and storage.
+
+Every operation gets a call count and byte totals; a sampled subset of calls
+(METRICS_SAMPLE_RATE, default 0.1) is timed into a fixed-size reservoir from
+which p50/p95/p99 are computed. Results are exposed as text or Prometheus
+exposition format, optionally served over HTTP (METRICS_PORT) or dumped to a
+file (METRICS_FILE, every METRICS_DUMP_INTERVAL seconds).
+"""
+
+import contextvars
+import functools
+import inspect
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+RESERVOIR_SIZE = 1024
+
+# Operations beyond this many distinct names are counted under OVERFLOW_NAME
+MAX_OPERATIONS = 512
+OVERFLOW_NAME = "other"
+
+# Names of the spans enclosing the current code; bytes are charged to each of them
+_active_spans: contextvars.ContextVar = contextvars.ContextVar("active_spans", default=())
+
+
+class OperationStats:
+    """Counters and a latency reservoir for one operation."""
+
+    __slots__ = ('count', 'errors', 'sampled', 'total_seconds', 'bytes_read', 'bytes_written', 'reservoir')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.sampled = 0
+        self.total_seconds = 0.0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.reservoir: List[float] = []
+
+    def observe(self, seconds: float) -> None:
+        self.sampled += 1
+        self.total_seconds += seconds
+        if len(self.reservoir) < RESERVOIR_SIZE:
+            self.reservoir.append(seconds)
+        else:
+            # Reservoir sampling keeps a uniform sample of every timed call
+            slot = random.randrange(self.sampled)
+            if slot < RESERVOIR_SIZE:
+                self.reservoir[slot] = seconds
+
+    def percentiles(self) -> Dict[str, Optional[float]]:
+        ordered = sorted(self.reservoir)
+        if not ordered:
+            return {'p50': None, 'p95': None, 'p99': None}
+        return {f'p{p}': ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+                for p in (50, 95, 99)}
+
+
+class Metrics:
+    """Thread-safe registry of OperationStats keyed by operation name."""
+
+    def __init__(self, sample_rate: float = 0.1):
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._operations: Dict[str, OperationStats] = {}
+
+    def _stats(self, name: str) -> OperationStats:
+        """Caller holds the lock."""
+        stats = self._operations.get(name)
+        if stats is None:
+            if len(self._operations) >= MAX_OPERATIONS:
+                name = OVERFLOW_NAME
+                stats = self._operations.get(name)
+            if stats is None:
+                stats = self._operations[name] = OperationStats()
+        return stats
+
+    def record(self, name: str, seconds: Optional[float] = None, error: bool = False,
+               bytes_read: int = 0, bytes_written: int = 0) -> None:
+        """Count one call of name, with its duration when it was sampled."""
+        with self._lock:
+            stats = self._stats(name)
+            stats.count += 1
+            if error:
+                stats.errors += 1
+            if seconds is not None:
+                stats.observe(seconds)
+            stats.bytes_read += bytes_read
+            stats.bytes_written += bytes_written
+
+    def add_bytes(self, name: str, read: int = 0, written: int = 0) -> None:
+        """Add bytes read or written to name and to every enclosing span, without counting a call."""
+        if self.sample_rate <= 0:
+            return
+        with self._lock:
+            for operation in (name,) + _active_spans.get():
+                stats = self._stats(operation)
+                stats.bytes_read += read
+                stats.bytes_written += written
+
+    def span(self, name: str) -> '_Span':
+        """Context manager timing the enclosed block as one call of name (timed only when sampled)."""
+        return _Span(self, name)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator form of span for plain and async functions (name defaults to the qualified name)."""
+        def decorator(func):
+            label = name or func.__qualname__
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with _Span(self, label):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with _Span(self, label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Current values per operation; latencies in seconds."""
+        with self._lock:
+            operations = list(self._operations.items())
+            result = {}
+            for name, stats in operations:
+                result[name] = {
+                    'count': stats.count,
+                    'errors': stats.errors,
+                    'sampled': stats.sampled,
+                    'mean': stats.total_seconds / stats.sampled if stats.sampled else None,
+                    'bytes_read': stats.bytes_read,
+                    'bytes_written': stats.bytes_written,
+                    **stats.percentiles()
+                }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+    def render_text(self) -> str:
+        """Aligned table of every operation, slowest p95 first; times in milliseconds."""
+        rows = sorted(self.snapshot().items(), key=lambda item: -(item[1]['p95'] or 0))
+        lines = [f"{'operation':<40} {'count':>8} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+                 f"{'read B':>11} {'written B':>11}"]
+        for name, values in rows:
+            times = [f"{values[p] * 1000:9.2f}" if values[p] is not None else f"{'-':>9}"
+                     for p in ('p50', 'p95', 'p99')]
+            lines.append(f"{name:<40} {values['count']:>8} {values['errors']:>5} {' '.join(times)} "
+                         f"{values['bytes_read']:>11} {values['bytes_written']:>11}")
+        return "\n".join(lines) + "\n"
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        lines = [
+            "# HELP shiftpay_operation_calls_total Calls per operation.",
+            "# TYPE shiftpay_operation_calls_total counter",
+            "# HELP shiftpay_operation_errors_total Calls per operation that raised.",
+            "# TYPE shiftpay_operation_errors_total counter",
+            "# HELP shiftpay_operation_seconds Sampled latency per operation.",
+            "# TYPE shiftpay_operation_seconds summary",
+            "# HELP shiftpay_operation_bytes_total Bytes read or written per operation.",
+            "# TYPE shiftpay_operation_bytes_total counter",
+        ]
+        for name, values in sorted(self.snapshot().items()):
+            label = f'operation="{_escape(name)}"'
+            lines.append(f"shiftpay_operation_calls_total{{{label}}} {values['count']}")
+            lines.append(f"shiftpay_operation_errors_total{{{label}}} {values['errors']}")
+            for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99')):
+                if values[key] is not None:
+                    lines.append(f'shiftpay_operation_seconds{{{label},quantile="{quantile}"}} {values[key]:.6f}')
+            if values['sampled']:
+                lines.append(f"shiftpay_operation_seconds_sum{{{label}}} {values['mean'] * values['sampled']:.6f}")
+                lines.append(f"shiftpay_operation_seconds_count{{{label}}} {values['sampled']}")
+            for direction in ('read', 'written'):
+                lines.append(f'shiftpay_operation_bytes_total{{{label},direction="{direction}"}} '
+                             f"{values['bytes_' + direction]}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """Write the Prometheus (.prom) or text rendering to path, replacing it atomically."""
+        content = self.render_prometheus() if path.endswith('.prom') else self.render_text()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+class _Span:
+    """One timed call; a plain class rather than a generator keeps unsampled calls cheap."""
+
+    __slots__ = ('metrics', 'name', 'started', 'token')
+
+    def __init__(self, metrics: Metrics, name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        rate = self.metrics.sample_rate
+        if rate <= 0:
+            self.token = None
+            return self
+        self.started = time.perf_counter() if random.random() < rate else None
+        self.token = _active_spans.set(_active_spans.get() + (self.name,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.token is None:
+            return False
+        started = self.started
+        seconds = None if started is None else time.perf_counter() - started
+        _active_spans.reset(self.token)
+        self.metrics.record(self.name, seconds, error=exc_type is not None)
+        return False
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = Metrics(sample_rate=float(os.getenv("METRICS_SAMPLE_RATE", "0.1")))
+
+
+def start_exporters() -> None:
+    """Serve metrics on METRICS_PORT (/metrics is Prometheus, / is text) and/or dump them to METRICS_FILE."""
+    port = os.getenv("METRICS_PORT")
+    if port:
+        # Imported here: http.server is slow to import and only needed when serving
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics"):
+                    body, content_type = metrics.render_prometheus(), "text/plain; version=0.0.4"
+                else:
+                    body, content_type = metrics.render_text(), "text/plain; charset=utf-8"
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((os.getenv("METRICS_HOST", "127.0.0.1"), int(port)), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"Serving metrics on port {port}")
+
+    path = os.getenv("METRICS_FILE")
+    if path:
+        interval = float(os.getenv("METRICS_DUMP_INTERVAL", "60"))
+
+        def dump_forever():
+            while True:
+                time.sleep(interval)
+                try:
+                    metrics.dump(path)
+                except OSError as e:
+                    logger.error(f"Error writing metrics file: {e}")
+
+        threading.Thread(target=dump_forever, name="metrics-dump", daemon=True).start()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""One-shot migration of the JSON data files into the SQLite storage backend."""
+
+import argparse
+import json
+import os
+import logging
+from typing import Dict
+from storage_backends import SqliteBackend
+
+logger = logging.getLogger(__name__)
+
+
+def _load_json(path: str) -> Dict:
+    """Load a JSON file, treating a missing file as empty."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def migrate(db_file: str = "salary_data.db",
+            data_file: str = "salary_data.json",
+            goals_file: str = "goals.json",
+            notifications_file: str = "notifications.json",
+            calendar_file: str = "calendar_data.json",
+            force: bool = False) -> Dict:
+    """Copy all JSON data into the SQLite database and return record counts."""
+    backend = SqliteBackend(db_file)
+
+    if backend.list_users() and not force:
+        raise RuntimeError(f"{db_file} already contains calculations; use --force to migrate again")
+
+    salary_data = _load_json(data_file)
+    total_records = 0
+    for user_id, user_data in salary_data.items():
+        backend.save_user(user_id, user_data)
+        total_records += sum(len(entries) for entries in user_data.values())
+
+    documents = {
+        'goals': _load_json(goals_file),
+        'notifications': _load_json(notifications_file),
+        'calendar': _load_json(calendar_file)
+    }
+    for name, data in documents.items():
+        if data:
+            backend.save_document(name, data)
+
+    return {
+        'users': len(salary_data),
+        'calculations': total_records,
+        'goals': len(documents['goals']),
+        'notifications': len(documents['notifications']),
+        'calendar_users': len(documents['calendar'].get('users', {}))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate JSON data files into SQLite")
+    parser.add_argument("--db", default="salary_data.db")
+    parser.add_argument("--data-file", default="salary_data.json")
+    parser.add_argument("--goals-file", default="goals.json")
+    parser.add_argument("--notifications-file", default="notifications.json")
+    parser.add_argument("--calendar-file", default="calendar_data.json")
+    parser.add_argument("--force", action="store_true", help="replace data already in the database")
+    args = parser.parse_args()
+
+    counts = migrate(args.db, args.data_file, args.goals_file,
+                     args.notifications_file, args.calendar_file, args.force)
+    print(f"Migrated into {args.db}: " + ", ".join(f"{name}={count}" for name, count in counts.items()))
+    print("Start the bot with STORAGE_BACKEND=sqlite to use it.")
+
+
+if __name__ == "__main__":
+    main()
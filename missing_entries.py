@@ -0,0 +1,88 @@
+"""Missing-entry detection for every user in one pass, for the nightly nudges."""
+
+import time
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+import logging
+from data_storage import DataStorage
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class WorkedDaysWindow:
+    """The `days` days before `today` as bits of an int: bit i is the day `start` + i days.
+
+    A user's worked days become one bitmap (the same layout as
+    ``WorkedDays.bits_between(start, end)``), and their missing weekdays are
+    ``weekday_mask & ~worked``, so checking a user costs a few int operations.
+    """
+
+    def __init__(self, today: date, days: int = 7):
+        self.today = today
+        self.start, self.end = today - timedelta(days=days), today - timedelta(days=1)
+        self.days = [self.start + timedelta(days=offset) for offset in range(days)]
+        self.date_strings = [day.isoformat() for day in self.days]
+        self._bits = {date_str: 1 << bit for bit, date_str in enumerate(self.date_strings)}
+        self.yesterday_bit = 1 << (days - 1) if days else 0
+        # Weekends (Saturday=5, Sunday=6) are never counted as missing
+        self.weekday_mask = sum(1 << bit for bit, day in enumerate(self.days) if day.weekday() < 5)
+
+    def bitmap(self, worked_dates: Iterable[str]) -> int:
+        """Bitmap of the window days among worked_dates; other dates are ignored."""
+        worked = 0
+        bits = self._bits
+        for date_str in worked_dates:
+            worked |= bits.get(date_str, 0)
+        return worked
+
+    def missing(self, worked: int) -> int:
+        """Bitmap of weekdays in the window without entries."""
+        return self.weekday_mask & ~worked
+
+    def dates(self, bitmap: int) -> List[date]:
+        """The days set in bitmap, most recent first."""
+        return [day for bit, day in reversed(list(enumerate(self.days))) if bitmap >> bit & 1]
+
+
+class MissingEntryScanner:
+    """Find users who have not logged their shifts, streaming every user once."""
+
+    def __init__(self, storage: Optional[DataStorage] = None, days: int = 7):
+        self.storage = storage or DataStorage()
+        self.days = days
+
+    def scan(self, today: Optional[date] = None) -> Iterator[Tuple[str, int, int]]:
+        """Yield (user_id, worked bitmap, missing bitmap) for every user, with one shared window."""
+        window = WorkedDaysWindow(today or date.today(), self.days)
+        for user_id, worked_dates in self.storage.iter_worked_dates(window.start, window.end):
+            worked = window.bitmap(worked_dates)
+            yield user_id, worked, window.missing(worked)
+
+    def build_send_list(self, today: Optional[date] = None) -> List[Tuple[str, str]]:
+        """(user_id, message) for every user who worked in the window but has not logged yesterday.
+
+        Users with no entries in the whole window are left alone, as they are
+        probably not working at the moment. Nothing is sent for a weekend.
+        """
+        today = today or date.today()
+        yesterday_bit = WorkedDaysWindow(today, self.days).yesterday_bit
+        yesterday = (today - timedelta(days=1)).isoformat()
+        send_list = []
+        started = time.perf_counter()
+        scanned = 0
+        for user_id, worked, missing in self.scan(today):
+            scanned += 1
+            if worked and missing & yesterday_bit:
+                send_list.append((user_id, self.format_nudge(yesterday, bin(missing).count('1'))))
+        seconds = time.perf_counter() - started
+        metrics.record("missing_entries.scan", seconds)
+        logger.info(f"Scanned {scanned} users for missing entries in {seconds:.2f}s; {len(send_list)} to nudge")
+        return send_list
+
+    def format_nudge(self, date_str: str, total_missing: int) -> str:
+        """Nudge text for a user who has not logged date_str."""
+        message = f"📝 {date_str} ရက်အတွက် အလုပ်ချိန် မှတ်တမ်း မထည့်ရသေးပါ။"
+        if total_missing > 1:
+            message += f"\nလွန်ခဲ့သော {self.days} ရက်အတွင်း မှတ်တမ်းမရှိသော ရက် {total_missing} ရက် ရှိပါသည်။"
+        return message
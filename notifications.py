@@ -4,17 +4,22 @@ import json
 from datetime import datetime, timedelta, time
 from typing import Dict, List, Optional
 from data_storage import DataStorage
+from reminder_scheduler import ReminderScheduler
+from missing_entries import WorkedDaysWindow
 
 
 class NotificationManager:
     """Handle notification and reminder functionality."""
     
-    def __init__(self):
-        self.storage = DataStorage()
+    def __init__(self, storage: Optional[DataStorage] = None):
+        self.storage = storage or DataStorage()
         self.notifications_file = "notifications.json"
+        self._scheduler: Optional[ReminderScheduler] = None
     
     def ensure_notifications_file(self):
         """Ensure notifications file exists."""
+        if self.storage.backend.supports_documents:
+            return
         try:
             with open(self.notifications_file, 'r', encoding='utf-8') as f:
                 pass
@@ -26,6 +31,8 @@ class NotificationManager:
         """Load notification settings."""
         self.ensure_notifications_file()
         try:
+            if self.storage.backend.supports_documents:
+                return self.storage.backend.load_document('notifications')
             with open(self.notifications_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except:
@@ -34,12 +41,23 @@ class NotificationManager:
     def save_notifications(self, notifications: Dict) -> bool:
         """Save notification settings."""
         try:
+            if self.storage.backend.supports_documents:
+                self.storage.backend.save_document('notifications', notifications)
+                return True
             with open(self.notifications_file, 'w', encoding='utf-8') as f:
                 json.dump(notifications, f, indent=2, ensure_ascii=False)
             return True
         except:
             return False
     
+    def get_scheduler(self) -> ReminderScheduler:
+        """Get the scheduler delivering this manager's reminders, loading enabled ones on first use."""
+        if self._scheduler is None:
+            scheduler = ReminderScheduler()
+            scheduler.load(self.load_notifications())
+            self._scheduler = scheduler
+        return self._scheduler
+    
     def set_work_reminder(self, user_id: str, reminder_time: str, message: str = None) -> Dict:
         """Set daily work reminder."""
         try:
@@ -61,6 +79,8 @@ class NotificationManager:
             success = self.save_notifications(notifications)
             
             if success:
+                if self._scheduler is not None:
+                    self._scheduler.schedule(user_id, reminder_time, notifications[user_id]['work_reminder']['message'])
                 return {
                     'success': True,
                     'message': f'နေ့စဉ် {reminder_time} တွင် အလုပ်ချိန်သတိပေးချက် သတ်မှတ်ပြီးပါပြီ။'
@@ -95,6 +115,8 @@ class NotificationManager:
             success = self.save_notifications(notifications)
             
             if success:
+                if self._scheduler is not None and reminder_type == 'work_reminder':
+                    self._scheduler.cancel(user_id)
                 return {'success': True, 'message': 'သတိပေးချက် ပိတ်ပြီးပါပြီ။'}
             else:
                 return {'error': 'သတိပေးချက် ပိတ်ရာတွင် အမှားရှိသည်။'}
@@ -105,29 +127,19 @@ class NotificationManager:
     def check_missing_entries(self, user_id: str, days: int = 7) -> Dict:
         """Check for missing work entries in recent days."""
         try:
-            user_data = self.storage.load_user_data(user_id)
+            worked_days = self.storage.get_worked_days(user_id)
             
-            if not user_data:
+            if not worked_days:
                 return {'missing_days': [], 'total_missing': 0}
             
-            # Check last N days
-            missing_days = []
-            today = datetime.now().date()
-            
-            for i in range(1, days + 1):
-                check_date = today - timedelta(days=i)
-                date_str = check_date.isoformat()
-                
-                # Skip weekends (assuming Saturday=5, Sunday=6)
-                if check_date.weekday() >= 5:
-                    continue
-                
-                if date_str not in user_data or not user_data[date_str]:
-                    missing_days.append({
-                        'date': date_str,
-                        'day_name': check_date.strftime('%A'),
-                        'burmese_day': self._get_burmese_day(check_date.weekday())
-                    })
+            # Weekdays of the last N days without entries, most recent first
+            window = WorkedDaysWindow(datetime.now().date(), days)
+            missing = window.missing(worked_days.bits_between(window.start, window.end))
+            missing_days = [{
+                'date': check_date.isoformat(),
+                'day_name': check_date.strftime('%A'),
+                'burmese_day': self._get_burmese_day(check_date.weekday())
+            } for check_date in window.dates(missing)]
             
             return {
                 'missing_days': missing_days,
@@ -145,23 +157,18 @@ class NotificationManager:
     def generate_work_summary_alert(self, user_id: str) -> Dict:
         """Generate work summary alert for low performance."""
         try:
-            # Get last 7 days data
-            data = self.storage.get_date_range_data(user_id, 7)
+            # Last 7 days, today included
+            today = datetime.now().date()
+            week_start = today - timedelta(days=6)
+            total_days = self.storage.get_worked_days(user_id).count(week_start, today)
             
-            if not data or not data.get('calculations'):
+            if not total_days:
                 return {'alert': False, 'message': 'ဒေတာ မတွေ့ပါ။'}
             
-            # Calculate weekly totals
-            calculations = data.get('calculations', {})
-            total_days = len(calculations)
-            total_salary = 0
-            total_hours = 0
-            
-            for date_calculations in calculations.values():
-                if isinstance(date_calculations, list):
-                    for calc in date_calculations:
-                        total_salary += calc['total_salary']
-                        total_hours += calc['total_minutes'] / 60
+            # Weekly totals from the pre-aggregated rollups
+            week_totals = self.storage.get_rollups(user_id).range(week_start, today)
+            total_salary = week_totals.total_salary
+            total_hours = week_totals.total_minutes / 60
             
             # Check if performance is low
             avg_daily_hours = total_hours / 7 if total_days > 0 else 0
@@ -200,66 +207,6 @@ class NotificationManager:
     def get_streak_info(self, user_id: str) -> Dict:
         """Get work streak information."""
         try:
-            user_data = self.storage.load_user_data(user_id)
-            
-            if not user_data:
-                return {'current_streak': 0, 'longest_streak': 0, 'last_work_date': None}
-            
-            # Sort dates
-            sorted_dates = sorted(user_data.keys(), reverse=True)
-            
-            current_streak = 0
-            longest_streak = 0
-            temp_streak = 0
-            last_work_date = None
-            
-            if sorted_dates:
-                last_work_date = sorted_dates[0]
-            
-            # Calculate current streak
-            today = datetime.now().date()
-            current_date = today
-            
-            for i, date_str in enumerate(sorted_dates):
-                work_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                
-                # Check if this is consecutive
-                if i == 0:
-                    if work_date == today or work_date == today - timedelta(days=1):
-                        current_streak = 1
-                        temp_streak = 1
-                    else:
-                        current_streak = 0
-                        break
-                else:
-                    prev_date = datetime.strptime(sorted_dates[i-1], '%Y-%m-%d').date()
-                    
-                    if (prev_date - work_date).days == 1:
-                        current_streak += 1
-                        temp_streak += 1
-                    else:
-                        break
-            
-            # Calculate longest streak
-            for i in range(len(sorted_dates)):
-                temp_streak = 1
-                
-                for j in range(i + 1, len(sorted_dates)):
-                    prev_date = datetime.strptime(sorted_dates[j-1], '%Y-%m-%d').date()
-                    curr_date = datetime.strptime(sorted_dates[j], '%Y-%m-%d').date()
-                    
-                    if (prev_date - curr_date).days == 1:
-                        temp_streak += 1
-                    else:
-                        break
-                
-                longest_streak = max(longest_streak, temp_streak)
-            
-            return {
-                'current_streak': current_streak,
-                'longest_streak': longest_streak,
-                'last_work_date': last_work_date
-            }
-            
+            return self.storage.get_worked_days(user_id).streak_info()
         except Exception as e:
             return {'error': 'အလုပ်လုပ်ဆက်တိုက်ရက်ရေ ရှာရာတွင် အမှားရှိသည်။'}
\ No newline at end of file
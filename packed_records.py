@@ -0,0 +1,160 @@
+"""Compact binary encoding of a user's stored calculation entries.
+
+A user file starts with ``SPREC1`` and holds one record per entry, in the
+order the entries were saved:
+
+* ``P`` records are fixed-width (63 bytes) little-endian structs: date as
+  int32 days since 1970-01-01, timestamp as int64 microseconds, start/end as
+  uint16 minutes of day, shift type as a uint8 code, a flags byte, the six
+  minute fields as int16 and the four salary fields as float64;
+* ``J`` records (uint32 length + JSON) hold any entry that does not fit that
+  layout exactly, so encoding is always lossless.
+
+Appending an entry is appending one record, and decoding rebuilds the same
+``{date: [entry, ...]}`` mapping the JSON backends return.
+"""
+
+import json
+import struct
+from datetime import date, datetime, timedelta
+from typing import Dict, Tuple
+import logging
+from shift_record import MINUTE_FIELDS, SALARY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SPREC1"
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+SHIFT_TYPES = ('C341', 'C342')
+SHIFT_CODES = {shift_type: code for code, shift_type in enumerate(SHIFT_TYPES)}
+
+# Key order of entries written by DataStorage.save_calculation(_with_date)
+ENTRY_KEYS = ('timestamp', 'start_time', 'end_time', 'shift_type') + MINUTE_FIELDS + SALARY_FIELDS
+DATED_ENTRY_KEYS = ENTRY_KEYS + ('calculation_date',)
+
+FLAG_CALCULATION_DATE = 1
+
+PACKED = struct.Struct('<ciqHHBB6h4d')
+JSON_HEADER = struct.Struct('<cI')
+
+
+def _time_minutes(time_str) -> int:
+    """Minutes of day for a canonical 'HH:MM' string, else -1."""
+    if not isinstance(time_str, str) or len(time_str) != 5 or time_str[2] != ':':
+        return -1
+    try:
+        hours, minutes = int(time_str[:2]), int(time_str[3:])
+    except ValueError:
+        return -1
+    return hours * 60 + minutes if 0 <= hours < 24 and 0 <= minutes < 60 else -1
+
+
+def _pack(date_str: str, entry: Dict):
+    """Pack an entry into a fixed-width record, or None when it would not round-trip exactly."""
+    keys = tuple(entry)
+    if keys != ENTRY_KEYS and keys != DATED_ENTRY_KEYS:
+        return None
+    flags = 0
+    if keys == DATED_ENTRY_KEYS:
+        if entry['calculation_date'] != date_str:
+            return None
+        flags |= FLAG_CALCULATION_DATE
+
+    try:
+        day = date.fromisoformat(date_str)
+        timestamp = datetime.fromisoformat(entry['timestamp'])
+    except (TypeError, ValueError):
+        return None
+    if day.isoformat() != date_str or timestamp.tzinfo or timestamp.isoformat() != entry['timestamp']:
+        return None
+
+    start, end = _time_minutes(entry['start_time']), _time_minutes(entry['end_time'])
+    shift_code = SHIFT_CODES.get(entry['shift_type'])
+    if start < 0 or end < 0 or shift_code is None:
+        return None
+
+    minutes = [entry[field] for field in MINUTE_FIELDS]
+    salaries = [entry[field] for field in SALARY_FIELDS]
+    if any(type(value) is not int or not -32768 <= value <= 32767 for value in minutes):
+        return None
+    if any(type(value) is not float for value in salaries):
+        return None
+
+    return PACKED.pack(b'P', day.toordinal() - EPOCH_ORDINAL, (timestamp - EPOCH) // MICROSECOND,
+                       start, end, shift_code, flags, *minutes, *salaries)
+
+
+def encode_entry(date_str: str, entry: Dict) -> bytes:
+    """Encode one entry as a record."""
+    record = _pack(date_str, entry)
+    if record is not None:
+        return record
+    payload = json.dumps([date_str, entry], ensure_ascii=False).encode('utf-8')
+    return JSON_HEADER.pack(b'J', len(payload)) + payload
+
+
+def encode_user(user_data: Dict) -> bytes:
+    """Encode a user's whole history, including the file header."""
+    records = [MAGIC]
+    for date_str, entries in user_data.items():
+        for entry in entries:
+            records.append(encode_entry(date_str, entry))
+    return b''.join(records)
+
+
+def _unpack(record: Tuple) -> Tuple[str, Dict]:
+    _, days, micros, start, end, shift_code, flags = record[:7]
+    date_str = date.fromordinal(days + EPOCH_ORDINAL).isoformat()
+    entry = {
+        'timestamp': (EPOCH + micros * MICROSECOND).isoformat(),
+        'start_time': f"{start // 60:02d}:{start % 60:02d}",
+        'end_time': f"{end // 60:02d}:{end % 60:02d}",
+        'shift_type': SHIFT_TYPES[shift_code]
+    }
+    entry.update(zip(MINUTE_FIELDS, record[7:13]))
+    entry.update(zip(SALARY_FIELDS, record[13:17]))
+    if flags & FLAG_CALCULATION_DATE:
+        entry['calculation_date'] = date_str
+    return date_str, entry
+
+
+def decode_user(data: bytes) -> Tuple[Dict, int]:
+    """Decode an encoded user file into ``({date: [entry, ...]}, valid_length)``.
+
+    A truncated trailing record (an interrupted append) is left out and
+    valid_length stops before it, so callers can cut it off before appending.
+    """
+    user_data: Dict = {}
+    if not data:
+        return user_data, 0
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a packed salary record file")
+
+    offset, size = len(MAGIC), len(data)
+    while offset < size:
+        tag = data[offset:offset + 1]
+        if tag == b'P':
+            if offset + PACKED.size > size:
+                break
+            date_str, entry = _unpack(PACKED.unpack_from(data, offset))
+            offset += PACKED.size
+        elif tag == b'J':
+            if offset + JSON_HEADER.size > size:
+                break
+            _, length = JSON_HEADER.unpack_from(data, offset)
+            start = offset + JSON_HEADER.size
+            if start + length > size:
+                break
+            date_str, entry = json.loads(data[start:start + length].decode('utf-8'))
+            offset = start + length
+        else:
+            raise ValueError(f"Corrupt packed record at byte {offset}")
+        user_data.setdefault(date_str, []).append(entry)
+
+    if offset < size:
+        logger.warning(f"Ignoring truncated record at byte {offset} of {size}")
+    return user_data, offset
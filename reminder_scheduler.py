@@ -0,0 +1,187 @@
+"""Delivery of daily work reminders from a min-heap keyed on the next fire time."""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Re-check the heap at least this often, so clock jumps (NTP, DST) are noticed
+MAX_SLEEP = 60.0
+
+DEFAULT_MESSAGE = 'အလုပ်ချိန် မှတ်သားရန် မမေ့ပါနှင့်!'
+
+
+def next_fire_time(time_str: str, after: float) -> float:
+    """Timestamp of the next local HH:MM strictly after the timestamp `after`."""
+    hours, minutes = map(int, time_str.split(':'))
+    moment = datetime.fromtimestamp(after)
+    fire = moment.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+    if fire <= moment:
+        fire += timedelta(days=1)
+    return fire.timestamp()
+
+
+async def deliver(messages: List[Tuple[str, str]], send: Callable[[str, str], Awaitable[None]],
+                  rate: float = 25.0) -> int:
+    """Send (user_id, message) pairs with send(), at most `rate` per second. Returns the number sent.
+
+    Messages go out in concurrent batches of up to `rate`; a failed send is
+    logged and does not stop the others.
+    """
+    loop = asyncio.get_running_loop()
+    batch_size = max(1, int(rate))
+    sent = 0
+    for offset in range(0, len(messages), batch_size):
+        batch = messages[offset:offset + batch_size]
+        started = loop.time()
+        with metrics.span("reminders.batch"):
+            results = await asyncio.gather(*(send(user_id, message) for user_id, message in batch),
+                                           return_exceptions=True)
+        for (user_id, _), result in zip(batch, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending reminder to {user_id}: {result}")
+            else:
+                sent += 1
+        pause = len(batch) / rate - (loop.time() - started)
+        if pause > 0:
+            await asyncio.sleep(pause)
+    return sent
+
+
+class ReminderScheduler:
+    """Daily reminders per user, due ones found at the top of a min-heap.
+
+    Scheduling, rescheduling and firing a reminder each cost O(log n);
+    cancelling is O(1) (the heap item is skipped when it surfaces). Methods
+    may be called from any thread; ``run`` delivers reminders on the event
+    loop and is woken early when a reminder is scheduled ahead of the
+    current earliest one.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[float, int, str]] = []
+        # user_id -> (generation, time_str, message); heap items with an older generation are stale
+        self._reminders: Dict[str, Tuple[int, str, str]] = {}
+        self._generations = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._reminders)
+
+    def load(self, notifications: Dict) -> int:
+        """Replace all reminders with the enabled work reminders in notification settings. Returns the count."""
+        now = self._clock()
+        reminders, heap = {}, []
+        for user_id, settings in notifications.items():
+            reminder = settings.get('work_reminder') if isinstance(settings, dict) else None
+            if not reminder or not reminder.get('enabled'):
+                continue
+            try:
+                fire_at = next_fire_time(reminder['time'], now)
+            except (KeyError, ValueError):
+                logger.warning(f"Skipping invalid reminder for user {user_id}")
+                continue
+            generation = next(self._generations)
+            reminders[user_id] = (generation, reminder['time'], reminder.get('message') or DEFAULT_MESSAGE)
+            heap.append((fire_at, generation, user_id))
+        heapq.heapify(heap)
+        with self._lock:
+            self._reminders, self._heap = reminders, heap
+        self._wake()
+        return len(reminders)
+
+    def schedule(self, user_id: str, time_str: str, message: Optional[str] = None) -> float:
+        """Add or replace a user's daily reminder. Returns its next fire timestamp."""
+        fire_at = next_fire_time(time_str, self._clock())
+        with self._lock:
+            generation = next(self._generations)
+            self._reminders[user_id] = (generation, time_str, message or DEFAULT_MESSAGE)
+            heapq.heappush(self._heap, (fire_at, generation, user_id))
+            earliest = self._heap[0][1] == generation
+            self._compact()
+        if earliest:
+            self._wake()
+        return fire_at
+
+    def cancel(self, user_id: str) -> bool:
+        """Stop a user's reminder. Returns False when there was none."""
+        with self._lock:
+            removed = self._reminders.pop(user_id, None) is not None
+            self._compact()
+        return removed
+
+    def _compact(self) -> None:
+        """Drop stale heap items once they outnumber live ones. Caller holds the lock."""
+        if len(self._heap) > 2 * len(self._reminders) + 64:
+            self._heap = [item for item in self._heap if self._live(item)]
+            heapq.heapify(self._heap)
+
+    def _live(self, item: Tuple[float, int, str]) -> bool:
+        reminder = self._reminders.get(item[2])
+        return reminder is not None and reminder[0] == item[1]
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Seconds until the earliest reminder is due (0 if overdue), or None when none are scheduled."""
+        with self._lock:
+            while self._heap and not self._live(self._heap[0]):
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - self._clock())
+
+    def pop_due(self, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Take up to limit due reminders as (user_id, message), rescheduling each for its next day."""
+        now = self._clock()
+        due = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now and (limit is None or len(due) < limit):
+                fire_at, generation, user_id = heapq.heappop(heap)
+                reminder = self._reminders.get(user_id)
+                if reminder is None or reminder[0] != generation:
+                    continue
+                _, time_str, message = reminder
+                due.append((user_id, message))
+                # Days missed while the bot was down are skipped, not replayed
+                generation = next(self._generations)
+                self._reminders[user_id] = (generation, time_str, message)
+                heapq.heappush(heap, (next_fire_time(time_str, max(fire_at, now)), generation, user_id))
+        return due
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    async def run(self, send: Callable[[str, str], Awaitable[None]], rate: float = 25.0) -> None:
+        """Deliver due reminders forever with send(user_id, message), at most `rate` per second.
+
+        Due reminders are sent through ``deliver`` in batches of up to `rate`.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        batch_size = max(1, int(rate))
+        while True:
+            self._wakeup.clear()
+            delay = self.seconds_until_next()
+            if delay is None or delay > 0:
+                timeout = MAX_SLEEP if delay is None else min(delay, MAX_SLEEP)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batch = self.pop_due(limit=batch_size)
+            if batch:
+                await deliver(batch, send, rate)
@@ -0,0 +1,251 @@
+"""Pre-aggregated per-user views: per-day, per-ISO-week and per-month totals, and the days worked."""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from shift_record import ShiftRecord
+
+# Entry fields summed into every rollup
+SUM_FIELDS = ('total_salary', 'total_minutes', 'paid_minutes', 'regular_minutes', 'ot_minutes',
+              'night_ot_minutes', 'regular_salary', 'ot_salary', 'night_ot_salary')
+
+
+class Totals:
+    """Summed shift fields for one day, week or month."""
+
+    __slots__ = ('entries', 'days', 'shift_counts') + SUM_FIELDS
+
+    def __init__(self):
+        self.entries = 0
+        self.days = 0
+        self.shift_counts: Dict[str, int] = {}
+        for field in SUM_FIELDS:
+            setattr(self, field, 0)
+
+    def add(self, record: ShiftRecord) -> None:
+        self.entries += 1
+        self.total_salary += record.total_salary
+        self.total_minutes += record.total_minutes
+        self.paid_minutes += record.paid_minutes
+        self.regular_minutes += record.regular_minutes
+        self.ot_minutes += record.ot_minutes
+        self.night_ot_minutes += record.night_ot_minutes
+        self.regular_salary += record.regular_salary
+        self.ot_salary += record.ot_salary
+        self.night_ot_salary += record.night_ot_salary
+        shift_type = record.shift_type
+        if shift_type:
+            self.shift_counts[shift_type] = self.shift_counts.get(shift_type, 0) + 1
+
+    def merge(self, other: 'Totals') -> None:
+        self.entries += other.entries
+        self.days += other.days
+        for field in SUM_FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        for shift_type, count in other.shift_counts.items():
+            count += self.shift_counts.get(shift_type, 0)
+            if count:
+                self.shift_counts[shift_type] = count
+            else:
+                self.shift_counts.pop(shift_type, None)
+
+    def to_dict(self) -> Dict:
+        result = {field: getattr(self, field) for field in SUM_FIELDS}
+        result.update(entries=self.entries, days=self.days, shift_counts=dict(self.shift_counts))
+        return result
+
+
+def week_key(day: date) -> str:
+    """ISO week key such as ``2025-W28``."""
+    year, week, _ = day.isocalendar()
+    return f"{year:04d}-W{week:02d}"
+
+
+class UserRollups:
+    """Day, ISO-week and month totals for one user, kept up to date incrementally.
+
+    Built once from a user's data, then updated per saved or deleted entry, so
+    period totals are dictionary lookups instead of scans over every entry.
+    """
+
+    def __init__(self, user_data: Optional[Dict] = None):
+        self.daily: Dict[str, Totals] = {}
+        self.weekly: Dict[str, Totals] = {}
+        self.monthly: Dict[str, Totals] = {}
+        for date_str, entries in (user_data or {}).items():
+            for entry in entries:
+                self.add_entry(date_str, entry)
+
+    def _period_totals(self, date_str: str) -> List[Totals]:
+        """Week and month totals a date contributes to (none for malformed dates)."""
+        try:
+            day = datetime.fromisoformat(date_str).date()
+        except ValueError:
+            return []
+        return [self.weekly.setdefault(week_key(day), Totals()),
+                self.monthly.setdefault(date_str[:7], Totals())]
+
+    def add_entry(self, date_str: str, entry: Dict) -> None:
+        """Account for a newly saved entry."""
+        day_totals = self.daily.get(date_str)
+        new_day = day_totals is None
+        if new_day:
+            day_totals = self.daily[date_str] = Totals()
+            day_totals.days = 1
+
+        record = ShiftRecord.from_entry(date_str, entry)
+        day_totals.add(record)
+        for totals in self._period_totals(date_str):
+            totals.add(record)
+            if new_day:
+                totals.days += 1
+
+    def remove_date(self, date_str: str) -> None:
+        """Remove every entry of a date."""
+        day_totals = self.daily.pop(date_str, None)
+        if day_totals is None:
+            return
+        for totals in self._period_totals(date_str):
+            totals.merge(_negated(day_totals))
+
+    def day(self, date_str: str) -> Optional[Totals]:
+        totals = self.daily.get(date_str)
+        return totals if totals and totals.entries else None
+
+    def week(self, day: date) -> Optional[Totals]:
+        totals = self.weekly.get(week_key(day))
+        return totals if totals and totals.entries else None
+
+    def month(self, month_key: str) -> Optional[Totals]:
+        """Totals for a ``YYYY-MM`` month."""
+        totals = self.monthly.get(month_key)
+        return totals if totals and totals.entries else None
+
+    def range(self, start_date: date, end_date: date) -> Totals:
+        """Totals over the days from start_date to end_date inclusive."""
+        result = Totals()
+        check_date = start_date
+        while check_date <= end_date:
+            totals = self.day(check_date.isoformat())
+            if totals:
+                result.merge(totals)
+            check_date += timedelta(days=1)
+        return result
+
+
+def _negated(totals: Totals) -> Totals:
+    negated = Totals()
+    negated.entries = -totals.entries
+    negated.days = -totals.days
+    for field in SUM_FIELDS:
+        setattr(negated, field, -getattr(totals, field))
+    negated.shift_counts = {shift_type: -count for shift_type, count in totals.shift_counts.items()}
+    return negated
+
+
+
+class WorkedDays:
+    """The days a user worked, as a bitset over day ordinals, kept up to date incrementally.
+
+    Bit i of ``bits`` is the day with ordinal ``base + i``. Whether a day was
+    worked, how many days in a range were worked and how long a run of
+    consecutive days is are a few int operations instead of scans over entries.
+    """
+
+    __slots__ = ('bits', 'base', '_longest')
+
+    def __init__(self, user_data: Optional[Dict] = None):
+        self.bits = 0
+        self.base = 0
+        self._longest: Optional[int] = None
+        ordinals = [_ordinal(date_str) for date_str, entries in (user_data or {}).items() if entries]
+        ordinals = [ordinal for ordinal in ordinals if ordinal is not None]
+        if ordinals:
+            self.base = min(ordinals)
+            for ordinal in ordinals:
+                self.bits |= 1 << (ordinal - self.base)
+
+    def add_entry(self, date_str: str, entry: Dict) -> None:
+        ordinal = _ordinal(date_str)
+        if ordinal is None:
+            return
+        if not self.bits:
+            self.base = ordinal
+        elif ordinal < self.base:
+            self.bits <<= self.base - ordinal
+            self.base = ordinal
+        self.bits |= 1 << (ordinal - self.base)
+        self._longest = None
+
+    def remove_date(self, date_str: str) -> None:
+        ordinal = _ordinal(date_str)
+        if ordinal is not None and ordinal >= self.base:
+            self.bits &= ~(1 << (ordinal - self.base))
+            self._longest = None
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def worked(self, day: date) -> bool:
+        offset = day.toordinal() - self.base
+        return offset >= 0 and bool(self.bits >> offset & 1)
+
+    def bits_between(self, start_date: date, end_date: date) -> int:
+        """The days from start_date to end_date inclusive as an int whose bit i is start_date + i days."""
+        width = end_date.toordinal() - start_date.toordinal() + 1
+        if width <= 0:
+            return 0
+        offset = start_date.toordinal() - self.base
+        shifted = self.bits >> offset if offset >= 0 else self.bits << -offset
+        return shifted & ((1 << width) - 1)
+
+    def count(self, start_date: date, end_date: date) -> int:
+        """Number of days worked from start_date to end_date inclusive."""
+        return self.bits_between(start_date, end_date).bit_count()
+
+    def first_day(self) -> Optional[date]:
+        if not self.bits:
+            return None
+        return date.fromordinal(self.base + (self.bits & -self.bits).bit_length() - 1)
+
+    def last_day(self) -> Optional[date]:
+        if not self.bits:
+            return None
+        return date.fromordinal(self.base + self.bits.bit_length() - 1)
+
+    def run_ending(self, day: date) -> int:
+        """Length of the run of consecutive worked days ending on day (0 if day was not worked)."""
+        offset = day.toordinal() - self.base
+        if offset < 0 or not self.bits >> offset & 1:
+            return 0
+        gaps = ~self.bits & ((1 << (offset + 1)) - 1)
+        return offset + 1 - gaps.bit_length()
+
+    def longest_run(self) -> int:
+        """Length of the longest run of consecutive worked days."""
+        if self._longest is None:
+            # Each step shortens every run by one day, so the step count is the longest run
+            bits, longest = self.bits, 0
+            while bits:
+                bits &= bits >> 1
+                longest += 1
+            self._longest = longest
+        return self._longest
+
+    def streak_info(self, today: Optional[date] = None) -> Dict:
+        """Current streak (counted only if the last worked day is today or yesterday), longest streak and last date."""
+        last_day = self.last_day()
+        if last_day is None:
+            return {'current_streak': 0, 'longest_streak': 0, 'last_work_date': None}
+        today = today or date.today()
+        return {
+            'current_streak': self.run_ending(last_day) if (today - last_day).days in (0, 1) else 0,
+            'longest_streak': self.longest_run(),
+            'last_work_date': last_day.isoformat()
+        }
+
+
+def _ordinal(date_str: str) -> Optional[int]:
+    try:
+        return datetime.fromisoformat(date_str).date().toordinal()
+    except ValueError:
+        return None
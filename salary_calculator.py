@@ -1,44 +1,94 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 from shift_detector import ShiftDetector
 from time_utils import TimeUtils
 
 class SalaryCalculator:
+    # Changing any of these invalidates memoized results
+    RATE_FIELDS = ('BASE_RATE', 'NIGHT_OT_RATE', 'REGULAR_HOURS_LIMIT', 'NIGHT_START_HOUR')
+    MEMO_SIZE = 1024
+
     def __init__(self):
         self.shift_detector = ShiftDetector()
         self.time_utils = TimeUtils()
+        self.rate_version = 0
+        self._parsed_times: Dict[str, Optional[datetime]] = {}
+        self._memo: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self.memo_hits = 0
+        self.memo_misses = 0
         
         # Salary rates (in yen per hour)
         self.BASE_RATE = 2100
         self.NIGHT_OT_RATE = 2625
         self.REGULAR_HOURS_LIMIT = 7 * 60 + 35  # 7h35m in minutes
         self.NIGHT_START_HOUR = 22  # 22:00
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self.RATE_FIELDS:
+            super().__setattr__('rate_version', self.rate_version + 1)
+
+    def _parse_time(self, time_str: str) -> Optional[datetime]:
+        """Parse a time string, remembering results for repeated inputs."""
+        if time_str not in self._parsed_times:
+            if len(self._parsed_times) >= self.MEMO_SIZE:
+                self._parsed_times.clear()
+            self._parsed_times[time_str] = self.time_utils.parse_time(time_str)
+        return self._parsed_times[time_str]
     
     def calculate_salary(self, start_time_str: str, end_time_str: str) -> Dict:
-        """Calculate salary based on start and end times."""
+        """Calculate salary based on start and end times.
+
+        Results are memoized per (start minute, end minute, rate version,
+        break schedule version), so repeated windows skip the calculation.
+        """
         try:
             # Parse time strings
-            start_time = self.time_utils.parse_time(start_time_str)
-            end_time = self.time_utils.parse_time(end_time_str)
+            start_time = self._parse_time(start_time_str)
+            end_time = self._parse_time(end_time_str)
             
             if not start_time or not end_time:
                 return {'error': 'အချိန်ပုံစံမှားနေသည်။ ဥပမာ: 08:30 ~ 17:30'}
+
+            key = (start_time.hour * 60 + start_time.minute, end_time.hour * 60 + end_time.minute,
+                   self.rate_version, self.shift_detector.check_break_tables())
+            result = self._memo.get(key)
+            if result is None:
+                self.memo_misses += 1
+                result = self._calculate(start_time, end_time)
+                if result['error'] is None:
+                    self._memo[key] = result
+                    if len(self._memo) > self.MEMO_SIZE:
+                        self._memo.popitem(last=False)
+            else:
+                self.memo_hits += 1
+                self._memo.move_to_end(key)
+
+            # Callers get their own copy of the mutable parts
+            result = dict(result)
+            if 'break_details' in result:
+                result['break_details'] = [dict(detail) for detail in result['break_details']]
+            return result
             
+        except Exception as e:
+            return {'error': f'တွက်ချက်မှုအမှား: {str(e)}'}
+
+    def _calculate(self, start_time: datetime, end_time: datetime) -> Dict:
+        """Calculate salary for parsed start and end times."""
+        try:
             # Detect shift type
             shift_type = self.shift_detector.detect_shift(start_time, end_time)
             
             if not shift_type:
                 return {'error': 'Shift အမျိုးအစားမသိရှိပါ။'}
             
-            # Get shift configuration
-            shift_config = self.shift_detector.get_shift_config(shift_type)
-            
             # Calculate total work minutes
             total_minutes = self.time_utils.calculate_total_minutes(start_time, end_time)
             
-            # Calculate break deductions
-            break_minutes, break_details = self.calculate_break_deductions(
-                start_time, end_time, shift_config['breaks']
+            # Calculate break deductions from the precompiled break table
+            break_minutes, break_details = self.shift_detector.get_break_table(shift_type).deduct_with_details(
+                start_time.hour * 60 + start_time.minute, end_time.hour * 60 + end_time.minute
             )
             
             # Calculate paid work time
@@ -97,9 +97,84 @@ class ShiftDetector:
             'C342': 'ညပိုင်းအလုပ်'
         }
         return names.get(shift_type, 'အမျိုးအစားမသိ')
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 
+DAY_MINUTES = 24 * 60
+
+
+class BreakTable:
+    """Break schedule compiled into sorted minute intervals with prefix sums.
+
+    Intervals are minutes since midnight; a break that wraps past midnight
+    ends on the next day (end + 1440), as in SalaryCalculator. When the breaks
+    do not overlap each other, the minutes deducted from a work window take
+    two binary searches instead of a pass over every break.
+    """
+
+    def __init__(self, breaks: List[Tuple[str, str]]):
+        self.source = tuple(breaks)
+        intervals = []
+        for index, (break_start, break_end) in enumerate(breaks):
+            start = self._to_minutes(break_start)
+            end = self._to_minutes(break_end)
+            if end < start:
+                end += DAY_MINUTES
+            intervals.append((start, end, index, break_start, break_end))
+        intervals.sort()
+
+        self.starts = [interval[0] for interval in intervals]
+        self.ends = [interval[1] for interval in intervals]
+        self.intervals = intervals
+        self.prefix = [0]
+        for start, end, *_ in intervals:
+            self.prefix.append(self.prefix[-1] + end - start)
+        self.disjoint = all(self.ends[k] <= self.starts[k + 1] for k in range(len(intervals) - 1))
+
+    @staticmethod
+    def _to_minutes(time_str: str) -> int:
+        parsed = datetime.strptime(time_str.strip(), '%H:%M')
+        return parsed.hour * 60 + parsed.minute
+
+    def _span(self, work_start: int, work_end: int) -> Tuple[int, int]:
+        """Indexes of the first and last breaks overlapping the window."""
+        if not self.disjoint:
+            return 0, len(self.intervals) - 1
+        return bisect_right(self.ends, work_start), bisect_left(self.starts, work_end) - 1
+
+    def deduct(self, work_start: int, work_end: int) -> int:
+        """Minutes of break inside the work window (work_end < work_start means next day)."""
+        if work_end < work_start:
+            work_end += DAY_MINUTES
+
+        if not self.disjoint:
+            return sum(max(0, min(work_end, end) - max(work_start, start))
+                       for start, end, *_ in self.intervals)
+
+        first, last = self._span(work_start, work_end)
+        if first > last:
+            return 0
+        return (self.prefix[last + 1] - self.prefix[first]
+                - max(0, work_start - self.starts[first])
+                - max(0, self.ends[last] - work_end))
+
+    def deduct_with_details(self, work_start: int, work_end: int) -> Tuple[int, List[Dict]]:
+        """Deducted minutes plus one detail dict per overlapping break, in schedule order."""
+        if work_end < work_start:
+            work_end += DAY_MINUTES
+
+        first, last = self._span(work_start, work_end)
+        overlapping = []
+        for start, end, index, break_start, break_end in self.intervals[max(first, 0):last + 1]:
+            minutes = min(work_end, end) - max(work_start, start)
+            if minutes > 0:
+                overlapping.append((index, {'start': break_start, 'end': break_end, 'minutes': minutes}))
+        overlapping.sort(key=lambda item: item[0])
+
+        return sum(detail['minutes'] for _, detail in overlapping), [detail for _, detail in overlapping]
+
+
 class ShiftDetector:
     """Detect shift types and manage break schedules."""
     
@@ -132,6 +207,33 @@ class ShiftDetector:
                 ]
             }
         }
+        self.break_tables: Dict[str, BreakTable] = {}
+        self.schedule_version = 0
+        self.compile_break_tables()
+    
+    def _schedule_source(self) -> Dict:
+        return {shift_type: (config['start'], config['end'], tuple(config['breaks']))
+                for shift_type, config in self.shifts.items()}
+    
+    def compile_break_tables(self):
+        """Compile every shift's break schedule into a BreakTable."""
+        self.break_tables = {shift_type: BreakTable(config['breaks'])
+                             for shift_type, config in self.shifts.items()}
+        self.compiled_schedule = self._schedule_source()
+        self.schedule_version += 1
+    
+    def check_break_tables(self) -> int:
+        """Recompile if any shift's times or breaks changed. Returns the current schedule version."""
+        if self._schedule_source() != self.compiled_schedule:
+            self.compile_break_tables()
+        return self.schedule_version
+    
+    def get_break_table(self, shift_type: str) -> BreakTable:
+        """Get the compiled break table for a shift, recompiling if its breaks changed."""
+        if shift_type not in self.shifts:
+            shift_type = 'C341'
+        self.check_break_tables()
+        return self.break_tables[shift_type]
     
     def detect_shift(self, start_time: datetime, end_time: datetime) -> Optional[str]:
         """Detect shift type based on start and end times."""
@@ -143,13 +245,14 @@ class ShiftDetector:
         
         end_str = end_time.strftime('%H:%M')
         
+        day, night = self.shifts['C341'], self.shifts['C342']
+        
         # Check for C341 (Day Shift)
-        if self._is_close_time(start_str, '08:30', 60) and self._is_close_time(end_str, '17:30', 60):
+        if self._is_close_time(start_str, day['start'], 60) and self._is_close_time(end_str, day['end'], 60):
             return 'C341'
         
         # Check for C342 (Night Shift)
-        if (self._is_close_time(start_str, '16:45', 60) and 
-            (self._is_close_time(end_str, '01:25', 60) or self._is_close_time(end_str, '25:25', 60))):
+        if self._is_close_time(start_str, night['start'], 60) and self._is_close_time(end_str, night['end'], 60):
             return 'C342'
         
         # Default to C341 for day times, C342 for night starts
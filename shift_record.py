@@ -0,0 +1,98 @@
+"""Typed, slotted representation of one stored shift."""
+
+from sys import intern
+from typing import Dict, Iterator, List, Optional
+
+MINUTE_FIELDS = ('total_minutes', 'break_minutes', 'paid_minutes', 'regular_minutes', 'ot_minutes',
+                 'night_ot_minutes')
+SALARY_FIELDS = ('regular_salary', 'ot_salary', 'night_ot_salary', 'total_salary')
+
+
+class ShiftRecord:
+    """One calculation entry with integer minute fields and numeric pay fields.
+
+    Built once from a stored entry dict, so inner loops read attributes
+    instead of repeating ``entry.get(field, 0)`` lookups.
+    """
+
+    __slots__ = ('date', 'timestamp', 'start_time', 'end_time', 'shift_type') + MINUTE_FIELDS + SALARY_FIELDS
+
+    def __init__(self, date: str, timestamp: str = '', start_time: str = '', end_time: str = '',
+                 shift_type: str = '', total_minutes: int = 0, break_minutes: int = 0, paid_minutes: int = 0,
+                 regular_minutes: int = 0, ot_minutes: int = 0, night_ot_minutes: int = 0,
+                 regular_salary: float = 0, ot_salary: float = 0, night_ot_salary: float = 0,
+                 total_salary: float = 0):
+        self.date = date
+        self.timestamp = timestamp
+        self.start_time = start_time
+        self.end_time = end_time
+        self.shift_type = shift_type
+        self.total_minutes = total_minutes
+        self.break_minutes = break_minutes
+        self.paid_minutes = paid_minutes
+        self.regular_minutes = regular_minutes
+        self.ot_minutes = ot_minutes
+        self.night_ot_minutes = night_ot_minutes
+        self.regular_salary = regular_salary
+        self.ot_salary = ot_salary
+        self.night_ot_salary = night_ot_salary
+        self.total_salary = total_salary
+
+    @classmethod
+    def from_entry(cls, date_str: str, entry: Dict) -> 'ShiftRecord':
+        """Build a record from a stored entry dict; missing fields default to zero."""
+        get = entry.get
+        # Times and shift types repeat across entries, so share one string object each
+        return cls(date_str, get('timestamp', ''), intern(get('start_time', '')), intern(get('end_time', '')),
+                   intern(get('shift_type', '')),
+                   int(get('total_minutes', 0)), int(get('break_minutes', 0)), int(get('paid_minutes', 0)),
+                   int(get('regular_minutes', 0)), int(get('ot_minutes', 0)), int(get('night_ot_minutes', 0)),
+                   get('regular_salary', 0), get('ot_salary', 0), get('night_ot_salary', 0),
+                   get('total_salary', 0))
+
+    def __eq__(self, other):
+        if not isinstance(other, ShiftRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"ShiftRecord({self.date!r}, {self.start_time!r}-{self.end_time!r}, {self.shift_type!r})"
+
+
+class ShiftRecords:
+    """A user's entries as ShiftRecords grouped by date, kept current by the cache.
+
+    Implements the cache view protocol (``add_entry`` / ``remove_date``), so
+    the records are built once per cached user rather than per request.
+    """
+
+    def __init__(self, user_data: Optional[Dict] = None):
+        self.by_date: Dict[str, List[ShiftRecord]] = {}
+        self._ordered: Optional[List[ShiftRecord]] = None
+        for date_str, entries in (user_data or {}).items():
+            if isinstance(entries, list):
+                self.by_date[date_str] = [ShiftRecord.from_entry(date_str, entry) for entry in entries]
+
+    def __len__(self) -> int:
+        return len(self.ordered())
+
+    def add_entry(self, date_str: str, entry: Dict) -> None:
+        self.by_date.setdefault(date_str, []).append(ShiftRecord.from_entry(date_str, entry))
+        self._ordered = None
+
+    def remove_date(self, date_str: str) -> None:
+        if self.by_date.pop(date_str, None) is not None:
+            self._ordered = None
+
+    def ordered(self) -> List[ShiftRecord]:
+        """Every record, oldest date first and in save order within a date."""
+        ordered = self._ordered
+        if ordered is None:
+            ordered = []
+            for date_str in sorted(self.by_date):
+                ordered.extend(self.by_date[date_str])
+            self._ordered = ordered
+        return ordered
+
+    def __iter__(self) -> Iterator[ShiftRecord]:
+        return iter(self.ordered())
@@ -0,0 +1,1017 @@
+"""Pluggable storage backends used by DataStorage."""
+
+import contextlib
+import copy
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import quote, unquote
+import logging
+from packed_records import decode_user, encode_entry, encode_user
+from metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads within this process are serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Write bytes to a temp file and rename it over path, so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        metrics.add_bytes("storage.write", written=len(data))
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, data, indent: Optional[int] = 2) -> None:
+    """Write JSON atomically (see atomic_write_bytes)."""
+    # json.dumps uses the C encoder; json.dump would hold the GIL in pure Python
+    atomic_write_bytes(path, json.dumps(data, ensure_ascii=False, indent=indent).encode('utf-8'))
+
+
+def date_strings(start_date: date, end_date: date) -> List[str]:
+    """ISO strings for every date from start_date to end_date inclusive."""
+    return [(start_date + timedelta(days=offset)).isoformat()
+            for offset in range((end_date - start_date).days + 1)]
+
+
+def select_date_range(user_data: Dict, start_date: date, end_date: date) -> Dict:
+    """The dates of user_data between start_date and end_date, newest first."""
+    recent_data = {}
+
+    check_date = end_date
+    while check_date >= start_date:
+        date_str = check_date.isoformat()
+        if date_str in user_data:
+            recent_data[date_str] = user_data[date_str]
+        check_date -= timedelta(days=1)
+
+    return recent_data
+
+
+def iter_date_entries(user_data: Dict, start_date: Optional[date] = None,
+                      end_date: Optional[date] = None) -> Iterator[Tuple[str, List[Dict]]]:
+    """(date_str, entries) for the dates of user_data from start_date to end_date (either may be open), oldest first."""
+    low = start_date.isoformat() if start_date else ''
+    high = end_date.isoformat() if end_date else None
+    for date_str in sorted(user_data):
+        if date_str >= low and (high is None or date_str <= high):
+            yield date_str, user_data[date_str]
+
+
+def summarize_user_data(user_data: Dict) -> Optional[Dict]:
+    """Count the records and dates of user_data, or None when there is no data."""
+    if not user_data:
+        return None
+
+    dates = list(user_data.keys())
+    return {
+        'total_records': sum(len(day_data) for day_data in user_data.values()),
+        'total_days': len(dates),
+        'first_record': min(dates),
+        'last_record': max(dates)
+    }
+
+
+def dates_from(user_data: Dict, cutoff_date: date) -> Dict:
+    """The dates of user_data on or after cutoff_date; dates that do not parse are kept."""
+    kept = {}
+    for date_str, entries in user_data.items():
+        try:
+            if datetime.fromisoformat(date_str).date() < cutoff_date:
+                continue
+        except ValueError:
+            pass
+        kept[date_str] = entries
+    return kept
+
+
+class FileLock:
+    """Advisory exclusive lock on a sidecar file, re-entrant within a thread.
+
+    Serializes read-modify-write cycles between threads of this process and,
+    where fcntl is available, between processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            try:
+                self._file = open(self.path, 'a')
+                if fcntl:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                self._depth -= 1
+                if self._file:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+
+class StorageBackend:
+    """Base class for salary data backends.
+
+    A backend stores, per user, a mapping of ``YYYY-MM-DD`` date strings to
+    lists of calculation entries. Backends raise on failure; DataStorage is
+    responsible for logging and turning errors into return values.
+    """
+
+    # Documents are whole-file settings (goals, notifications, calendar) that
+    # only database backends store; file backends leave them to the managers.
+    supports_documents = False
+
+    def ensure_storage(self):
+        """Create the underlying files or tables if they do not exist."""
+
+    def load_user(self, user_id: str) -> Dict:
+        """Load all data for a user (empty dict when unknown)."""
+        raise NotImplementedError
+
+    def write_lock(self):
+        """Context manager held by callers that must see no other writer.
+
+        Used by caches so that the versions read before and after a write
+        bracket exactly that write.
+        """
+        return contextlib.nullcontext()
+
+    def data_version(self, user_id: str):
+        """Cheap token that changes whenever a user's data may have changed.
+
+        None means the backend cannot tell, so caches fall back to their TTL.
+        """
+        return None
+
+    def save_user(self, user_id: str, user_data: Dict) -> None:
+        """Replace all data for a user."""
+        raise NotImplementedError
+
+    def delete_user(self, user_id: str) -> bool:
+        """Delete a user. Returns False when the user did not exist."""
+        raise NotImplementedError
+
+    def list_users(self) -> List[str]:
+        """List all stored user IDs."""
+        raise NotImplementedError
+
+    def append_entry(self, user_id: str, date_str: str, entry: Dict) -> None:
+        """Append one calculation entry under the given date."""
+        user_data = self.load_user(user_id)
+        user_data.setdefault(date_str, []).append(entry)
+        self.save_user(user_id, user_data)
+
+    def load_date_range(self, user_id: str, start_date: date, end_date: date) -> Dict:
+        """Load a user's dates between start_date and end_date, newest first."""
+        return select_date_range(self.load_user(user_id), start_date, end_date)
+
+    def delete_dates_before(self, user_id: str, cutoff_date: date) -> None:
+        """Delete a user's dates older than cutoff_date."""
+        user_data = self.load_user(user_id)
+
+        if not user_data:
+            return
+
+        self.save_user(user_id, dates_from(user_data, cutoff_date))
+
+    def delete_date(self, user_id: str, date_str: str) -> bool:
+        """Delete a user's entries for one date. Returns False when the date had none."""
+        user_data = self.load_user(user_id)
+
+        if date_str not in user_data:
+            return False
+
+        del user_data[date_str]
+        self.save_user(user_id, user_data)
+        return True
+
+    def iter_worked_dates(self, start_date: date, end_date: date) -> Iterator[Tuple[str, Set[str]]]:
+        """Yield (user_id, dates between start_date and end_date with entries) for every user.
+
+        Users with no entries in the range are yielded with an empty set.
+        Backends that can read everyone at once override this to do so.
+        """
+        for user_id in self.list_users():
+            recent_data = self.load_date_range(user_id, start_date, end_date)
+            yield user_id, {date_str for date_str, entries in recent_data.items() if entries}
+
+    def iter_dates(self, user_id: str, start_date: Optional[date] = None,
+                   end_date: Optional[date] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """Yield (date_str, entries) for a user's dates from start_date to end_date, oldest first.
+
+        Either bound may be None for an open range. Backends that can read a
+        user's dates a page at a time override this to do so.
+        """
+        return iter_date_entries(self.load_user(user_id), start_date, end_date)
+
+    def iter_users(self) -> Iterator[Tuple[str, Dict]]:
+        """Yield (user_id, all of the user's data) for every user, one user at a time."""
+        for user_id in self.list_users():
+            yield user_id, self.load_user(user_id)
+
+    def summarize_user(self, user_id: str) -> Optional[Dict]:
+        """Count a user's records and dates, or None when there is no data."""
+        return summarize_user_data(self.load_user(user_id))
+
+    def load_document(self, name: str) -> Dict:
+        """Load a settings document keyed by its top-level keys."""
+        raise NotImplementedError
+
+    def save_document(self, name: str, data: Dict) -> None:
+        """Replace a settings document."""
+        raise NotImplementedError
+
+
+class JsonFileBackend(StorageBackend):
+    """Single JSON file holding every user's data (the original layout).
+
+    Writes replace the file atomically and hold ``<data_file>.lock`` for the
+    whole read-modify-write cycle, so concurrent savers never lose updates.
+    """
+
+    def __init__(self, data_file: str = "salary_data.json"):
+        self.data_file = data_file
+        self._lock = FileLock(f"{data_file}.lock")
+        self.ensure_storage()
+
+    def ensure_storage(self):
+        """Ensure the data file exists."""
+        with self._lock:
+            if not os.path.exists(self.data_file):
+                self._write_all({})
+
+    def _read_all(self) -> Dict:
+        with open(self.data_file, 'r', encoding='utf-8') as f:
+            metrics.add_bytes("storage.read", read=os.fstat(f.fileno()).st_size)
+            return json.load(f)
+
+    def _write_all(self, all_data: Dict) -> None:
+        atomic_write_json(self.data_file, all_data)
+
+    def load_user(self, user_id: str) -> Dict:
+        return self._read_all().get(user_id, {})
+
+    def write_lock(self):
+        return self._lock
+
+    def data_version(self, user_id: str):
+        try:
+            stat = os.stat(self.data_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def save_user(self, user_id: str, user_data: Dict) -> None:
+        with self._lock:
+            all_data = self._read_all()
+            all_data[user_id] = user_data
+            self._write_all(all_data)
+
+    def delete_user(self, user_id: str) -> bool:
+        with self._lock:
+            all_data = self._read_all()
+            if user_id not in all_data:
+                return False
+            del all_data[user_id]
+            self._write_all(all_data)
+            return True
+
+    def list_users(self) -> List[str]:
+        return list(self._read_all().keys())
+
+    def iter_worked_dates(self, start_date: date, end_date: date) -> Iterator[Tuple[str, Set[str]]]:
+        window = date_strings(start_date, end_date)
+        for user_id, user_data in self._read_all().items():
+            yield user_id, {date_str for date_str in window if user_data.get(date_str)}
+
+    def iter_users(self) -> Iterator[Tuple[str, Dict]]:
+        # One read of the file instead of one per user
+        yield from self._read_all().items()
+
+    def append_entry(self, user_id: str, date_str: str, entry: Dict) -> None:
+        with self._lock:
+            super().append_entry(user_id, date_str, entry)
+
+    def delete_dates_before(self, user_id: str, cutoff_date: date) -> None:
+        with self._lock:
+            super().delete_dates_before(user_id, cutoff_date)
+
+    def delete_date(self, user_id: str, date_str: str) -> bool:
+        with self._lock:
+            return super().delete_date(user_id, date_str)
+
+
+class ShardedJsonBackend(StorageBackend):
+    """One JSON file per user, so a write only touches that user's shard.
+
+    Shards are replaced atomically; ``<shard_dir>/.lock`` serializes writers.
+    """
+
+    def __init__(self, shard_dir: str = "salary_data_shards"):
+        self.shard_dir = shard_dir
+        self.ensure_storage()
+        self._lock = FileLock(os.path.join(shard_dir, ".lock"))
+
+    def ensure_storage(self):
+        """Ensure the shard directory exists."""
+        os.makedirs(self.shard_dir, exist_ok=True)
+
+    def shard_path(self, user_id: str) -> str:
+        """Get the shard file path for a user."""
+        return os.path.join(self.shard_dir, f"{quote(user_id, safe='')}.json")
+
+    def load_user(self, user_id: str) -> Dict:
+        path = self.shard_path(user_id)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            metrics.add_bytes("storage.read", read=os.fstat(f.fileno()).st_size)
+            return json.load(f)
+
+    def write_lock(self):
+        return self._lock
+
+    def data_version(self, user_id: str):
+        try:
+            stat = os.stat(self.shard_path(user_id))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def save_user(self, user_id: str, user_data: Dict) -> None:
+        with self._lock:
+            atomic_write_json(self.shard_path(user_id), user_data)
+
+    def delete_user(self, user_id: str) -> bool:
+        with self._lock:
+            path = self.shard_path(user_id)
+            if not os.path.exists(path):
+                return False
+            os.remove(path)
+            return True
+
+    def list_users(self) -> List[str]:
+        return [unquote(name[:-len('.json')]) for name in os.listdir(self.shard_dir)
+                if name.endswith('.json')]
+
+    def append_entry(self, user_id: str, date_str: str, entry: Dict) -> None:
+        with self._lock:
+            super().append_entry(user_id, date_str, entry)
+
+    def delete_dates_before(self, user_id: str, cutoff_date: date) -> None:
+        with self._lock:
+            super().delete_dates_before(user_id, cutoff_date)
+
+    def delete_date(self, user_id: str, date_str: str) -> bool:
+        with self._lock:
+            return super().delete_date(user_id, date_str)
+
+    def import_legacy_file(self, data_file: str) -> int:
+        """Split a single-file data store into shards. Returns users imported."""
+        if not os.path.exists(data_file) or self.list_users():
+            return 0
+
+        with open(data_file, 'r', encoding='utf-8') as f:
+            all_data = json.load(f)
+
+        for user_id, user_data in all_data.items():
+            self.save_user(user_id, user_data)
+
+        logger.info(f"Imported {len(all_data)} users from {data_file} into {self.shard_dir}")
+        return len(all_data)
+
+
+class PackedRecordBackend(StorageBackend):
+    """One compact binary record file per user (see packed_records.py).
+
+    Saving a shift appends one fixed-width record to the user's file instead
+    of rewriting it; deletes and bulk saves replace the file atomically.
+    ``<record_dir>/.lock`` serializes writers.
+    """
+
+    def __init__(self, record_dir: str = "salary_data_packed"):
+        self.record_dir = record_dir
+        self.ensure_storage()
+        self._lock = FileLock(os.path.join(record_dir, ".lock"))
+        # File sizes known to end on a record boundary, so appends can skip re-reading
+        self._valid_sizes: Dict[str, int] = {}
+
+    def ensure_storage(self):
+        """Ensure the record directory exists."""
+        os.makedirs(self.record_dir, exist_ok=True)
+
+    def record_path(self, user_id: str) -> str:
+        """Get the record file path for a user."""
+        return os.path.join(self.record_dir, f"{quote(user_id, safe='')}.rec")
+
+    def _read(self, user_id: str):
+        try:
+            with open(self.record_path(user_id), 'rb') as f:
+                data = f.read()
+            metrics.add_bytes("storage.read", read=len(data))
+            return decode_user(data)
+        except FileNotFoundError:
+            return {}, None
+
+    def load_user(self, user_id: str) -> Dict:
+        return self._read(user_id)[0]
+
+    def write_lock(self):
+        return self._lock
+
+    def data_version(self, user_id: str):
+        try:
+            stat = os.stat(self.record_path(user_id))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def save_user(self, user_id: str, user_data: Dict) -> None:
+        with self._lock:
+            data = encode_user(user_data)
+            atomic_write_bytes(self.record_path(user_id), data)
+            self._valid_sizes[user_id] = len(data)
+
+    def delete_user(self, user_id: str) -> bool:
+        with self._lock:
+            self._valid_sizes.pop(user_id, None)
+            path = self.record_path(user_id)
+            if not os.path.exists(path):
+                return False
+            os.remove(path)
+            return True
+
+    def list_users(self) -> List[str]:
+        return [unquote(name[:-len('.rec')]) for name in os.listdir(self.record_dir)
+                if name.endswith('.rec')]
+
+    def append_entry(self, user_id: str, date_str: str, entry: Dict) -> None:
+        with self._lock:
+            path = self.record_path(user_id)
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                self.save_user(user_id, {date_str: [entry]})
+                return
+
+            if self._valid_sizes.get(user_id) != size:
+                # Written by another process, or an earlier append was cut short
+                _, valid_size = self._read(user_id)
+                if valid_size != size:
+                    with open(path, 'r+b') as f:
+                        f.truncate(valid_size)
+                    size = valid_size
+
+            record = encode_entry(date_str, entry)
+            with open(path, 'ab') as f:
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+            metrics.add_bytes("storage.write", written=len(record))
+            self._valid_sizes[user_id] = size + len(record)
+
+    def delete_dates_before(self, user_id: str, cutoff_date: date) -> None:
+        with self._lock:
+            super().delete_dates_before(user_id, cutoff_date)
+
+    def delete_date(self, user_id: str, date_str: str) -> bool:
+        with self._lock:
+            return super().delete_date(user_id, date_str)
+
+    def import_legacy_file(self, data_file: str) -> int:
+        """Convert a single-file data store into record files. Returns users imported."""
+        if not os.path.exists(data_file) or self.list_users():
+            return 0
+
+        with open(data_file, 'r', encoding='utf-8') as f:
+            all_data = json.load(f)
+
+        for user_id, user_data in all_data.items():
+            self.save_user(user_id, user_data)
+
+        logger.info(f"Imported {len(all_data)} users from {data_file} into {self.record_dir}")
+        return len(all_data)
+
+
+class JournaledJsonBackend(StorageBackend):
+    """In-memory state backed by a JSON snapshot plus an append-only JSON-lines log.
+
+    Every change is appended to the log as one line, so saving a shift costs a
+    single small write instead of re-serializing the whole data file. A
+    background thread folds the log into the snapshot; on startup the snapshot
+    is loaded and the log tail replayed. Only one process may use the files.
+    """
+
+    FSYNC_POLICIES = ('always', 'interval', 'never')
+
+    def __init__(self, snapshot_file: str = "salary_data.snapshot.json",
+                 log_file: Optional[str] = None,
+                 fsync_policy: str = "interval",
+                 fsync_interval: float = 1.0,
+                 compact_interval: float = 60.0,
+                 compact_threshold: int = 1000):
+        if fsync_policy not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync_policy}'")
+
+        self.snapshot_file = snapshot_file
+        self.log_file = log_file or f"{os.path.splitext(snapshot_file)[0]}.log"
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.compact_interval = compact_interval
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._users: Dict[str, Dict] = {}
+        self._seq = 0
+        self._pending_ops = 0
+        self._last_fsync = 0.0
+        self._log = None
+
+        self._replay()
+        self._log = open(self.log_file, 'a', encoding='utf-8')
+
+        self._compact_requested = threading.Event()
+        self._closed = threading.Event()
+        self._compactor = threading.Thread(target=self._compact_loop, name="journal-compactor", daemon=True)
+        self._compactor.start()
+
+    # Startup / replay
+
+    def _replay(self) -> None:
+        """Rebuild state from the snapshot and any log records newer than it."""
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self._users = snapshot.get('users', {})
+            self._seq = snapshot.get('seq', 0)
+
+        snapshot_seq = self._seq
+        # A rotated log is left behind when the process stops mid-compaction
+        for path in (f"{self.log_file}.old", self.log_file):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Only the final line can be torn by a crash
+                        logger.warning(f"Skipping unreadable record {path}:{line_number}")
+                        continue
+                    if record['seq'] <= snapshot_seq:
+                        continue
+                    self._apply(record)
+                    self._seq = max(self._seq, record['seq'])
+                    self._pending_ops += 1
+
+    def import_legacy_file(self, data_file: str) -> int:
+        """Load a single-file data store when the journal is empty. Returns users imported."""
+        if not os.path.exists(data_file) or self._users or self._seq:
+            return 0
+
+        with open(data_file, 'r', encoding='utf-8') as f:
+            all_data = json.load(f)
+
+        for user_id, user_data in all_data.items():
+            self.save_user(user_id, user_data)
+
+        logger.info(f"Imported {len(all_data)} users from {data_file} into {self.log_file}")
+        return len(all_data)
+
+    # Log records
+
+    def _apply(self, record: Dict) -> None:
+        op = record['op']
+        if op == 'append':
+            self._users.setdefault(record['user'], {}).setdefault(record['date'], []).append(record['entry'])
+        elif op == 'put':
+            self._users[record['user']] = record['data']
+        elif op == 'delete':
+            self._users.pop(record['user'], None)
+
+    def _write_record(self, record: Dict) -> None:
+        """Append a record to the log and apply it. Caller holds self._lock."""
+        self._seq += 1
+        record['seq'] = self._seq
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        self._log.write(line)
+        self._log.flush()
+        # Characters rather than encoded bytes; log records are almost entirely ASCII
+        metrics.add_bytes("storage.write", written=len(line))
+
+        if self.fsync_policy == 'always' or (
+                self.fsync_policy == 'interval' and time.monotonic() - self._last_fsync >= self.fsync_interval):
+            os.fsync(self._log.fileno())
+            self._last_fsync = time.monotonic()
+
+        self._apply(record)
+        self._pending_ops += 1
+        if self._pending_ops >= self.compact_threshold:
+            self._compact_requested.set()
+
+    # StorageBackend interface
+
+    def load_user(self, user_id: str) -> Dict:
+        with self._lock:
+            return copy.deepcopy(self._users.get(user_id, {}))
+
+    def data_version(self, user_id: str):
+        return self._seq
+
+    def save_user(self, user_id: str, user_data: Dict) -> None:
+        with self._lock:
+            self._write_record({'op': 'put', 'user': user_id, 'data': copy.deepcopy(user_data)})
+
+    def delete_user(self, user_id: str) -> bool:
+        with self._lock:
+            if user_id not in self._users:
+                return False
+            self._write_record({'op': 'delete', 'user': user_id})
+            return True
+
+    def list_users(self) -> List[str]:
+        with self._lock:
+            return list(self._users.keys())
+
+    def iter_worked_dates(self, start_date: date, end_date: date) -> Iterator[Tuple[str, Set[str]]]:
+        window = date_strings(start_date, end_date)
+        with self._lock:
+            worked = [(user_id, {date_str for date_str in window if user_data.get(date_str)})
+                      for user_id, user_data in self._users.items()]
+        return iter(worked)
+
+    def append_entry(self, user_id: str, date_str: str, entry: Dict) -> None:
+        with self._lock:
+            self._write_record({'op': 'append', 'user': user_id, 'date': date_str, 'entry': copy.deepcopy(entry)})
+
+    def delete_date(self, user_id: str, date_str: str) -> bool:
+        with self._lock:
+            user_data = self._users.get(user_id, {})
+            if date_str not in user_data:
+                return False
+            remaining = {key: entries for key, entries in user_data.items() if key != date_str}
+            self._write_record({'op': 'put', 'user': user_id, 'data': copy.deepcopy(remaining)})
+            return True
+
+    def delete_dates_before(self, user_id: str, cutoff_date: date) -> None:
+        # Filter and write under one hold of the lock, so no append lands in between
+        with self._lock:
+            user_data = self._users.get(user_id)
+            if not user_data:
+                return
+            remaining = dates_from(user_data, cutoff_date)
+            if len(remaining) != len(user_data):
+                self._write_record({'op': 'put', 'user': user_id, 'data': copy.deepcopy(remaining)})
+
+    # Compaction
+
+    def compact(self) -> int:
+        """Fold the log into a new snapshot. Returns the number of records folded."""
+        with self._compact_lock:
+            old_log = f"{self.log_file}.old"
+
+            with self._lock:
+                if not self._pending_ops:
+                    return 0
+                folded = self._pending_ops
+                # New records go to a fresh log while the snapshot is written
+                self._log.close()
+                if os.path.exists(old_log):
+                    # Left over from an interrupted compaction; its records are
+                    # also in the state being snapshotted
+                    os.remove(old_log)
+                os.replace(self.log_file, old_log)
+                self._log = open(self.log_file, 'a', encoding='utf-8')
+                self._pending_ops = 0
+                body = json.dumps({'seq': self._seq, 'users': self._users}, ensure_ascii=False)
+
+            # The snapshot carries its sequence number, so replay skips log
+            # records it already contains even if we stop before removing old_log
+            tmp_file = f"{self.snapshot_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            metrics.add_bytes("storage.compact", written=len(body))
+            os.replace(tmp_file, self.snapshot_file)
+            os.remove(old_log)
+            return folded
+
+    def _compact_loop(self) -> None:
+        while not self._closed.is_set():
+            self._compact_requested.wait(self.compact_interval)
+            self._compact_requested.clear()
+            if self._closed.is_set():
+                break
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Error compacting {self.log_file}: {e}")
+
+    def close(self) -> None:
+        """Stop the compactor, fold the log and close it."""
+        self._closed.set()
+        self._compact_requested.set()
+        self._compactor.join()
+        self.compact()
+        with self._lock:
+            os.fsync(self._log.fileno())
+            self._log.close()
+
+
+class SqliteBackend(StorageBackend):
+    """SQLite database with one row per calculation, indexed on (user_id, work_date)."""
+
+    supports_documents = True
+
+    ENTRY_COLUMNS = [
+        ('timestamp', 'TEXT'),
+        ('start_time', 'TEXT'),
+        ('end_time', 'TEXT'),
+        ('shift_type', 'TEXT'),
+        ('total_minutes', 'INTEGER'),
+        ('break_minutes', 'INTEGER'),
+        ('paid_minutes', 'INTEGER'),
+        ('regular_minutes', 'INTEGER'),
+        ('ot_minutes', 'INTEGER'),
+        ('night_ot_minutes', 'INTEGER'),
+        ('regular_salary', 'REAL'),
+        ('ot_salary', 'REAL'),
+        ('night_ot_salary', 'REAL'),
+        ('total_salary', 'REAL'),
+        ('calculation_date', 'TEXT'),
+    ]
+
+    def __init__(self, db_file: str = "salary_data.db"):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._entry_keys = [name for name, _ in self.ENTRY_COLUMNS]
+        self.ensure_storage()
+
+    def ensure_storage(self):
+        """Ensure the tables and indexes exist."""
+        columns = ",\n".join(f"    {name} {sql_type}" for name, sql_type in self.ENTRY_COLUMNS)
+        with self._lock, self._conn:
+            self._conn.execute(f"""
+CREATE TABLE IF NOT EXISTS calculations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    work_date TEXT NOT NULL,
+{columns},
+    extra TEXT
+)""")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_calculations_user_date ON calculations (user_id, work_date)"
+            )
+            self._conn.execute("""
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (name, key)
+)""")
+
+    def _entry_to_row(self, user_id: str, date_str: str, entry: Dict) -> tuple:
+        extra = {key: value for key, value in entry.items() if key not in self._entry_keys}
+        return (
+            user_id,
+            date_str,
+            *[entry.get(key) for key in self._entry_keys],
+            json.dumps(extra, ensure_ascii=False) if extra else None
+        )
+
+    def _row_to_entry(self, row: tuple) -> Dict:
+        entry = {key: value for key, value in zip(self._entry_keys, row) if value is not None}
+        if row[-1]:
+            entry.update(json.loads(row[-1]))
+        return entry
+
+    def _insert_sql(self) -> str:
+        names = ['user_id', 'work_date'] + self._entry_keys + ['extra']
+        return f"INSERT INTO calculations ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+    def _select_sql(self, where: str, order: str = "work_date, id") -> str:
+        return f"SELECT work_date, {', '.join(self._entry_keys)}, extra FROM calculations WHERE {where} ORDER BY {order}"
+
+    def _group_rows(self, rows) -> Dict:
+        user_data = {}
+        for row in rows:
+            user_data.setdefault(row[0], []).append(self._row_to_entry(row[1:]))
+        return user_data
+
+    def load_user(self, user_id: str) -> Dict:
+        with self._lock:
+            rows = self._conn.execute(self._select_sql("user_id = ?"), (user_id,)).fetchall()
+        return self._group_rows(rows)
+
+    def data_version(self, user_id: str):
+        # data_version moves on commits from other connections, total_changes on ours
+        with self._lock:
+            return (self._conn.execute("PRAGMA data_version").fetchone()[0], self._conn.total_changes)
+
+    def save_user(self, user_id: str, user_data: Dict) -> None:
+        rows = [self._entry_to_row(user_id, date_str, entry)
+                for date_str, entries in user_data.items() for entry in entries]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM calculations WHERE user_id = ?", (user_id,))
+            self._conn.executemany(self._insert_sql(), rows)
+
+    def delete_user(self, user_id: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM calculations WHERE user_id = ?", (user_id,))
+        return cursor.rowcount > 0
+
+    def list_users(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT user_id FROM calculations").fetchall()
+        return [row[0] for row in rows]
+
+    def iter_worked_dates(self, start_date: date, end_date: date) -> Iterator[Tuple[str, Set[str]]]:
+        worked: Dict[str, Set[str]] = {user_id: set() for user_id in self.list_users()}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT user_id, work_date FROM calculations WHERE work_date BETWEEN ? AND ?",
+                (start_date.isoformat(), end_date.isoformat())
+            ).fetchall()
+        for user_id, date_str in rows:
+            worked.setdefault(user_id, set()).add(date_str)
+        return iter(worked.items())
+
+    def append_entry(self, user_id: str, date_str: str, entry: Dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(self._insert_sql(), self._entry_to_row(user_id, date_str, entry))
+
+    def load_date_range(self, user_id: str, start_date: date, end_date: date) -> Dict:
+        with self._lock:
+            rows = self._conn.execute(
+                self._select_sql("user_id = ? AND work_date BETWEEN ? AND ?", "work_date DESC, id"),
+                (user_id, start_date.isoformat(), end_date.isoformat())
+            ).fetchall()
+        return self._group_rows(rows)
+
+    # Dates read per query when streaming a user's history
+    DATE_PAGE = 256
+
+    def iter_dates(self, user_id: str, start_date: Optional[date] = None,
+                   end_date: Optional[date] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        # A page of dates per query, so a long history is never held at once
+        high = " AND work_date <= ?" if end_date else ""
+        bounds = (end_date.isoformat(),) if end_date else ()
+        after, operator = (start_date.isoformat() if start_date else ''), '>='
+        while True:
+            with self._lock:
+                dates = [row[0] for row in self._conn.execute(
+                    f"SELECT DISTINCT work_date FROM calculations WHERE user_id = ? AND work_date {operator} ?{high} "
+                    "ORDER BY work_date LIMIT ?", (user_id, after, *bounds, self.DATE_PAGE))]
+                if not dates:
+                    return
+                rows = self._conn.execute(self._select_sql("user_id = ? AND work_date BETWEEN ? AND ?"),
+                                          (user_id, dates[0], dates[-1])).fetchall()
+            yield from self._group_rows(rows).items()
+            if len(dates) < self.DATE_PAGE:
+                return
+            after, operator = dates[-1], '>'
+
+    def delete_dates_before(self, user_id: str, cutoff_date: date) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM calculations WHERE user_id = ? AND work_date < ?",
+                (user_id, cutoff_date.isoformat())
+            )
+
+    def delete_date(self, user_id: str, date_str: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM calculations WHERE user_id = ? AND work_date = ?",
+                                        (user_id, date_str))
+        return cursor.rowcount > 0
+
+    def summarize_user(self, user_id: str) -> Optional[Dict]:
+        with self._lock:
+            total_records, total_days, first_record, last_record = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT work_date), MIN(work_date), MAX(work_date) "
+                "FROM calculations WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+
+        if not total_records:
+            return None
+
+        return {
+            'total_records': total_records,
+            'total_days': total_days,
+            'first_record': first_record,
+            'last_record': last_record
+        }
+
+    def load_document(self, name: str) -> Dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, body FROM documents WHERE name = ?", (name,)).fetchall()
+        return {key: json.loads(body) for key, body in rows}
+
+    def save_document(self, name: str, data: Dict) -> None:
+        rows = [(name, key, json.dumps(value, ensure_ascii=False)) for key, value in data.items()]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE name = ?", (name,))
+            self._conn.executemany("INSERT INTO documents (name, key, body) VALUES (?, ?, ?)", rows)
+
+
+# Backends keyed by (kind, path); stateful backends must be shared so every
+# DataStorage in the process sees the same data
+_shared_backends: Dict[tuple, StorageBackend] = {}
+
+
+def create_backend(data_file: str = "salary_data.json") -> StorageBackend:
+    """Create the backend selected by the STORAGE_BACKEND environment variable.
+
+    ``json`` (default) keeps everything in ``data_file``; ``sharded`` stores one
+    file per user under ``STORAGE_DIR`` (default: ``<data_file stem>_shards``)
+    and imports ``data_file`` on first use; ``packed`` does the same with compact
+    binary record files under ``STORAGE_DIR`` (default: ``<data_file stem>_packed``);
+    ``sqlite`` uses the database at ``STORAGE_DB`` (default:
+    ``<data_file stem>.db``), which is filled with ``migrate_to_sqlite.py``; ``journal`` keeps data in memory with a snapshot
+    and append-only log (``<data_file stem>.snapshot.json`` / ``<data_file stem>.log``), syncing
+    the log per ``STORAGE_FSYNC`` (always|interval|never, default interval) and
+    importing ``data_file`` on first use.
+    """
+    backend_name = os.getenv("STORAGE_BACKEND", "json").lower()
+    stem = os.path.splitext(data_file)[0]
+
+    if backend_name == "sqlite":
+        db_file = os.getenv("STORAGE_DB") or f"{stem}.db"
+        key = ("sqlite", os.path.abspath(db_file))
+        if key not in _shared_backends:
+            _shared_backends[key] = SqliteBackend(db_file)
+        return _shared_backends[key]
+
+    if backend_name == "journal":
+        snapshot_file = f"{stem}.snapshot.json"
+        key = ("journal", os.path.abspath(snapshot_file))
+        if key not in _shared_backends:
+            backend = JournaledJsonBackend(
+                snapshot_file,
+                log_file=f"{stem}.log",
+                fsync_policy=os.getenv("STORAGE_FSYNC", "interval").lower(),
+                compact_interval=float(os.getenv("STORAGE_COMPACT_INTERVAL", "60"))
+            )
+            backend.import_legacy_file(data_file)
+            _shared_backends[key] = backend
+        return _shared_backends[key]
+
+    if backend_name == "sharded":
+        shard_dir = os.getenv("STORAGE_DIR") or f"{stem}_shards"
+        backend = ShardedJsonBackend(shard_dir)
+        backend.import_legacy_file(data_file)
+        return backend
+
+    if backend_name == "packed":
+        record_dir = os.getenv("STORAGE_DIR") or f"{stem}_packed"
+        backend = PackedRecordBackend(record_dir)
+        backend.import_legacy_file(data_file)
+        return backend
+
+    if backend_name != "json":
+        logger.warning(f"Unknown STORAGE_BACKEND '{backend_name}', using json")
+
+    return JsonFileBackend(data_file)
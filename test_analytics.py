@@ -6,6 +6,12 @@ from data_storage import DataStorage
 from analytics import Analytics
 from datetime import datetime, date, timedelta
 import json
+import os
+import tempfile
+from storage_backends import JsonFileBackend
+from user_cache import CachedBackend, SnapshotSlot
+from goal_tracker import GoalTracker
+from analytics_snapshot import SnapshotManager
 
 def test_analytics():
     """Test the analytics functionality."""
@@ -148,5 +154,72 @@ def test_analytics():
     print("\n" + "=" * 50)
     print("✅ Analytics testing completed!")
 
+def test_analytics_snapshot():
+    """Dashboard snapshots are reused until a save, delete or goal change for that user."""
+    calculator = SalaryCalculator()
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(backend=CachedBackend(JsonFileBackend(os.path.join(tmp, "salary_data.json"))))
+        snapshots = SnapshotManager(storage=storage)
+        goals_file = os.path.join(tmp, "goals.json")
+        snapshots.goal_tracker = GoalTracker(goals_file=goals_file, storage=storage)
+        goal_tracker = GoalTracker(goals_file=goals_file, storage=storage)
+
+        for offset in range(1, 4):
+            day = (date.today() - timedelta(days=offset)).isoformat()
+            storage.save_calculation_with_date("u1", calculator.calculate_salary("08:30", "17:30"), day)
+        storage.save_calculation_with_date("u2", calculator.calculate_salary("08:30", "17:30"),
+                                           date.today().isoformat())
+
+        first = snapshots.get_dashboard("u1")
+        assert first.stats['total_days'] == 3 and first.streak_info['current_streak'] == 3
+        assert first.hours_chart and len(first.chart_data['chart_data']) == 14
+        assert snapshots.get_dashboard("u1") is first
+
+        # Another user's write leaves u1's snapshot alone
+        other = snapshots.get_dashboard("u2")
+        storage.save_calculation("u2", calculator.calculate_salary("09:00", "18:00"))
+        assert snapshots.get_dashboard("u1") is first
+        assert snapshots.get_dashboard("u2") is not other
+
+        storage.save_calculation("u1", calculator.calculate_salary("08:30", "17:30"))
+        saved = snapshots.get_dashboard("u1")
+        assert saved is not first and saved.stats['total_days'] == 4 and saved.streak_info['current_streak'] == 4
+
+        assert saved.goal_progress.get('error')
+        month_salary = storage.get_rollups("u1").month(date.today().strftime('%Y-%m')).total_salary
+        assert goal_tracker.set_monthly_goal("u1", 'salary', 300000).get('success')
+        with_goal = snapshots.get_dashboard("u1")
+        salary_goal = with_goal.goal_progress['progress']['salary']
+        assert with_goal is not saved and salary_goal['target'] == 300000
+        assert salary_goal['current'] == month_salary > 0
+        assert salary_goal['progress_percent'] == month_salary / 300000 * 100
+
+        assert goal_tracker.set_monthly_goal("u1", 'salary', 600000).get('success')
+        raised = snapshots.get_dashboard("u1")
+        assert raised is not with_goal
+        assert raised.goal_progress['progress']['salary']['progress_percent'] == month_salary / 600000 * 100
+        with_goal = raised
+        assert goal_tracker.delete_all_goals("u1")
+        assert snapshots.get_dashboard("u1") is not with_goal
+
+        before_delete = snapshots.get_dashboard("u1")
+        assert storage.delete_date_data("u1", date.today().isoformat())
+        after_delete = snapshots.get_dashboard("u1")
+        assert after_delete is not before_delete and after_delete.stats['total_days'] == 3
+        assert snapshots.get_dashboard("u1") is after_delete
+        print("✅ Dashboard snapshot reused until writes")
+
+    # A snapshot computed while the data changed is not stored
+    slot = SnapshotSlot()
+    generation = slot.generation
+    slot.clear()
+    slot.store(generation, "2025-01-01", "stale")
+    assert slot.get("2025-01-01") is None
+    slot.store(slot.generation, "2025-01-01", "fresh")
+    assert slot.get("2025-01-01") == "fresh" and slot.get("2025-01-02") is None
+    print("✅ Snapshots built across a write are discarded")
+
+
 if __name__ == "__main__":
-    test_analytics()
\ No newline at end of file
+    test_analytics()
+    test_analytics_snapshot()
\ No newline at end of file
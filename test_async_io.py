@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Test script to verify lazily built manager facades."""
+
+import asyncio
+import importlib
+import sys
+import threading
+from async_io import LazyFacade
+from metrics import metrics
+
+
+class Manager:
+    """Stand-in manager recording where it was built and called."""
+
+    built = []
+
+    def __init__(self):
+        Manager.built.append(threading.current_thread().name)
+
+    def get_value(self, value):
+        return value, threading.current_thread().name
+
+    def save_value(self, value):
+        return threading.current_thread().name
+
+
+def test_lazy_facade():
+    """The target is built once, on the first call, in a worker thread; calls are timed under the given name."""
+    Manager.built.clear()
+    facade = LazyFacade(Manager, "Manager")
+    assert not facade.built and Manager.built == []
+
+    async def scenario():
+        results = await asyncio.gather(*(facade.get_value(index) for index in range(20)))
+        writer = await facade.save_value(1)
+        return results, writer
+
+    metrics.reset()
+    results, writer = asyncio.run(scenario())
+    assert facade.built and len(Manager.built) == 1
+    assert Manager.built[0].startswith("blocking-")
+    assert [value for value, _ in results] == list(range(20))
+    assert all(thread.startswith("blocking-io") for _, thread in results)
+    assert writer.startswith("blocking-write")
+    assert metrics.snapshot()["Manager.get_value"]['count'] == 20
+    metrics.reset()
+
+    try:
+        facade._missing
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("private attributes must not be proxied")
+    print("✅ Lazy facade builds its target once, off the event loop")
+
+
+def test_deferred_imports():
+    """Importing the calendar manager no longer needs dateutil, and metrics no longer loads http.server."""
+    for name in ('calendar_manager', 'metrics', 'http.server'):
+        sys.modules.pop(name, None)
+    importlib.import_module('calendar_manager')
+    importlib.import_module('metrics')
+    assert 'http.server' not in sys.modules
+    print("✅ dateutil and http.server are imported only when used")
+
+
+if __name__ == "__main__":
+    test_lazy_facade()
+    test_deferred_imports()
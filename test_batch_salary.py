@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Test script to verify the batch salary engine against the scalar calculator."""
+
+from datetime import datetime
+from salary_calculator import SalaryCalculator
+from batch_salary import BatchSalaryCalculator, RESULT_FIELDS, np
+
+
+def _minutes_to_str(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _sample_minutes(calculator):
+    """A 20-minute grid plus shift-detection, night and break boundaries and their neighbours."""
+    minutes = set(range(0, 24 * 60, 20))
+    for boundary in (8 * 60 + 30, 17 * 60 + 30, 16 * 60 + 45, 85):
+        for delta in (-61, -60, -1, 0, 1, 60, 61):
+            minutes.add((boundary + delta) % (24 * 60))
+    boundaries = [calculator.NIGHT_START_HOUR * 60]
+    for config in calculator.shift_detector.get_all_shifts().values():
+        for break_start, break_end in config['breaks']:
+            for time_str in (break_start, break_end):
+                hours, mins = time_str.split(':')
+                boundaries.append(int(hours) * 60 + int(mins))
+    for boundary in boundaries:
+        for delta in (-1, 0, 1):
+            minutes.add((boundary + delta) % (24 * 60))
+    return sorted(minutes)
+
+
+def test_batch_matches_scalar():
+    """Every field equals calculate_salary bit for bit, for both engines."""
+    print("🧪 Testing Batch Salary Engine\n")
+    print("=" * 50)
+
+    calculator = SalaryCalculator()
+    sample = _sample_minutes(calculator)
+    starts = [start for start in sample for _ in sample]
+    ends = [end for _ in sample for end in sample]
+
+    engines = [BatchSalaryCalculator(calculator, use_numpy=False)]
+    if np is not None:
+        engines.append(BatchSalaryCalculator(calculator, use_numpy=True))
+
+    columns = [engine.calculate(starts, ends) for engine in engines]
+
+    for row, (start, end) in enumerate(zip(starts, ends)):
+        expected = calculator.calculate_salary(_minutes_to_str(start), _minutes_to_str(end))
+        for result in columns:
+            for field in RESULT_FIELDS:
+                value = result[field][row]
+                assert value == expected[field] and type(value) is type(expected[field]), \
+                    (start, end, field, value, expected[field])
+
+    print(f"✅ {len(starts)} shifts match the scalar path ({len(engines)} engine(s))")
+
+
+
+def test_schedule_changes():
+    """A change to the shift detector's times or breaks reaches an existing batch engine."""
+    calculator = SalaryCalculator()
+    engines = [BatchSalaryCalculator(calculator, use_numpy=False)]
+    if np is not None:
+        engines.append(BatchSalaryCalculator(calculator, use_numpy=True))
+    for engine in engines:
+        engine.calculate([510], [1050])
+
+    shifts = calculator.shift_detector.shifts
+    shifts['C341'].update(start='07:00', end='16:00', breaks=[('07:00', '07:10'), ('11:00', '12:00')])
+    shifts['C342']['breaks'] = shifts['C342']['breaks'][:2] + [('23:50', '00:20')]
+
+    sample = sorted({minutes % (24 * 60) for boundary in (420, 510, 960, 1050, 1005, 1430, 20)
+                     for minutes in range(boundary - 90, boundary + 91, 15)})
+    starts = [start for start in sample for _ in sample]
+    ends = [end for _ in sample for end in sample]
+    for engine in engines:
+        result = engine.calculate(starts, ends)
+        for row, (start, end) in enumerate(zip(starts, ends)):
+            expected = calculator.calculate_salary(_minutes_to_str(start), _minutes_to_str(end))
+            for field in RESULT_FIELDS:
+                assert result[field][row] == expected[field], (start, end, field, result[field][row])
+
+    assert calculator.calculate_salary("07:00", "16:00")['break_minutes'] == 70
+    assert engines[0].calculate([420], [960])['break_minutes'] == [70]
+    print(f"✅ Schedule changes picked up ({len(starts)} shifts match the scalar path)")
+
+def test_reprice_history():
+    """Re-pricing a stored history at new rates matches recalculating each entry."""
+    calculator = SalaryCalculator()
+    shifts = [("08:30", "17:30"), ("16:45", "01:25"), ("09:00", "23:00")]
+    user_data = {}
+    for day, (start, end) in enumerate(shifts, 1):
+        result = calculator.calculate_salary(start, end)
+        user_data[f"2025-07-{day:02d}"] = [{
+            'timestamp': '2025-07-01T00:00:00',
+            'start_time': start,
+            'end_time': end,
+            **{field: result[field] for field in RESULT_FIELDS}
+        }]
+
+    repriced = BatchSalaryCalculator(calculator).reprice_history(user_data, base_rate=2200, night_ot_rate=2750)
+
+    new_rates = SalaryCalculator()
+    new_rates.BASE_RATE, new_rates.NIGHT_OT_RATE = 2200, 2750
+    for day, (start, end) in enumerate(shifts, 1):
+        entry = repriced[f"2025-07-{day:02d}"][0]
+        expected = new_rates.calculate_salary(start, end)
+        assert entry['timestamp'] == '2025-07-01T00:00:00'
+        for field in RESULT_FIELDS:
+            assert entry[field] == expected[field], (start, end, field)
+    assert user_data["2025-07-01"][0]['total_salary'] != repriced["2025-07-01"][0]['total_salary']
+    print("✅ History re-priced at new rates")
+
+
+def test_break_table_matches_legacy():
+    """The compiled break table deducts what the per-break overlap loop does."""
+    calculator = SalaryCalculator()
+    sample = _sample_minutes(calculator)
+    for shift_type in ('C341', 'C342'):
+        breaks = calculator.shift_detector.get_shift_config(shift_type)['breaks']
+        table = calculator.shift_detector.get_break_table(shift_type)
+        for start in sample:
+            for end in sample:
+                expected = calculator.calculate_break_deductions(
+                    datetime(1900, 1, 1, start // 60, start % 60), datetime(1900, 1, 1, end // 60, end % 60), breaks)
+                assert table.deduct_with_details(start, end) == expected, (shift_type, start, end)
+                assert table.deduct(start, end) == expected[0], (shift_type, start, end)
+    print("✅ Break tables match the per-break overlap loop")
+
+
+def test_memoized_results():
+    """Repeated windows hit the memo; rate or break changes invalidate it."""
+    calculator = SalaryCalculator()
+    first = calculator.calculate_salary("08:30", "17:30")
+    first['break_details'].clear()
+    second = calculator.calculate_salary("08:30", "17:30")
+    assert calculator.memo_hits == 1 and calculator.memo_misses == 1
+    assert second['break_details'], "callers must not share the cached result"
+    assert second == SalaryCalculator().calculate_salary("08:30", "17:30")
+
+    calculator.BASE_RATE = 2200
+    repriced = calculator.calculate_salary("08:30", "17:30")
+    assert calculator.memo_misses == 2
+    assert repriced['regular_salary'] == (repriced['regular_minutes'] / 60) * 2200
+
+    calculator.shift_detector.shifts['C341']['breaks'].append(('12:00', '12:30'))
+    with_lunch = calculator.calculate_salary("08:30", "17:30")
+    assert calculator.memo_misses == 3
+    assert with_lunch['break_minutes'] == repriced['break_minutes'] + 30
+    print("✅ Memoized results invalidated by rate and break changes")
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar()
+    test_schedule_changes()
+    test_reprice_history()
+    test_break_table_matches_legacy()
+    test_memoized_results()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Test script to verify the date-indexed calendar events."""
+
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from calendar_manager import CalendarManager, EventIndex
+from data_storage import DataStorage
+
+
+def make_manager(tmp: str) -> CalendarManager:
+    return CalendarManager(calendar_file=os.path.join(tmp, "calendar_data.json"),
+                           storage=DataStorage(os.path.join(tmp, "salary_data.json")))
+
+
+def test_event_index():
+    """Events are sorted by date, keep insertion order within a date, and are found by id."""
+    events = [
+        {"id": "c", "date": "2024-03-05"},
+        {"id": "a", "date": "2024-03-01"},
+        {"id": "bad", "date": "someday"},
+        {"id": "b", "date": "2024-03-05"},
+    ]
+    index = EventIndex(events)
+    assert [event["id"] for event in events] == ["bad", "a", "c", "b"]
+    index.add({"id": "d", "date": "2024-03-03"})
+    index.add({"id": "e", "date": "2024-03-05"})
+    matches = index.between(date(2024, 3, 2), date(2024, 3, 5))
+    assert [event["id"] for _, event in matches] == ["d", "c", "b", "e"]
+    assert matches[0][0] == date(2024, 3, 3)
+
+    assert index.remove("c")["id"] == "c"
+    assert index.remove("c") is None
+    assert [event["id"] for _, event in index.between(date(2024, 3, 5), date(2024, 3, 5))] == ["b", "e"]
+    assert len(index.keys) == len(index.events) == 5
+    print("✅ Event index keeps date order and finds events by id")
+
+
+def test_calendar_queries():
+    """Upcoming, today and monthly queries return the same shapes as before, from the index."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_manager(tmp)
+        today = date.today()
+        for offset in (40, 3, 0, -2, 3):
+            day = (today + timedelta(days=offset)).isoformat()
+            assert manager.add_user_event("7", day, "custom", f"in {offset}").get("success")
+
+        upcoming = manager.get_user_events("7", 30)
+        assert [event["days_until"] for event in upcoming["events"]] == [0, 3, 3]
+        assert [event["description"] for event in upcoming["events"]] == ["in 0", "in 3", "in 3"]
+        assert upcoming["total_events"] == 3
+        assert manager.get_user_events("8").get("error")
+
+        today_events = manager.get_today_events("7")
+        assert today_events["total"] == 1 and today_events["events"][0]["description"] == "in 0"
+        assert manager.get_today_events("8")["total"] == 0
+
+        monthly = manager.get_monthly_calendar("7", today.year, today.month)
+        expected = sum(1 for offset in (40, 3, 0, -2, 3)
+                       if (today + timedelta(days=offset)).strftime("%Y-%m") == today.strftime("%Y-%m"))
+        assert monthly["total_events"] == expected
+        assert all(event["day"] == int(event["date"][-2:]) for event in monthly["events"])
+        assert manager.get_monthly_calendar("7", today.year, 13).get("error")
+    print("✅ Calendar queries are served by date range")
+
+
+def test_delete_and_persistence():
+    """Deletes find events by id, ids stay unique, and changes reach storage and other managers."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = make_manager(tmp)
+        day = (date.today() + timedelta(days=1)).isoformat()
+        first = manager.add_user_event("7", day, "custom", "first")["event"]
+        second = manager.add_user_event("7", day, "custom", "second")["event"]
+        assert manager.delete_user_event("7", first["id"]).get("success")
+        assert manager.delete_user_event("7", first["id"]).get("error")
+        third = manager.add_user_event("7", day, "custom", "third")["event"]
+        assert third["id"] != second["id"]
+
+        other = make_manager(tmp)
+        assert [event["description"] for event in other.get_user_events("7")["events"]] == ["second", "third"]
+
+        # A change saved by another manager is picked up on the next read
+        other.delete_user_event("7", second["id"])
+        assert [event["description"] for event in manager.get_user_events("7")["events"]] == ["third"]
+    print("✅ Event changes are written through and reloaded when storage changes")
+
+
+def test_delete_duplicate_ids():
+    """Events sharing an id in an older calendar file are deleted one by one, first stored first."""
+    with tempfile.TemporaryDirectory() as tmp:
+        events = [
+            {"id": "u_x_1", "date": "2024-03-09", "type": "custom", "description": "A"},
+            {"id": "u_x_1", "date": "2024-03-05", "type": "custom", "description": "B"},
+        ]
+        with open(os.path.join(tmp, "calendar_data.json"), "w", encoding="utf-8") as f:
+            json.dump({"users": {"u": {"events": events}}, "salary_payment_day": 25, "global_events": []}, f)
+        manager = make_manager(tmp)
+
+        assert "'A'" in manager.delete_user_event("u", "u_x_1")["message"]
+        assert "'B'" in manager.delete_user_event("u", "u_x_1")["message"]
+        assert manager.delete_user_event("u", "u_x_1").get("error")
+        assert manager.load_calendar_data()["users"]["u"]["events"] == []
+    print("✅ Events with a repeated id can all be deleted")
+
+
+if __name__ == "__main__":
+    test_event_index()
+    test_calendar_queries()
+    test_delete_and_persistence()
+    test_delete_duplicate_ids()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Test script to verify table-driven callback routing."""
+
+import ast
+import asyncio
+from callback_router import CallbackRouter
+from metrics import metrics
+from benchmark_dispatch import bot_routes
+
+
+def test_routing():
+    """Exact keys win over prefixes, unknown data is not dispatched, hooks see every route."""
+    calls = []
+
+    def handler(name):
+        async def handle(*args):
+            calls.append((name, args))
+            if args and args[0] == "boom":
+                raise ValueError("boom")
+        return handle
+
+    router = CallbackRouter()
+    router.add("back_to_main", handler("main"))
+    router.add("day_shift_manual", handler("manual"))
+    router.add_prefix("day_shift_", handler("day"))
+    seen = []
+    router.add_hook(lambda route, seconds, error: seen.append((route, error is not None)))
+
+    async def scenario():
+        assert await router.dispatch("back_to_main", "a")
+        assert await router.dispatch("day_shift_manual")
+        assert await router.dispatch("day_shift_17:00", "day_shift_17:00")
+        assert not await router.dispatch("missing")
+        assert not await router.dispatch(None)
+        try:
+            await router.dispatch("day_shift_boom", "boom")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("handler errors must propagate")
+
+    metrics.reset()
+    asyncio.run(scenario())
+    assert [name for name, _ in calls] == ["main", "manual", "day", "day"]
+    assert calls[0][1] == ("a",)
+    assert seen == [("callback.back_to_main", False), ("callback.day_shift_manual", False),
+                    ("callback.day_shift_*", False), ("callback.day_shift_*", True)]
+    assert metrics.snapshot()["callback.unknown"]['count'] == 2
+    metrics.reset()
+
+    for register in (lambda: router.add("back_to_main", handler("again")),
+                     lambda: router.add_prefix("day_shift_", handler("again"))):
+        try:
+            register()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("duplicate routes must be rejected")
+    print("✅ Exact, prefix and unknown callbacks routed; hooks and metrics record each route")
+
+
+def test_bot_routes_have_handlers():
+    """Every route in SalaryTelegramBot points at an async handler method with the router signature."""
+    keys, prefixes = bot_routes()
+    assert len(keys) == len(set(keys)) and "back_to_main" in keys and "day_shift_manual" in keys
+    assert prefixes == ["day_shift_", "night_shift_", "preset_"]
+
+    with open("main.py", 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    bot = next(node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == "SalaryTelegramBot")
+    methods = {node.name: node for node in bot.body if isinstance(node, ast.AsyncFunctionDef)}
+    builder = next(node for node in bot.body if getattr(node, 'name', None) == "_build_callback_router")
+    referenced = {node.attr for node in ast.walk(builder)
+                  if isinstance(node, ast.Attribute) and node.attr.startswith("_on_")}
+    assert referenced, "no handlers registered"
+    for name in referenced:
+        assert name in methods, name
+        assert [arg.arg for arg in methods[name].args.args] == ['self', 'query', 'context', 'user_id',
+                                                               'callback_data'], name
+    print(f"✅ {len(keys)} keys and {len(prefixes)} prefixes map to {len(referenced)} handler methods")
+
+
+if __name__ == "__main__":
+    test_routing()
+    test_bot_routes_have_handlers()
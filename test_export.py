@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Test script to verify streaming CSV/JSON exports."""
+
+import io
+import json
+import os
+import struct
+import tempfile
+import tracemalloc
+from array import array
+from datetime import date, timedelta
+from salary_calculator import SalaryCalculator
+from batch_salary import RESULT_FIELDS
+from data_storage import DataStorage
+from storage_backends import JsonFileBackend, SqliteBackend
+from user_cache import CachedBackend
+import export_manager
+from export_manager import ExportManager
+from columnar import MAGIC, ColumnarBuilder, read_columnar
+
+
+def _storage_with_history(tmp, days):
+    storage = DataStorage(backend=CachedBackend(JsonFileBackend(os.path.join(tmp, "salary_data.json"))))
+    result = SalaryCalculator().calculate_salary("08:30", "17:30")
+    entry = {'timestamp': '2020-01-01T00:00:00', 'start_time': '08:30', 'end_time': '17:30',
+             **{field: result[field] for field in RESULT_FIELDS}}
+    user_data = {(date(2020, 1, 1) + timedelta(days=offset)).isoformat(): [entry] for offset in range(days)}
+    storage.save_user_data("user_e", user_data)
+    return storage
+
+
+def test_streamed_exports_match():
+    """Spooled exports carry the same bytes as the string exports."""
+    print("🧪 Testing Streaming Exports\n")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ExportManager(storage=_storage_with_history(tmp, 40))
+
+        with manager.open_export("user_e", 'csv', None, encoding='utf-8-sig') as csv_file:
+            content = csv_file.read()
+        assert content.startswith(b'\xef\xbb\xbf')
+        assert content.decode('utf-8-sig') == manager.export_to_csv("user_e", None)
+        assert content.count(b'\r\n') == 41
+
+        with manager.open_export("user_e", 'json', None) as json_file:
+            exported = json.loads(json_file.read().decode('utf-8'))
+        assert exported['calculations'] == manager.storage.load_user_data("user_e")
+        assert exported['period_days'] is None
+
+        assert manager.open_export("nobody", 'csv') is None
+        assert manager.export_to_csv("nobody") is None
+        assert manager.export_to_json("nobody") is None
+        print("✅ Spooled CSV and JSON match the string exports")
+
+
+
+def test_export_window_streams_from_backend():
+    """Exports cover only the requested days and leave the user cache alone."""
+    result = SalaryCalculator().calculate_salary("08:30", "17:30")
+    entry = {'start_time': '08:30', 'end_time': '17:30', **{field: result[field] for field in RESULT_FIELDS}}
+    today = date.today()
+    user_data = {(today - timedelta(days=offset)).isoformat(): [entry] for offset in range(400)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite = SqliteBackend(os.path.join(tmp, "salary_data.db"))
+        sqlite.DATE_PAGE = 64  # several pages of dates per export
+        for backend in (JsonFileBackend(os.path.join(tmp, "salary_data.json")), sqlite):
+            cache = CachedBackend(backend)
+            backend.save_user("user_w", user_data)
+            manager = ExportManager(storage=DataStorage(backend=cache))
+
+            rows = list(manager.iter_csv_rows("user_w", 30))
+            assert len(rows) == 31 and rows[1][0] == (today - timedelta(days=29)).isoformat()
+            assert rows[-1][0] == today.isoformat()
+            assert len(list(manager.iter_csv_rows("user_w", 365))) == 366
+
+            chunks = list(manager.iter_json_chunks("user_w", 365))
+            assert len(chunks) == 367, "object shell, one chunk per date, closing braces"
+            exported = json.loads(''.join(chunks))
+            assert exported['period_days'] == 365 and len(exported['calculations']) == 365
+            assert list(exported['calculations']) == sorted(exported['calculations'])
+
+            with manager.open_export("user_w", 'json', None) as json_file:
+                assert json.loads(json_file.read().decode('utf-8'))['calculations'] == user_data
+            with manager.open_export("user_w", 'columnar', 7) as columnar_file:
+                assert read_columnar(columnar_file)['rows'] == 7
+
+            # One-off exports neither load the user into the cache nor pin a view there
+            assert not cache._entries and cache.misses == 0
+            assert cache.cached_views("user_w") == {}
+    print("✅ Exports stream only the requested days from the backend")
+
+def test_export_memory_is_bounded():
+    """Large exports spill to disk instead of growing in memory."""
+    original = export_manager.SPOOL_MAX_SIZE
+    export_manager.SPOOL_MAX_SIZE = 64 * 1024
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = ExportManager(storage=_storage_with_history(tmp, 3000))
+            manager.storage.load_user_data("user_e")  # warm the cache
+
+            tracemalloc.start()
+            with manager.open_export("user_e", 'json', None) as json_file:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                assert json_file._rolled, "export should have rolled over to a temp file"
+                size = json_file.seek(0, os.SEEK_END)
+
+            assert size > 1024 * 1024
+            # Only the per-date index of the history is held, never the rendered export
+            assert peak < size / 2, (peak, size)
+            print(f"✅ {size // 1024} KiB export streamed with a {peak // 1024} KiB peak")
+    finally:
+        export_manager.SPOOL_MAX_SIZE = original
+
+
+def test_columnar_exports():
+    """Columnar files round-trip every entry and are much smaller than the JSON export."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = _storage_with_history(tmp, 400)
+        storage.save_calculation_with_date("user_f", SalaryCalculator().calculate_salary("16:45", "01:25"), "2020-02-03")
+        manager = ExportManager(storage=storage)
+
+        with manager.open_export("user_e", 'columnar', None) as columnar_file:
+            content = columnar_file.read()
+        table = read_columnar(io.BytesIO(content))
+        user_data = storage.load_user_data("user_e")
+        assert table['rows'] == 400 and table['meta']['user_id'] == "user_e"
+        assert table['dictionaries']['shift_type'] == ['C341']
+        assert table['columns']['date'] == sorted(user_data)
+        for row, date_str in enumerate(table['columns']['date']):
+            entry = user_data[date_str][0]
+            for field in RESULT_FIELDS:
+                assert table['columns'][field][row] == entry[field], (date_str, field)
+            assert table['columns']['start_time'][row] == entry['start_time']
+
+        json_size = len(manager.export_to_json("user_e", None).encode('utf-8'))
+        assert len(content) * 3 < json_size, (len(content), json_size)
+        print(f"✅ Columnar export round-trips ({len(content)} bytes vs {json_size} bytes of JSON)")
+
+        output_dir = os.path.join(tmp, "exports")
+        result = manager.export_all_users_monthly(output_dir, year=2020)
+        assert result['users'] == 2 and result['records'] == 367, result
+        assert len(result['files']) == 12
+        assert len(manager.export_all_users_monthly(output_dir)['files']) == 14
+        with open(os.path.join(output_dir, "salary_2020-02.spcol"), 'rb') as f:
+            february = read_columnar(f)
+        assert february['rows'] == 30 and february['meta']['month'] == "2020-02"
+        assert february['columns']['user_id'].count("user_f") == 1
+        assert february['dictionaries']['shift_type'] == ['C341', 'C342']
+        print("✅ All users exported as one columnar file per month")
+
+
+def test_all_users_export_at_scale():
+    """More users than a uint16 code holds export in one pass that leaves the user cache alone."""
+    users = 70000
+    entry = {'start_time': '08:30', 'end_time': '17:30', 'total_minutes': 540, 'total_salary': 12000.0}
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "salary_data.json")
+        with open(data_file, 'w', encoding='utf-8') as f:
+            json.dump({f"u{index}": {"2024-03-01": [entry], "2024-04-01": [entry]} for index in range(users)}, f)
+        cache = CachedBackend(JsonFileBackend(data_file))
+        manager = ExportManager(storage=DataStorage(backend=cache))
+
+        output_dir = os.path.join(tmp, "exports")
+        result = manager.export_all_users_monthly(output_dir)
+        assert 'error' not in result, result
+        assert result['users'] == users and result['records'] == users * 2
+        assert not cache._entries and cache.misses == 0
+        assert sorted(os.listdir(output_dir)) == ["salary_2024-03.spcol", "salary_2024-04.spcol"]
+
+        with open(os.path.join(output_dir, "salary_2024-04.spcol"), 'rb') as f:
+            april = read_columnar(f)
+        assert april['rows'] == users and april['columns']['user_id'][-1] == f"u{users - 1}"
+        assert april['columns']['user_id'][65536] == "u65536" and set(april['columns']['date']) == {"2024-04-01"}
+
+    # Files written with the earlier uint16 codes still read
+    builder = ColumnarBuilder()
+    builder.add("old", "2024-01-01", entry)
+    content = io.BytesIO()
+    builder.write(content)
+    content.seek(len(MAGIC))
+    header_length, = struct.unpack('<I', content.read(4))
+    header = json.loads(content.read(header_length))
+    body = content.read()
+    assert header['columns'][0] == {'name': 'user_id', 'type': 'uint32', 'length': 4}
+    header['columns'][0].update(type='uint16', length=2)
+    header_bytes = json.dumps(header).encode('utf-8')
+    legacy = MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes + array('H', [0]).tobytes() + body[4:]
+    table = read_columnar(io.BytesIO(legacy))
+    assert table['columns']['user_id'] == ["old"] and table['columns']['total_salary'][0] == 12000.0
+    print("✅ All-users export handles more than 65,535 users and bypasses the cache")
+
+
+if __name__ == "__main__":
+    test_streamed_exports_match()
+    test_export_window_streams_from_backend()
+    test_export_memory_is_bounded()
+    test_columnar_exports()
+    test_all_users_export_at_scale()
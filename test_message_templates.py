@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Test script to verify compiled message templates and cached message text."""
+
+from analytics_snapshot import AnalyticsSnapshot
+from burmese_formatter import BurmeseFormatter
+from message_templates import MessageTemplate
+from salary_calculator import SalaryCalculator
+
+STATS = {'total_days': 12, 'total_work_hours': 101.5, 'total_salary': 245000.0, 'total_regular_hours': 90.0,
+         'total_ot_hours': 11.5, 'avg_daily_hours': 8.5, 'avg_daily_salary': 20416.7}
+HISTORY = {'history': [{'date': '2024-03-06', 'hours': 9.0, 'ot_hours': 1.4, 'salary': 19800.0, 'shifts': 'C341'}]}
+
+
+def test_template_render():
+    """Slots are formatted like str.format; static text, escaped braces included, is kept as is."""
+    template = MessageTemplate("¥{salary:,.0f} {{raw}} {name:>5}|{salary:.1f}")
+    assert template.fields == ('salary', 'name')
+    values = {'salary': 1234.56, 'name': 'ab'}
+    assert template.render(**values) == template.source.format(**values) == "¥1,235 {raw}    ab|1234.6"
+    assert MessageTemplate("no slots").render() == "no slots"
+
+    for source in ("{0}", "{}", "{a.b}", "{a!r}"):
+        try:
+            MessageTemplate(source)
+            assert False, source
+        except ValueError:
+            pass
+    print("✅ Templates render like str.format")
+
+
+def test_salary_text_cache():
+    """A repeated calculation reuses its text, and the text matches a fresh render."""
+    calculator = SalaryCalculator()
+    formatter = BurmeseFormatter()
+    result = calculator.calculate_salary("16:45", "01:25")
+    text = formatter.format_salary_response(result)
+    assert formatter.format_salary_response(calculator.calculate_salary("16:45", "01:25")) is text
+    assert (formatter.render_hits, formatter.render_misses) == (1, 1)
+    assert text == BurmeseFormatter().format_salary_response(result)
+
+    ot = formatter._minutes_to_hours(result['ot_minutes']) + formatter._minutes_to_hours(result['night_ot_minutes'])
+    assert f"🔴 OT ({ot} နာရီ x ¥2,625): ¥{result['ot_salary'] + result['night_ot_salary']:,.0f}" in text
+    assert f"💰 **စုစုပေါင်းလစာ: ¥{result['total_salary']:,.0f}**" in text
+    assert formatter.format_salary_response({'error': 'bad'}) == "❌ **အမှားရှိသည်**\n\nbad"
+    assert [formatter._minutes_to_hours(m) for m in (0, 45, 60, 455)] == ["0မိနစ်", "45မိနစ်", "1နာရီ", "7နာရီ 35မိနစ်"]
+    print("✅ Salary text is cached for repeated calculations")
+
+
+def test_dashboard_text_per_snapshot():
+    """Dashboard text is rendered once per snapshot; a new snapshot is rendered again."""
+    formatter = BurmeseFormatter()
+    goals = {'month': '2024-03', 'progress': {'salary': {'progress_percent': 61.25, 'current': 245000.0,
+                                                         'target': 400000}}}
+    snapshot = AnalyticsSnapshot('2024-03-07', STATS, HISTORY, {'chart_data': []}, "▇▇ 9.0", goals,
+                                 {'current_streak': 3, 'longest_streak': 7})
+
+    premium = formatter.format_premium_dashboard(snapshot)
+    assert formatter.format_premium_dashboard(snapshot) is premium
+    assert "│ 📅 အလုပ်လုပ်ရက်:              12 ရက် │" in premium
+    assert "│ [██████░░░░] │" in premium
+    assert "│ 📅 2024-03-06:  9.0နာရီ (OT:1.4နာရီ) = ¥19,800 │" in premium
+    assert "• 🏆 အမြင့်ဆုံး Streak: 7 ရက်" in premium and "🔥 အလွန်ကောင်း" in premium
+
+    dashboard = formatter.format_dashboard(snapshot)
+    assert formatter.format_dashboard(snapshot) is dashboard
+    assert "\n▇▇ 9.0\n" in dashboard
+    assert "📅 2024-03-06: 9.0နာရီ (OT: 1.4နာရီ) = ¥19,800\n" in dashboard
+
+    empty = AnalyticsSnapshot('2024-03-07', {'error': 'no data'}, {}, {'error': 'no data'}, None, {}, {})
+    assert "❌ **ဒေတာမရှိသေးပါ:** no data" in formatter.format_premium_dashboard(empty)
+    assert "❌ **အမှားရှိသည်:** no data" in formatter.format_dashboard(empty)
+    print("✅ Dashboard text is rendered once per snapshot")
+
+
+if __name__ == "__main__":
+    test_template_render()
+    test_salary_text_cache()
+    test_dashboard_text_per_snapshot()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Test script to verify the all-users missing-entry scan."""
+
+import os
+import tempfile
+from datetime import date, timedelta
+from data_storage import DataStorage
+from missing_entries import MissingEntryScanner, WorkedDaysWindow
+from storage_backends import JsonFileBackend, SqliteBackend, JournaledJsonBackend, PackedRecordBackend
+
+# A Thursday, so the window of 7 days before it holds one weekend
+TODAY = date(2024, 3, 7)
+ENTRY = {'start_time': '08:30', 'end_time': '17:30', 'total_minutes': 540, 'total_salary': 12000.0}
+
+
+def _day(days_ago: int) -> str:
+    return (TODAY - timedelta(days=days_ago)).isoformat()
+
+
+# user -> dates with entries
+USERS = {
+    'logged': [_day(1), _day(2), _day(3)],
+    'forgot': [_day(2), _day(3), _day(6)],
+    'idle': [_day(30)],
+    'weekend_only': [_day(4), _day(5)],
+}
+
+
+def test_window_bitmap():
+    """Bit i is the day start + i; weekends never count as missing."""
+    window = WorkedDaysWindow(TODAY, 7)
+    assert window.end == TODAY - timedelta(days=1) and window.start == TODAY - timedelta(days=7)
+    # 2024-03-02 and 03-03 (bits 2 and 3) are the weekend
+    assert window.weekday_mask == 0b1110011 and window.yesterday_bit == 1 << 6
+    worked = window.bitmap([_day(1), _day(3), _day(40)])
+    assert worked == 0b1010000
+    assert window.dates(window.missing(worked)) == [TODAY - timedelta(days=2), TODAY - timedelta(days=6),
+                                                   TODAY - timedelta(days=7)]
+    print("✅ Worked days map onto a bitmap of the window")
+
+
+def _seed(storage: DataStorage) -> None:
+    for user_id, dates in USERS.items():
+        storage.save_user_data(user_id, {date_str: [dict(ENTRY)] for date_str in dates})
+
+
+def test_send_list_all_backends():
+    """Every backend streams the same worked dates, so the send list is the same."""
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            'json': JsonFileBackend(os.path.join(tmp, "salary_data.json")),
+            'sqlite': SqliteBackend(os.path.join(tmp, "salary_data.db")),
+            'journal': JournaledJsonBackend(os.path.join(tmp, "salary_data.snapshot.json"), compact_interval=3600),
+            'packed': PackedRecordBackend(os.path.join(tmp, "packed")),
+        }
+        for name, backend in backends.items():
+            storage = DataStorage(backend=backend)
+            _seed(storage)
+            scanner = MissingEntryScanner(storage=storage)
+
+            scanned = {user_id: (worked, missing) for user_id, worked, missing in scanner.scan(TODAY)}
+            assert set(scanned) == set(USERS), name
+            assert scanned['idle'] == (0, 0b1110011), name
+
+            send_list = scanner.build_send_list(TODAY)
+            assert sorted(user_id for user_id, _ in send_list) == ['forgot', 'weekend_only'], name
+            assert all(_day(1) in message for _, message in send_list)
+        backends['journal'].close()
+    print("✅ Send list lists only active users missing yesterday, on every backend")
+
+
+def test_no_nudges_after_weekend():
+    """On a Monday yesterday is Sunday, so nobody is nudged."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(backend=JsonFileBackend(os.path.join(tmp, "salary_data.json")))
+        _seed(storage)
+        assert MissingEntryScanner(storage=storage).build_send_list(date(2024, 3, 4)) == []
+    print("✅ No nudges for weekends")
+
+
+if __name__ == "__main__":
+    test_window_bitmap()
+    test_send_list_all_backends()
+    test_no_nudges_after_weekend()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Test script to verify work reminder scheduling and delivery."""
+
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from data_storage import DataStorage
+from notifications import NotificationManager
+from reminder_scheduler import ReminderScheduler, next_fire_time
+
+
+class FakeClock:
+    """Clock the tests can move forward by hand."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_heap_order():
+    """Reminders come out in fire-time order and are rescheduled for the next day."""
+    start = datetime(2024, 3, 1, 7, 0).timestamp()
+    clock = FakeClock(start)
+    scheduler = ReminderScheduler(clock=clock)
+    count = scheduler.load({
+        'a': {'work_reminder': {'time': '08:30', 'message': 'A', 'enabled': True}},
+        'b': {'work_reminder': {'time': '08:00', 'message': 'B', 'enabled': True}},
+        'c': {'work_reminder': {'time': '09:00', 'message': 'C', 'enabled': False}},
+        'd': {'work_reminder': {'time': 'later', 'enabled': True}},
+        'e': {}
+    })
+    assert count == 2 and len(scheduler) == 2
+    assert scheduler.pop_due() == []
+    assert scheduler.seconds_until_next() == 3600
+
+    clock.now = datetime(2024, 3, 1, 9, 0).timestamp()
+    assert scheduler.pop_due(limit=1) == [('b', 'B')]
+    assert scheduler.pop_due() == [('a', 'A')]
+    assert scheduler.pop_due() == []
+    assert scheduler.seconds_until_next() == 23 * 3600
+
+    # Rescheduling replaces the old time; cancelling skips the stale heap item
+    scheduler.schedule('a', '10:00', 'A2')
+    scheduler.cancel('b')
+    clock.now = datetime(2024, 3, 2, 11, 0).timestamp()
+    assert scheduler.pop_due() == [('a', 'A2')]
+    assert len(scheduler) == 1
+    print("✅ Reminders fire in order, once per day, and follow schedule/cancel")
+
+
+def test_missed_days_skipped():
+    """A reminder overdue by several days fires once and moves to the next future time."""
+    clock = FakeClock(datetime(2024, 3, 1, 7, 0).timestamp())
+    scheduler = ReminderScheduler(clock=clock)
+    scheduler.schedule('a', '08:00')
+    clock.now = datetime(2024, 3, 5, 12, 0).timestamp()
+    assert len(scheduler.pop_due()) == 1
+    assert scheduler.pop_due() == []
+    assert clock.now + scheduler.seconds_until_next() == datetime(2024, 3, 6, 8, 0).timestamp()
+    print("✅ Missed days are not replayed")
+
+
+def test_run_delivers_in_batches():
+    """run() sends due reminders at the configured rate and picks up new ones without polling."""
+    # Shift the clock so the next minute starts 0.2 s from now
+    now = datetime.now()
+    boundary = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    offset = boundary.timestamp() - 0.2 - time.time()
+    scheduler = ReminderScheduler(clock=lambda: time.time() + offset)
+    time_str = boundary.strftime('%H:%M')
+    sent = []
+
+    async def send(user_id, message):
+        sent.append((user_id, time.monotonic()))
+        if user_id == 'broken':
+            raise RuntimeError("chat not found")
+
+    async def scenario():
+        task = asyncio.create_task(scheduler.run(send, rate=10))
+        await asyncio.sleep(0.05)
+        for index in range(20):
+            scheduler.schedule(str(index), time_str)
+        scheduler.schedule('broken', time_str)
+        started = time.monotonic()
+        await asyncio.sleep(2.5)
+        task.cancel()
+        return started
+
+    started = asyncio.run(scenario())
+    assert sorted(user_id for user_id, _ in sent) == sorted([str(index) for index in range(20)] + ['broken'])
+    # 21 reminders at 10 per second: three batches, the last one at least two seconds in
+    assert max(at for _, at in sent) - started >= 2.0
+    assert min(at for _, at in sent) - started < 1.0
+    print("✅ Due reminders are delivered in rate-limited batches")
+
+
+def test_notification_manager_updates_scheduler():
+    """Setting or disabling a reminder updates a scheduler that is already running."""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = os.getcwd()
+        os.chdir(tmp)
+        try:
+            manager = NotificationManager(storage=DataStorage(os.path.join(tmp, "salary_data.json")))
+            manager.set_work_reminder('1', '08:00')
+            scheduler = manager.get_scheduler()
+            assert len(scheduler) == 1
+
+            manager.set_work_reminder('2', '09:15', 'hello')
+            assert len(scheduler) == 2
+            manager.disable_reminder('1', 'work_reminder')
+            assert len(scheduler) == 1
+            assert manager.get_scheduler() is scheduler
+        finally:
+            os.chdir(previous)
+    print("✅ NotificationManager keeps its scheduler in step with saved reminders")
+
+
+def test_next_fire_time():
+    base = datetime(2024, 3, 1, 8, 0).timestamp()
+    assert next_fire_time('08:00', base) == datetime(2024, 3, 2, 8, 0).timestamp()
+    assert next_fire_time('08:01', base) == datetime(2024, 3, 1, 8, 1).timestamp()
+    print("✅ Next fire time is strictly in the future")
+
+
+if __name__ == "__main__":
+    test_next_fire_time()
+    test_heap_order()
+    test_missed_days_skipped()
+    test_run_delivers_in_batches()
+    test_notification_manager_updates_scheduler()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Test script to verify incremental day/week/month rollups."""
+
+import os
+import tempfile
+from datetime import date, timedelta
+from salary_calculator import SalaryCalculator
+from data_storage import DataStorage
+from storage_backends import JsonFileBackend
+from user_cache import CachedBackend
+from rollups import UserRollups, WorkedDays, SUM_FIELDS, week_key
+from analytics import Analytics
+from goal_tracker import GoalTracker
+from export_manager import ExportManager
+from notifications import NotificationManager
+from shift_record import ShiftRecord, ShiftRecords
+
+
+def _scan(user_data, keep):
+    """Sum entries the slow way for the dates accepted by keep(date_str)."""
+    totals = {field: 0 for field in SUM_FIELDS}
+    days = 0
+    for date_str, entries in user_data.items():
+        if not entries or not keep(date_str):
+            continue
+        days += 1
+        for entry in entries:
+            for field in SUM_FIELDS:
+                totals[field] += entry[field]
+    totals['days'] = days
+    return totals
+
+
+def _totals(rollup_totals):
+    result = {field: getattr(rollup_totals, field) for field in SUM_FIELDS} if rollup_totals else \
+        {field: 0 for field in SUM_FIELDS}
+    result['days'] = rollup_totals.days if rollup_totals else 0
+    return result
+
+
+def _check(storage, user_id):
+    """Rollups kept by the cache match both a fresh build and a raw scan."""
+    user_data = storage.load_user_data(user_id)
+    rollups = storage.get_rollups(user_id)
+    rebuilt = UserRollups(user_data)
+
+    for month_key in {date_str[:7] for date_str in user_data}:
+        expected = _scan(user_data, lambda d: d.startswith(month_key))
+        assert _totals(rollups.month(month_key)) == expected, month_key
+        assert _totals(rebuilt.month(month_key)) == expected, month_key
+
+    for date_str in user_data:
+        day = date.fromisoformat(date_str)
+        expected = _scan(user_data, lambda d: week_key(date.fromisoformat(d)) == week_key(day))
+        assert _totals(rollups.week(day)) == expected, date_str
+
+
+def test_incremental_rollups():
+    """Saves and deletes update rollups to the same totals as a full rescan."""
+    print("🧪 Testing Incremental Rollups\n")
+    print("=" * 50)
+
+    calculator = SalaryCalculator()
+    results = [calculator.calculate_salary("08:30", "17:30"),
+               calculator.calculate_salary("16:45", "01:25"),
+               calculator.calculate_salary("09:00", "20:00")]
+    today = date.today()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(backend=CachedBackend(JsonFileBackend(os.path.join(tmp, "salary_data.json"))))
+
+        for days_ago in range(0, 75, 2):
+            target_date = (today - timedelta(days=days_ago)).isoformat()
+            storage.save_calculation_with_date("user_a", results[days_ago % 3], target_date)
+        # Build the rollups, then keep saving so they are updated incrementally
+        storage.get_rollups("user_a")
+        for days_ago in range(0, 75, 3):
+            target_date = (today - timedelta(days=days_ago)).isoformat()
+            storage.save_calculation_with_date("user_a", results[days_ago % 3], target_date)
+        _check(storage, "user_a")
+        print("✅ Rollups match a full scan after saves")
+
+        assert storage.delete_date_data("user_a", today.isoformat())
+        assert storage.delete_old_data("user_a", 40)
+        _check(storage, "user_a")
+        print("✅ Rollups match a full scan after deletes")
+
+        # Dashboard stats agree with the old per-entry scan
+        user_data = storage.get_date_range_data("user_a", 30)['calculations']
+        stats = Analytics(storage=storage).generate_summary_stats("user_a", 30)
+        assert stats['total_days'] == len(user_data)
+        assert stats['total_salary'] == sum(c['total_salary'] for day in user_data.values() for c in day)
+        assert stats['total_work_hours'] == round(sum(c['total_minutes'] for day in user_data.values()
+                                                      for c in day) / 60, 1)
+
+        month_key = (today - timedelta(days=20)).strftime('%Y-%m')
+        report = ExportManager(storage=storage).generate_monthly_report(
+            "user_a", int(month_key[5:]), int(month_key[:4]))
+        expected = _scan(storage.load_user_data("user_a"), lambda d: d.startswith(month_key))
+        assert report['total_salary'] == expected['total_salary']
+        assert report['total_days'] == expected['days']
+        print("✅ Summary stats and monthly report read from rollups")
+
+
+def _slow_streaks(user_data, today):
+    """Streaks the slow way: walk back from the last date, then from every date."""
+    days = sorted((date.fromisoformat(d) for d in user_data), reverse=True)
+    if not days:
+        return {'current_streak': 0, 'longest_streak': 0, 'last_work_date': None}
+    current = 0
+    if (today - days[0]).days in (0, 1):
+        current = 1
+        while current < len(days) and (days[current - 1] - days[current]).days == 1:
+            current += 1
+    longest = 0
+    for i in range(len(days)):
+        run = 1
+        while i + run < len(days) and (days[i + run - 1] - days[i + run]).days == 1:
+            run += 1
+        longest = max(longest, run)
+    return {'current_streak': current, 'longest_streak': longest, 'last_work_date': days[0].isoformat()}
+
+
+def test_streak_state():
+    """Streaks kept by the cache match a full rescan after appends, back-fills and deletes."""
+    result = SalaryCalculator().calculate_salary("08:30", "17:30")
+    today = date.today()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(backend=CachedBackend(JsonFileBackend(os.path.join(tmp, "salary_data.json"))))
+        notifications = NotificationManager(storage=storage)
+        assert notifications.get_streak_info("user_s") == _slow_streaks({}, today)
+
+        def check():
+            expected = _slow_streaks(storage.load_user_data("user_s"), today)
+            assert notifications.get_streak_info("user_s") == expected, expected
+            assert WorkedDays(storage.load_user_data("user_s")).streak_info() == expected
+
+        # Two runs in the past, then one that reaches today day by day
+        for days_ago in (30, 29, 28, 27, 26, 20, 19, 5, 4, 3, 2, 1, 0):
+            target_date = (today - timedelta(days=days_ago)).isoformat()
+            storage.save_calculation_with_date("user_s", result, target_date)
+            check()
+        assert notifications.get_streak_info("user_s")['current_streak'] == 6
+
+        # Back-filling the gap joins the two older runs
+        for days_ago in (25, 24, 23, 22, 21):
+            storage.save_calculation_with_date("user_s", result, (today - timedelta(days=days_ago)).isoformat())
+        check()
+        assert notifications.get_streak_info("user_s")['longest_streak'] == 12
+
+        assert storage.delete_date_data("user_s", today.isoformat())
+        check()
+        assert storage.delete_date_data("user_s", (today - timedelta(days=1)).isoformat())
+        check()
+        assert notifications.get_streak_info("user_s")['current_streak'] == 0
+        print("✅ Streak state matches a full scan after appends, back-fills and deletes")
+
+
+def test_worked_days():
+    """Bitset queries match the dates, and the features built on them match a scan of the entries."""
+    today = date.today()
+    worked = WorkedDays()
+    days_ago = [40, 12, 11, 10, 3, 2, 1]
+    for offset in days_ago:
+        worked.add_entry((today - timedelta(days=offset)).isoformat(), {})
+    # A day before the first one moves the base
+    worked.add_entry((today - timedelta(days=41)).isoformat(), {})
+    worked.add_entry("not a date", {})
+
+    assert len(worked) == 8
+    assert worked.first_day() == today - timedelta(days=41) and worked.last_day() == today - timedelta(days=1)
+    assert worked.worked(today - timedelta(days=40)) and not worked.worked(today - timedelta(days=39))
+    assert not worked.worked(today - timedelta(days=400))
+    assert worked.count(today - timedelta(days=12), today) == 6
+    assert worked.count(today - timedelta(days=100), today - timedelta(days=39)) == 2
+    assert worked.count(today, today - timedelta(days=1)) == 0
+    assert worked.bits_between(today - timedelta(days=3), today) == 0b0111
+    assert worked.run_ending(today - timedelta(days=1)) == 3
+    assert worked.run_ending(today - timedelta(days=11)) == 2
+    assert worked.run_ending(today) == 0
+    assert worked.longest_run() == 3
+
+    worked.remove_date((today - timedelta(days=2)).isoformat())
+    assert worked.run_ending(today - timedelta(days=1)) == 1 and len(worked) == 7
+    assert worked.streak_info(today) == {'current_streak': 1, 'longest_streak': 3,
+                                         'last_work_date': (today - timedelta(days=1)).isoformat()}
+    assert WorkedDays().streak_info() == {'current_streak': 0, 'longest_streak': 0, 'last_work_date': None}
+
+    result = SalaryCalculator().calculate_salary("08:30", "17:30")
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(backend=CachedBackend(JsonFileBackend(os.path.join(tmp, "salary_data.json"))))
+        notifications = NotificationManager(storage=storage)
+        for offset in (20, 9, 6, 4, 3, 1, 0):
+            storage.save_calculation_with_date("user_w", result, (today - timedelta(days=offset)).isoformat())
+        user_data = storage.load_user_data("user_w")
+
+        missing = [(today - timedelta(days=offset)).isoformat() for offset in range(1, 8)
+                   if (today - timedelta(days=offset)).weekday() < 5
+                   and (today - timedelta(days=offset)).isoformat() not in user_data]
+        assert [day['date'] for day in notifications.check_missing_entries("user_w")['missing_days']] == missing
+
+        week = [(today - timedelta(days=offset)).isoformat() for offset in range(7)]
+        week_days = sum(1 for date_str in week if date_str in user_data)
+        week_salary = sum(entry['total_salary'] for date_str in week for entry in user_data.get(date_str, []))
+        alert = notifications.generate_work_summary_alert("user_w")
+        assert (f'{week_days} ရက်သာ' in alert['message']) == (week_days < 3)
+        assert (f'¥{week_salary:,.0f}' in alert['message']) == (week_salary < 50000)
+
+        span = (date.fromisoformat(max(user_data)) - date.fromisoformat(min(user_data))).days + 1
+        assert storage.get_user_data_summary("user_w")['monthly_avg_days'] == round(len(user_data) / span * 30, 1)
+    print("✅ Worked-days bitset answers day, range and run queries")
+
+
+def test_shift_records():
+    """The cached ShiftRecords view follows saves and deletes and keeps typed fields."""
+    calculator = SalaryCalculator()
+    today = date.today()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(backend=CachedBackend(JsonFileBackend(os.path.join(tmp, "salary_data.json"))))
+        for days_ago in (3, 1, 2):
+            storage.save_calculation_with_date("user_r", calculator.calculate_salary("08:30", "17:30"),
+                                               (today - timedelta(days=days_ago)).isoformat())
+        records = storage.get_shift_records("user_r")
+        assert [record.date for record in records] == sorted(storage.load_user_data("user_r"))
+
+        storage.save_calculation("user_r", calculator.calculate_salary("16:45", "01:25"))
+        assert storage.delete_date_data("user_r", (today - timedelta(days=2)).isoformat())
+        records = storage.get_shift_records("user_r")
+        assert list(records) == list(ShiftRecords(storage.load_user_data("user_r")))
+        assert len(records) == 3 and records.ordered()[-1].shift_type == 'C342'
+        assert all(type(record.paid_minutes) is int for record in records)
+
+        record = ShiftRecord.from_entry("2025-07-01", {'paid_minutes': 480})
+        assert record.total_salary == 0 and record.paid_minutes == 480 and not hasattr(record, '__dict__')
+        print("✅ ShiftRecords view matches the stored entries")
+
+
+def test_goal_progress():
+    """Monthly goal progress is summed from this month's rollup."""
+    calculator = SalaryCalculator()
+    result = calculator.calculate_salary("08:30", "17:30")
+    today = date.today()
+    month_start = today.replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    dates = sorted({month_start.isoformat(), today.isoformat()})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(backend=CachedBackend(JsonFileBackend(os.path.join(tmp, "salary_data.json"))))
+        tracker = GoalTracker(goals_file=os.path.join(tmp, "goals.json"), storage=storage)
+        for date_str in dates:
+            storage.save_calculation_with_date("user_g", result, date_str)
+        # The day before this month is outside the month's totals
+        storage.save_calculation_with_date("user_g", result, (month_start - timedelta(days=1)).isoformat())
+
+        assert tracker.set_monthly_goal("user_g", 'salary', 100000).get('success')
+        assert tracker.set_monthly_goal("user_g", 'hours', 40).get('success')
+        progress = tracker.check_goal_progress("user_g", 'monthly')
+        assert not progress.get('error'), progress
+
+        salary = progress['progress']['salary']
+        assert salary['current'] == result['total_salary'] * len(dates)
+        assert salary['progress_percent'] == salary['current'] / 100000 * 100
+        assert salary['remaining'] == max(0, 100000 - salary['current'])
+        hours = progress['progress']['hours']
+        assert hours['current'] == result['total_minutes'] * len(dates) / 60
+        assert progress['days_worked'] == len(dates)
+        assert progress['days_remaining'] == (month_end - today).days
+
+        # A user with goals but no entries this month gets zero progress, not an error
+        if today.day <= 30:
+            storage.save_calculation_with_date("user_h", result, (month_start - timedelta(days=1)).isoformat())
+            tracker.set_monthly_goal("user_h", 'salary', 100000)
+            empty = tracker.check_goal_progress("user_h", 'monthly')
+            assert empty['progress']['salary']['current'] == 0 and empty['days_worked'] == 0, empty
+    print("✅ Monthly goal progress reads this month's rollup")
+
+
+if __name__ == "__main__":
+    test_incremental_rollups()
+    test_streak_state()
+    test_worked_days()
+    test_goal_progress()
+    test_shift_records()
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""Test script to verify the DataStorage backends."""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import date, timedelta
+from salary_calculator import SalaryCalculator
+from data_storage import DataStorage
+from storage_backends import ShardedJsonBackend, JsonFileBackend, SqliteBackend, JournaledJsonBackend, PackedRecordBackend
+from migrate_to_sqlite import migrate
+from user_cache import CachedBackend, shared_backend
+from analytics import Analytics
+from export_manager import ExportManager
+
+
+def _without_timestamps(user_data):
+    """Drop save timestamps so data saved at different moments compares equal."""
+    return {date_str: [{key: value for key, value in entry.items() if key != 'timestamp'}
+                       for entry in entries]
+            for date_str, entries in user_data.items()}
+
+
+def test_sharded_backend():
+    """Saving one user's shift only touches that user's shard."""
+    print("🧪 Testing Sharded Storage Backend\n")
+    print("=" * 50)
+
+    calculator = SalaryCalculator()
+    result = calculator.calculate_salary("08:30", "17:30")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = DataStorage(backend=ShardedJsonBackend(os.path.join(tmp, "shards")))
+
+        assert storage.save_calculation("user_a", result)
+        assert storage.save_calculation("user_b", result)
+
+        shard_b = storage.backend.shard_path("user_b")
+        before = os.stat(shard_b).st_mtime_ns
+        assert storage.save_calculation("user_a", result)
+        assert os.stat(shard_b).st_mtime_ns == before
+
+        user_a = storage.load_user_data("user_a")
+        assert sum(len(entries) for entries in user_a.values()) == 2
+        assert sorted(storage.backend.list_users()) == ["user_a", "user_b"]
+
+        assert storage.delete_user_data("user_b")
+        assert not os.path.exists(shard_b)
+        print("✅ Per-user shards written independently")
+
+
+def test_legacy_import():
+    """A single-file store is split into shards on first use."""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_file = os.path.join(tmp, "salary_data.json")
+        with open(legacy_file, 'w', encoding='utf-8') as f:
+            json.dump({"123": {"2025-07-08": [{"total_salary": 1000}]}, "456": {}}, f)
+
+        backend = ShardedJsonBackend(os.path.join(tmp, "shards"))
+        assert backend.import_legacy_file(legacy_file) == 2
+        assert backend.load_user("123") == JsonFileBackend(legacy_file).load_user("123")
+
+        # Importing again must not overwrite existing shards
+        assert backend.import_legacy_file(legacy_file) == 0
+        print("✅ Legacy salary_data.json imported into shards")
+
+
+def test_sqlite_backend():
+    """SQLite range queries and aggregates match the JSON file backend."""
+    print("\n🧪 Testing SQLite Storage Backend\n")
+    print("=" * 50)
+
+    calculator = SalaryCalculator()
+    result = calculator.calculate_salary("16:45", "01:25")
+    today = date.today()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_storage = DataStorage(backend=JsonFileBackend(os.path.join(tmp, "salary_data.json")))
+        sqlite_storage = DataStorage(backend=SqliteBackend(os.path.join(tmp, "salary_data.db")))
+
+        for storage in (json_storage, sqlite_storage):
+            for days_ago in (0, 1, 1, 5, 40):
+                target_date = (today - timedelta(days=days_ago)).isoformat()
+                assert storage.save_calculation_with_date("user_a", result, target_date)
+
+        for days in (1, 7, 30, 60):
+            sqlite_range = sqlite_storage.get_date_range_data("user_a", days)['calculations']
+            json_range = json_storage.get_date_range_data("user_a", days)['calculations']
+            assert list(sqlite_range) == list(json_range)
+            assert _without_timestamps(sqlite_range) == _without_timestamps(json_range)
+
+        assert (_without_timestamps(sqlite_storage.load_user_data("user_a")) ==
+                _without_timestamps(json_storage.load_user_data("user_a")))
+        assert sqlite_storage.get_user_data_summary("user_a") == json_storage.get_user_data_summary("user_a")
+
+        for storage in (json_storage, sqlite_storage):
+            assert storage.delete_old_data("user_a", 30)
+        assert (_without_timestamps(sqlite_storage.load_user_data("user_a")) ==
+                _without_timestamps(json_storage.load_user_data("user_a")))
+        print("✅ SQLite queries match JSON file results")
+
+
+def test_sqlite_migration():
+    """Every JSON data file is copied into the database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        contents = {
+            'data_file': {"123": {"2025-07-08": [{"total_salary": 1000, "shift_type": "C341"}]}},
+            'goals_file': {"123": {"monthly": {"2025-07": {"salary": {"target": 300000}}}}},
+            'notifications_file': {"123": {"work_reminder": {"time": "08:00", "enabled": True}}},
+            'calendar_file': {"users": {"123": {"events": []}}, "salary_payment_day": 25, "global_events": []}
+        }
+        for name, content in contents.items():
+            paths[name] = os.path.join(tmp, f"{name}.json")
+            with open(paths[name], 'w', encoding='utf-8') as f:
+                json.dump(content, f)
+
+        db_file = os.path.join(tmp, "salary_data.db")
+        counts = migrate(db_file, **paths)
+        assert counts['users'] == 1 and counts['calculations'] == 1
+
+        backend = SqliteBackend(db_file)
+        assert backend.load_user("123") == contents['data_file']["123"]
+        assert backend.load_document('goals') == contents['goals_file']
+        assert backend.load_document('notifications') == contents['notifications_file']
+        assert backend.load_document('calendar') == contents['calendar_file']
+        print("✅ JSON files migrated into SQLite")
+
+
+def test_journaled_backend():
+    """Appends go to the log; snapshot plus log replay rebuilds the same state."""
+    print("\n🧪 Testing Journaled Storage Backend\n")
+    print("=" * 50)
+
+    calculator = SalaryCalculator()
+    result = calculator.calculate_salary("08:30", "17:30")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_file = os.path.join(tmp, "salary_data.snapshot.json")
+        backend = JournaledJsonBackend(snapshot_file, fsync_policy="always", compact_interval=3600)
+        storage = DataStorage(backend=backend)
+
+        assert storage.save_calculation_with_date("user_a", result, "2025-07-08")
+        assert storage.save_calculation_with_date("user_a", result, "2025-07-09")
+        assert storage.save_calculation_with_date("user_b", result, "2025-07-09")
+        assert not os.path.exists(snapshot_file)
+        with open(backend.log_file, 'r', encoding='utf-8') as f:
+            assert len(f.readlines()) == 3
+        print("✅ Each save is a single log line")
+
+        assert backend.compact() == 3
+        assert os.path.getsize(backend.log_file) == 0
+        assert storage.delete_user_data("user_b")
+        assert storage.save_calculation_with_date("user_a", result, "2025-07-10")
+        expected = storage.load_user_data("user_a")
+
+        # Simulate a crash: a torn final line and a compaction that never removed its rotated log
+        with open(backend.log_file, 'a', encoding='utf-8') as f:
+            f.write('{"op": "append", "us')
+        with open(f"{backend.log_file}.old", 'w', encoding='utf-8') as f:
+            f.write('{"op": "delete", "user": "user_a", "seq": 1}\n')
+
+        reopened = JournaledJsonBackend(snapshot_file, compact_interval=3600)
+        assert reopened.load_user("user_a") == expected
+        assert reopened.list_users() == ["user_a"]
+        reopened.close()
+        assert not os.path.exists(f"{backend.log_file}.old")
+
+        reopened = JournaledJsonBackend(snapshot_file, compact_interval=3600)
+        assert reopened.load_user("user_a") == expected
+        reopened.close()
+        print("✅ Snapshot plus log tail replayed after restart")
+
+
+class CountingJsonBackend(JsonFileBackend):
+    """JSON backend that counts full-file reads."""
+
+    reads = 0
+
+    def _read_all(self):
+        self.reads += 1
+        return super()._read_all()
+
+
+def test_cached_backend():
+    """Managers sharing a cached DataStorage read the data file once."""
+    print("\n🧪 Testing Shared User Data Cache\n")
+    print("=" * 50)
+
+    calculator = SalaryCalculator()
+    result = calculator.calculate_salary("08:30", "17:30")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "salary_data.json")
+        inner = CountingJsonBackend(data_file)
+        cache = CachedBackend(inner, max_users=2, ttl=3600)
+        storage = DataStorage(backend=cache)
+        for days_ago in range(3):
+            target_date = (date.today() - timedelta(days=days_ago)).isoformat()
+            assert storage.save_calculation_with_date("user_a", result, target_date)
+
+        inner.reads = 0
+        analytics = Analytics(storage=storage)
+        export_manager = ExportManager(storage=storage)
+        analytics.generate_summary_stats("user_a", 30)
+        analytics.get_recent_history("user_a", 7)
+        export_manager.get_export_summary("user_a", 30)
+        storage.get_user_data_summary("user_a")
+        assert inner.reads == 1, inner.reads
+        assert len(storage.load_user_data("user_a")) == 3
+        print("✅ Dashboard render costs one file read")
+
+        # Another process rewrites the file: the changed mtime forces a reload
+        external = JsonFileBackend(data_file)
+        external.save_user("user_a", {"2025-01-01": [{"total_salary": 1}]})
+        os.utime(data_file, ns=(0, os.stat(data_file).st_mtime_ns + 1))
+        assert storage.load_user_data("user_a") == {"2025-01-01": [{"total_salary": 1}]}
+        assert inner.reads == 2
+
+        # Least recently used user is evicted beyond max_users
+        storage.load_user_data("user_b")
+        storage.load_user_data("user_c")
+        assert list(cache._entries) == ["user_b", "user_c"]
+        print("✅ Cache invalidated on external change and bounded by LRU")
+
+
+def test_concurrent_saves():
+    """Threads saving at once lose no updates and leave no temp files behind."""
+    calculator = SalaryCalculator()
+    result = calculator.calculate_salary("08:30", "17:30")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in (JsonFileBackend(os.path.join(tmp, "salary_data.json")),
+                        ShardedJsonBackend(os.path.join(tmp, "shards")),
+                        PackedRecordBackend(os.path.join(tmp, "packed"))):
+            storage = DataStorage(backend=backend)
+
+            def save_shifts(user_id):
+                for _ in range(25):
+                    assert storage.save_calculation(user_id, result)
+
+            threads = [threading.Thread(target=save_shifts, args=(f"user_{index % 4}",)) for index in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            total = sum(len(entries) for user_id in backend.list_users()
+                        for entries in backend.load_user(user_id).values())
+            assert total == 200, total
+
+        leftovers = [name for _, _, names in os.walk(tmp) for name in names if name.endswith('.tmp')]
+        assert not leftovers, leftovers
+        print("✅ Concurrent saves kept every update")
+
+
+def test_packed_backend():
+    """Packed records round-trip exactly, survive a torn append and are 5x smaller than JSON."""
+    calculator = SalaryCalculator()
+    shifts = [("08:30", "17:30"), ("16:45", "01:25"), ("09:00", "20:00"), ("17:00", "23:59")]
+    results = [calculator.calculate_salary(start, end) for start, end in shifts]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 100 users x 1000 days of entries as save_calculation_with_date writes them
+        corpus_storage = DataStorage(backend=JsonFileBackend(os.path.join(tmp, "corpus.json")))
+        for result in results:
+            corpus_storage.save_calculation_with_date("seed", result, "2022-01-01")
+        templates = corpus_storage.load_user_data("seed")["2022-01-01"]
+        seed = {}
+        for day in range(1000):
+            date_str = (date(2022, 1, 1) + timedelta(days=day)).isoformat()
+            seed[date_str] = [dict(templates[day % 4], calculation_date=date_str)]
+        corpus = {f"user_{index}": seed for index in range(100)}
+        json_size = len(json.dumps(corpus, ensure_ascii=False, indent=2).encode('utf-8'))
+
+        backend = PackedRecordBackend(os.path.join(tmp, "packed"))
+        for user_id, user_data in corpus.items():
+            backend.save_user(user_id, user_data)
+        packed_size = sum(os.path.getsize(backend.record_path(user_id)) for user_id in corpus)
+        assert backend.load_user("user_7") == seed
+        assert json_size >= 5 * packed_size, (json_size, packed_size)
+        print(f"✅ 100k entries: {packed_size // 1024} KiB packed vs {json_size // 1024} KiB JSON "
+              f"({json_size / packed_size:.1f}x)")
+
+        storage = DataStorage(backend=PackedRecordBackend(os.path.join(tmp, "packed_a")))
+        assert storage.save_calculation("user_a", results[0])
+        assert storage.save_calculation_with_date("user_a", results[1], "2025-07-01")
+        odd_entry = {'timestamp': 'yesterday', 'start_time': '8:30', 'shift_type': 'C999', 'total_salary': 1}
+        storage.backend.append_entry("user_a", "2025-07-01", odd_entry)
+        user_a = storage.load_user_data("user_a")
+        assert user_a["2025-07-01"][1] == odd_entry
+        assert list(user_a["2025-07-01"][0]) == list(seed["2022-01-01"][0])
+
+        # A torn append is dropped and the next append lands on a record boundary
+        path = storage.backend.record_path("user_a")
+        with open(path, 'ab') as f:
+            f.write(b'P\x01\x02')
+        assert storage.load_user_data("user_a") == user_a
+        assert storage.save_calculation_with_date("user_a", results[2], "2025-07-02")
+        after = storage.load_user_data("user_a")
+        assert len(after.pop("2025-07-02")) == 1
+        assert after == user_a
+
+        assert PackedRecordBackend(os.path.join(tmp, "packed_b")).import_legacy_file(
+            os.path.join(tmp, "corpus.json")) == 1
+        print("✅ Packed records round-trip, fall back to JSON records and recover from torn appends")
+
+
+def test_concurrent_deletes():
+    """Deleting dates while other threads save loses none of the saves, on every backend."""
+    result = SalaryCalculator().calculate_salary("08:30", "17:30")
+    dates = [(date(2025, 1, 1) + timedelta(days=offset)).isoformat() for offset in range(40)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            'json': JsonFileBackend(os.path.join(tmp, "salary_data.json")),
+            'sharded': ShardedJsonBackend(os.path.join(tmp, "shards")),
+            'packed': PackedRecordBackend(os.path.join(tmp, "packed")),
+            'sqlite': SqliteBackend(os.path.join(tmp, "salary_data.db")),
+            'journal': JournaledJsonBackend(os.path.join(tmp, "salary_data.snapshot.json"), compact_interval=3600),
+        }
+        for name, backend in backends.items():
+            storage = DataStorage(backend=CachedBackend(backend) if name == 'json' else backend)
+            for date_str in dates:
+                assert storage.save_calculation_with_date("user_d", result, date_str)
+
+            def delete_dates():
+                for date_str in dates:
+                    assert storage.delete_date_data("user_d", date_str), (name, date_str)
+
+            def save_shifts():
+                for _ in range(20):
+                    assert storage.save_calculation_with_date("user_d", result, "2025-12-31")
+
+            threads = [threading.Thread(target=delete_dates)] + [threading.Thread(target=save_shifts) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            user_data = backend.load_user("user_d")
+            assert list(user_data) == ["2025-12-31"] and len(user_data["2025-12-31"]) == 60, name
+            assert not storage.delete_date_data("user_d", dates[0])
+
+            assert storage.delete_work_history("user_d")
+            assert backend.load_user("user_d") == {}, name
+
+            # Old-data cleanup racing the same saves
+            today = date.today().isoformat()
+
+            def delete_old():
+                for offset in range(100):
+                    old_date = (date.today() - timedelta(days=400 + offset)).isoformat()
+                    assert storage.save_calculation_with_date("user_d", result, old_date)
+                    assert storage.delete_old_data("user_d", 30), name
+
+            def save_today():
+                for _ in range(50):
+                    assert storage.save_calculation_with_date("user_d", result, today)
+
+            threads = [threading.Thread(target=delete_old)] + [threading.Thread(target=save_today) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            user_data = backend.load_user("user_d")
+            assert list(user_data) == [today] and len(user_data[today]) == 150, (name, len(user_data.get(today, [])))
+        backends['journal'].close()
+    print("✅ Date deletes run under the backend lock and lose no concurrent saves")
+
+
+def test_shared_cache_queries():
+    """Through the default shared cache, range and summary queries use SQLite's own queries on a miss."""
+    result = SalaryCalculator().calculate_salary("08:30", "17:30")
+    today = date.today()
+    saved_env = {name: os.environ.get(name) for name in ("STORAGE_BACKEND", "STORAGE_DB")}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["STORAGE_BACKEND"] = "sqlite"
+        os.environ["STORAGE_DB"] = os.path.join(tmp, "salary_data.db")
+        try:
+            storage = DataStorage(os.path.join(tmp, "salary_data.json"))
+            assert storage.backend is shared_backend(os.path.join(tmp, "salary_data.json"))
+            assert isinstance(storage.backend, CachedBackend) and isinstance(storage.backend.backend, SqliteBackend)
+            sqlite = storage.backend.backend
+            for days_ago in (0, 2, 45):
+                assert storage.save_calculation_with_date("user_q", result, (today - timedelta(days=days_ago)).isoformat())
+
+            full_loads = []
+            load_user = sqlite.load_user
+            sqlite.load_user = lambda user_id: full_loads.append(user_id) or load_user(user_id)
+
+            storage.backend.invalidate()
+            recent = storage.get_date_range_data("user_q", 30)['calculations']
+            summary = storage.backend.summarize_user("user_q")
+            assert full_loads == [], full_loads
+            assert list(recent) == [today.isoformat(), (today - timedelta(days=2)).isoformat()]
+            assert summary['total_records'] == 3 and summary['total_days'] == 3
+            assert summary['first_record'] == (today - timedelta(days=45)).isoformat()
+
+            # Once the user is cached, the same queries are answered from the cache with the same results
+            storage.load_user_data("user_q")
+            assert full_loads == ["user_q"]
+            assert storage.get_date_range_data("user_q", 30)['calculations'] == recent
+            assert storage.backend.summarize_user("user_q") == summary
+            assert storage.get_user_data_summary("user_q")['total_records'] == 3
+            assert full_loads == ["user_q"]
+        finally:
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+    print("✅ Shared cache serves range and summary queries without full loads")
+
+
+if __name__ == "__main__":
+    test_sharded_backend()
+    test_legacy_import()
+    test_sqlite_backend()
+    test_sqlite_migration()
+    test_journaled_backend()
+    test_cached_backend()
+    test_shared_cache_queries()
+    test_packed_backend()
+    test_concurrent_saves()
+    test_concurrent_deletes()
@@ -0,0 +1,336 @@
+"""Shared in-process cache of per-user salary data."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+import logging
+from storage_backends import (StorageBackend, create_backend, iter_date_entries, select_date_range,
+                              summarize_user_data)
+
+logger = logging.getLogger(__name__)
+
+
+def _before(date_str: str, cutoff_date: date) -> bool:
+    try:
+        return datetime.fromisoformat(date_str).date() < cutoff_date
+    except ValueError:
+        return False
+
+
+class _CacheEntry:
+    """Cached data for one user plus the views derived from it."""
+
+    __slots__ = ('user_data', 'version', 'loaded_at', 'views')
+
+    def __init__(self, user_data: Dict, version):
+        self.user_data = user_data
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.views: Dict[str, object] = {}
+
+    def add_entry(self, date_str: str, entry: Dict) -> None:
+        self.user_data.setdefault(date_str, []).append(entry)
+        for view in self.views.values():
+            view.add_entry(date_str, entry)
+
+    def replace(self, new_data: Dict) -> None:
+        """Switch to new_data, updating views only for the dates that changed."""
+        old_data = self.user_data
+        for date_str, entries in old_data.items():
+            if new_data.get(date_str) != entries:
+                for view in self.views.values():
+                    view.remove_date(date_str)
+        for date_str, entries in new_data.items():
+            if old_data.get(date_str) != entries:
+                for entry in entries:
+                    for view in self.views.values():
+                        view.add_entry(date_str, entry)
+        self.user_data = new_data
+
+
+class SnapshotSlot:
+    """Cache view holding one value computed from a user's data; any write to that data clears it.
+
+    A value is stored only if nothing cleared the slot while it was being
+    computed, so a snapshot built from data that changed mid-build is dropped.
+    """
+
+    def __init__(self, user_data: Optional[Dict] = None):
+        self._lock = threading.Lock()
+        self._key = None
+        self._value = None
+        self.generation = 0
+
+    def get(self, key):
+        """The stored value if it was stored under key, else None."""
+        with self._lock:
+            return self._value if self._key == key else None
+
+    def store(self, generation: int, key, value) -> None:
+        """Store value under key unless the slot was cleared after generation was read."""
+        with self._lock:
+            if generation == self.generation:
+                self._key, self._value = key, value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key = self._value = None
+            self.generation += 1
+
+    def add_entry(self, date_str: str, entry: Dict) -> None:
+        self.clear()
+
+    def remove_date(self, date_str: str) -> None:
+        self.clear()
+
+
+class CachedBackend(StorageBackend):
+    """Write-through LRU cache of per-user data in front of another backend.
+
+    Entries are evicted when more than ``max_users`` are cached or after
+    ``ttl`` seconds, and are reloaded whenever the wrapped backend reports a
+    different ``data_version`` (e.g. the data file was changed by another
+    process). Callers get fresh dicts and lists but share the entry dicts,
+    which must be treated as read-only.
+
+    Derived views (see ``get_view``) live alongside the cached data and are
+    updated per write through their ``add_entry(date_str, entry)`` and
+    ``remove_date(date_str)`` methods instead of being rebuilt.
+    """
+
+    def __init__(self, backend: StorageBackend, max_users: int = 256, ttl: float = 300.0):
+        self.backend = backend
+        self.max_users = max_users
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def supports_documents(self):
+        return self.backend.supports_documents
+
+    def ensure_storage(self):
+        self.backend.ensure_storage()
+
+    def data_version(self, user_id: str):
+        return self.backend.data_version(user_id)
+
+    @staticmethod
+    def _copy(user_data: Dict) -> Dict:
+        return {date_str: list(entries) for date_str, entries in user_data.items()}
+
+    def _store(self, user_id: str, entry: _CacheEntry) -> _CacheEntry:
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+        return entry
+
+    def _rebase(self, before, after) -> None:
+        """Keep entries valid across a version change caused by our own write."""
+        if before == after:
+            return
+        for entry in self._entries.values():
+            if entry.version == before:
+                entry.version = after
+
+    def _current(self, user_id: str, version) -> Optional[_CacheEntry]:
+        """The cached entry for a user if it is still valid at version."""
+        entry = self._entries.get(user_id)
+        if entry and entry.version == version and time.monotonic() - entry.loaded_at < self.ttl:
+            return entry
+        return None
+
+    def _cached(self, user_id: str) -> _CacheEntry:
+        """Return the cache entry for a user, loading it on a miss. Caller holds the lock."""
+        version = self.backend.data_version(user_id)
+        entry = self._current(user_id, version)
+        if entry:
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        return self._store(user_id, _CacheEntry(self.backend.load_user(user_id), version))
+
+    def _query_entry(self, user_id: str, method: str) -> Optional[_CacheEntry]:
+        """Entry to answer a query from, or None to leave it to a backend with its own query. Caller holds the lock.
+
+        A current entry is always used; on a miss, backends that override
+        method (such as SQLite's indexed range and aggregate queries) answer
+        it without loading the whole user.
+        """
+        entry = self._current(user_id, self.backend.data_version(user_id))
+        if entry:
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry
+        if getattr(type(self.backend), method) is not getattr(StorageBackend, method):
+            return None
+        return self._cached(user_id)
+
+    def get_view(self, user_id: str, name: str, factory: Callable[[Dict], object]):
+        """Get a view derived from a user's data, building it with factory(user_data) once.
+
+        The view is shared and kept current by later writes; treat it as read-only.
+        """
+        with self._lock:
+            entry = self._cached(user_id)
+            view = entry.views.get(name)
+            if view is None:
+                view = entry.views[name] = factory(entry.user_data)
+            return view
+
+    def cached_views(self, user_id: str) -> Dict[str, object]:
+        """The views currently built for a user, without loading anything."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            return dict(entry.views) if entry else {}
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop one user's cached data, or everything when no user is given."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def load_user(self, user_id: str) -> Dict:
+        with self._lock:
+            return self._copy(self._cached(user_id).user_data)
+
+    def save_user(self, user_id: str, user_data: Dict) -> None:
+        with self._lock, self.backend.write_lock():
+            before = self.backend.data_version(user_id)
+            entry = self._current(user_id, before)
+            self.backend.save_user(user_id, user_data)
+            after = self.backend.data_version(user_id)
+            self._rebase(before, after)
+            if entry:
+                entry.replace(self._copy(user_data))
+                entry.version = after
+                self._store(user_id, entry)
+            else:
+                self._store(user_id, _CacheEntry(self._copy(user_data), after))
+
+    def load_date_range(self, user_id: str, start_date: date, end_date: date) -> Dict:
+        with self._lock:
+            entry = self._query_entry(user_id, 'load_date_range')
+            if entry:
+                return self._copy(select_date_range(entry.user_data, start_date, end_date))
+        return self.backend.load_date_range(user_id, start_date, end_date)
+
+    def summarize_user(self, user_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._query_entry(user_id, 'summarize_user')
+            if entry:
+                return summarize_user_data(entry.user_data)
+        return self.backend.summarize_user(user_id)
+
+    def delete_user(self, user_id: str) -> bool:
+        with self._lock, self.backend.write_lock():
+            before = self.backend.data_version(user_id)
+            deleted = self.backend.delete_user(user_id)
+            self._rebase(before, self.backend.data_version(user_id))
+            self._entries.pop(user_id, None)
+            return deleted
+
+    def list_users(self) -> List[str]:
+        return self.backend.list_users()
+
+    def iter_worked_dates(self, start_date: date, end_date: date) -> Iterator[Tuple[str, Set[str]]]:
+        # Straight from the backend: a scan of every user must not evict the hot ones
+        return self.backend.iter_worked_dates(start_date, end_date)
+
+    def iter_dates(self, user_id: str, start_date: Optional[date] = None,
+                   end_date: Optional[date] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        # Served from a current entry when there is one; otherwise streamed without caching the user
+        with self._lock:
+            entry = self._current(user_id, self.backend.data_version(user_id))
+            if entry:
+                return iter([(date_str, list(entries)) for date_str, entries
+                             in iter_date_entries(entry.user_data, start_date, end_date)])
+        return self.backend.iter_dates(user_id, start_date, end_date)
+
+    def iter_users(self) -> Iterator[Tuple[str, Dict]]:
+        # Straight from the backend, for the same reason
+        return self.backend.iter_users()
+
+    def append_entry(self, user_id: str, date_str: str, entry: Dict) -> None:
+        with self._lock, self.backend.write_lock():
+            before = self.backend.data_version(user_id)
+            cached = self._current(user_id, before)
+            self.backend.append_entry(user_id, date_str, entry)
+            after = self.backend.data_version(user_id)
+            self._rebase(before, after)
+            if cached:
+                cached.add_entry(date_str, entry)
+                cached.version = after
+                self._store(user_id, cached)
+            else:
+                self._entries.pop(user_id, None)
+
+    def delete_dates_before(self, user_id: str, cutoff_date: date) -> None:
+        with self._lock, self.backend.write_lock():
+            before = self.backend.data_version(user_id)
+            cached = self._current(user_id, before)
+            self.backend.delete_dates_before(user_id, cutoff_date)
+            after = self.backend.data_version(user_id)
+            self._rebase(before, after)
+            if cached:
+                cached.replace({date_str: entries for date_str, entries in cached.user_data.items()
+                                if not _before(date_str, cutoff_date)})
+                cached.version = after
+            else:
+                self._entries.pop(user_id, None)
+
+    def delete_date(self, user_id: str, date_str: str) -> bool:
+        with self._lock, self.backend.write_lock():
+            before = self.backend.data_version(user_id)
+            cached = self._current(user_id, before)
+            deleted = self.backend.delete_date(user_id, date_str)
+            after = self.backend.data_version(user_id)
+            self._rebase(before, after)
+            if cached:
+                cached.replace({key: entries for key, entries in cached.user_data.items() if key != date_str})
+                cached.version = after
+            else:
+                self._entries.pop(user_id, None)
+            return deleted
+
+    def load_document(self, name: str) -> Dict:
+        return self.backend.load_document(name)
+
+    def save_document(self, name: str, data: Dict) -> None:
+        self.backend.save_document(name, data)
+
+
+# One cache per data file, shared by every DataStorage in the process
+_shared_caches: Dict[str, CachedBackend] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_backend(data_file: str = "salary_data.json") -> StorageBackend:
+    """Return the process-wide backend for data_file, wrapped in the shared cache.
+
+    ``STORAGE_CACHE_SIZE`` (default 256 users, 0 disables the cache) and
+    ``STORAGE_CACHE_TTL`` (default 300 seconds) tune the cache.
+    """
+    max_users = int(os.getenv("STORAGE_CACHE_SIZE", "256"))
+    if max_users <= 0:
+        return create_backend(data_file)
+
+    key = os.path.abspath(data_file)
+    with _shared_lock:
+        if key not in _shared_caches:
+            _shared_caches[key] = CachedBackend(
+                create_backend(data_file),
+                max_users=max_users,
+                ttl=float(os.getenv("STORAGE_CACHE_TTL", "300"))
+            )
+        return _shared_caches[key]